@@ -3,18 +3,33 @@
 count-tokens.py - Token Usage Calculator for Memory System
 
 Purpose: Calculate and track token usage across memory files
-Usage: python3 scripts/count-tokens.py [--report] [--budget] [--watch]
+Usage: python3 scripts/count-tokens.py [--report] [--budget] [--watch] [--jobs N] [--no-cache]
+
+Token counts are cached in .token-cache.json (keyed by path, size, mtime and
+content hash), so only changed files are re-tokenized between runs; the
+tiktoken encoder is only loaded once a file misses the cache.
+
+Files over STREAM_THRESHOLD_BYTES are read and tokenized in chunks, so peak
+memory stays bounded however large archived timelines get.
+
+--watch keeps running, re-counts files as they change and prints a JSON line
+whenever a budgeted file changes budget status (OK / WARNING / OVER_BUDGET).
 
 Requirements: pip install tiktoken (optional, falls back to estimation)
+              pip install watchdog (optional, --watch polls mtimes without it)
 """
 
 import argparse
+import hashlib
 import json
 import os
 import sys
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, List, Tuple
+from typing import Dict, List, Optional, Tuple
 
 # Try to import tiktoken for accurate counting
 try:
@@ -23,6 +38,14 @@ try:
 except ImportError:
     TIKTOKEN_AVAILABLE = False
 
+# Try to import watchdog for filesystem events in --watch mode
+try:
+    from watchdog.events import FileSystemEventHandler
+    from watchdog.observers import Observer
+    WATCHDOG_AVAILABLE = True
+except ImportError:
+    WATCHDOG_AVAILABLE = False
+
 # Token budgets (zero tolerance limits)
 # Reduced budgets based on real-world usage optimization (2025-11-26)
 TOKEN_BUDGETS = {
@@ -56,14 +79,158 @@ SESSION_BUDGETS = {
 }
 
 
+# tiktoken encoding used for accurate counts
+ENCODING_NAME = "cl100k_base"
+
+# Token count cache (relative to the base path)
+CACHE_FILE = ".token-cache.json"
+CACHE_VERSION = 1
+
+
+class TokenCache:
+    """Persistent per-file token counts.
+
+    Entries are reused while a file's size and mtime are unchanged; if only
+    the mtime moved (checkout, touch), the content hash decides. The whole
+    cache is dropped when the encoder changes.
+    """
+
+    def __init__(self, path: Path, encoder_name: str):
+        self.path = path
+        self.encoder_name = encoder_name
+        self.entries: Dict[str, Dict] = {}
+        self.seen: set = set()
+        self.dirty = False
+        self.load()
+
+    def load(self):
+        try:
+            data = json.loads(self.path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return
+        if data.get("version") == CACHE_VERSION and data.get("encoder") == self.encoder_name:
+            self.entries = data.get("files", {})
+        else:
+            self.dirty = True
+
+    def reset(self, encoder_name: str):
+        """Drop every entry and key the cache on another encoder."""
+        self.encoder_name = encoder_name
+        self.entries = {}
+        self.dirty = True
+
+    def lookup(self, key: str, stat: os.stat_result) -> Optional[Tuple[int, int]]:
+        """Cached (tokens, lines) if size and mtime still match."""
+        self.seen.add(key)
+        entry = self.entries.get(key)
+        if entry and entry["size"] == stat.st_size and entry["mtime_ns"] == stat.st_mtime_ns:
+            return entry["tokens"], entry["lines"]
+        return None
+
+    def lookup_hash(self, key: str, digest: str) -> Optional[Tuple[int, int]]:
+        """Cached (tokens, lines) if the content hash still matches."""
+        entry = self.entries.get(key)
+        if entry and entry["sha256"] == digest:
+            return entry["tokens"], entry["lines"]
+        return None
+
+    def store(self, key: str, stat: os.stat_result, digest: str, tokens: int, lines: int):
+        self.entries[key] = {
+            "size": stat.st_size,
+            "mtime_ns": stat.st_mtime_ns,
+            "sha256": digest,
+            "tokens": tokens,
+            "lines": lines,
+        }
+        self.dirty = True
+
+    def save(self):
+        """Write the cache, dropping entries for files that were not counted."""
+        stale = set(self.entries) - self.seen
+        for key in stale:
+            del self.entries[key]
+        if not (self.dirty or stale):
+            return
+
+        data = {"version": CACHE_VERSION, "encoder": self.encoder_name, "files": self.entries}
+        tmp_path = self.path.with_name(self.path.name + ".tmp")
+        try:
+            tmp_path.write_text(json.dumps(data, separators=(",", ":")), encoding="utf-8")
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            print(f"Warning: Could not write token cache {self.path}: {e}", file=sys.stderr)
+
+
+def estimate_tokens(text: str) -> int:
+    """Estimate tokens without tiktoken (~0.75 tokens per word)."""
+    return int(len(text.split()) * 0.75)
+
+
+def _decode(data: bytes) -> str:
+    # Same newline handling as Path.read_text()
+    return data.decode("utf-8").replace("\r\n", "\n").replace("\r", "\n")
+
+
+# Files larger than this are counted in chunks instead of read whole
+STREAM_THRESHOLD_BYTES = 16 * 1024 * 1024
+STREAM_CHUNK_CHARS = 1024 * 1024
+# Longest text kept waiting for a safe cut (one enormous line) before forcing one
+STREAM_MAX_CARRY = 4 * STREAM_CHUNK_CHARS
+
+# With --jobs N, files are read and counted N * this many at a time
+COUNT_BATCH_PER_JOB = 8
+
+# Characters str.splitlines() breaks on (after newline translation)
+LINE_BREAKS = "\n\v\f\x1c\x1d\x1e\x85\u2028\u2029"
+
+
+def _hash_file(filepath: Path) -> str:
+    digest = hashlib.sha256()
+    with open(filepath, "rb") as f:
+        for block in iter(lambda: f.read(STREAM_CHUNK_CHARS), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _safe_cut(text: str, force: bool = False) -> int:
+    """Index where text can be split without changing its counts (0 if none).
+
+    tiktoken's pre-tokenizer (cl100k_base/o200k_base) never joins a newline
+    with a following non-whitespace character, and neither does a word
+    split, so cutting there gives the same tokens as counting the whole.
+    """
+    pos = text.rfind("\n")
+    while pos >= 0:
+        if pos + 1 < len(text) and not text[pos + 1].isspace():
+            return pos + 1
+        pos = text.rfind("\n", 0, pos)
+    if force:
+        # One enormous line: cut after whitespace (may shift a token or two)
+        pos = max(text.rfind(" "), text.rfind("\t"))
+        return pos + 1 if pos > 0 else len(text)
+    return 0
+
+
 class TokenCounter:
-    def __init__(self, use_tiktoken: bool = True):
-        self.encoder = None
-        if use_tiktoken and TIKTOKEN_AVAILABLE:
+    def __init__(self, use_tiktoken: bool = True, cache_path: Optional[Path] = None):
+        # The cache is keyed on the encoding name, so the encoder itself is
+        # loaded lazily: a run where every file is cached never loads it
+        self.encoder_name = ENCODING_NAME if use_tiktoken and TIKTOKEN_AVAILABLE else "estimate"
+        self._encoder = None
+        self.cache = TokenCache(cache_path, self.encoder_name) if cache_path else None
+
+    @property
+    def encoder(self):
+        """The tiktoken encoder, or None when estimating."""
+        if self._encoder is None and self.encoder_name != "estimate":
             try:
-                self.encoder = tiktoken.get_encoding("cl100k_base")
-            except Exception:
-                pass
+                self._encoder = tiktoken.get_encoding(self.encoder_name)
+            except Exception as e:
+                print(f"Warning: Could not load {self.encoder_name} ({e}), estimating", file=sys.stderr)
+                self.encoder_name = "estimate"
+                if self.cache is not None:
+                    self.cache.reset(self.encoder_name)
+        return self._encoder
 
     def count_tokens(self, text: str) -> int:
         """Count tokens in text, using tiktoken if available."""
@@ -71,22 +238,170 @@ class TokenCounter:
             return len(self.encoder.encode(text))
         else:
             # Fallback: estimate ~4 tokens per line, ~0.75 tokens per word
-            words = len(text.split())
-            return int(words * 0.75)
+            return estimate_tokens(text)
 
     def count_file_tokens(self, filepath: Path) -> Tuple[int, int]:
         """Count tokens and lines in a file."""
-        if not filepath.exists():
-            return 0, 0
+        return self.count_files([filepath])[0]
+
+    def count_file_stream(self, filepath: Path, chunk_chars: int = STREAM_CHUNK_CHARS) -> Tuple[int, int]:
+        """Count tokens and lines reading the file a chunk at a time.
+
+        Gives the same result as count_file_tokens() while holding at most
+        a few chunks of text in memory.
+        """
+        tokens = words = lines = 0
+        ends_with_break = True
+        pending = ""
+        with open(filepath, encoding="utf-8") as f:
+            for chunk in iter(lambda: f.read(chunk_chars), ""):
+                lines += sum(chunk.count(c) for c in LINE_BREAKS)
+                ends_with_break = chunk[-1] in LINE_BREAKS
+                pending += chunk
+                cut = _safe_cut(pending, force=len(pending) > STREAM_MAX_CARRY)
+                if cut:
+                    if self.encoder:
+                        tokens += len(self.encoder.encode(pending[:cut]))
+                    else:
+                        words += len(pending[:cut].split())
+                    pending = pending[cut:]
 
+        if self.encoder:
+            tokens += len(self.encoder.encode(pending))
+        else:
+            # Same as estimate_tokens() on the whole file
+            tokens = int((words + len(pending.split())) * 0.75)
+        # splitlines() counts a final line without a line break
+        if not ends_with_break:
+            lines += 1
+        return tokens, lines
+
+    def count_files(self, filepaths: List[Path], jobs: int = 1) -> List[Tuple[int, int]]:
+        """Count tokens and lines for each file, in the order given.
+
+        Cached files are not re-read. Uncached files are read and counted
+        in batches of jobs * COUNT_BATCH_PER_JOB (one file at a time with
+        jobs=1), so only one batch of contents is in memory at once. With
+        jobs > 1 each batch is tokenized concurrently: tiktoken's
+        encode_batch runs one shared encoder on native threads, and the word
+        estimate runs in a process pool.
+        """
+        results: List[Tuple[int, int]] = [(0, 0)] * len(filepaths)
+        batch_size = jobs * COUNT_BATCH_PER_JOB if jobs > 1 else 1
+        pool: Optional[ProcessPoolExecutor] = None
+        todo = []  # (index, content, cache entry)
         try:
-            content = filepath.read_text(encoding="utf-8")
-            lines = len(content.splitlines())
-            tokens = self.count_tokens(content)
-            return tokens, lines
+            for i, filepath in enumerate(filepaths):
+                if not filepath.exists():
+                    continue
+                try:
+                    cached, content, entry = self._load(filepath)
+                except Exception as e:
+                    print(f"Warning: Could not read {filepath}: {e}", file=sys.stderr)
+                    continue
+                if cached is not None:
+                    results[i] = cached
+                elif content is None:
+                    self._count_streamed(filepath, entry, results, i)
+                else:
+                    todo.append((i, content, entry))
+                    if len(todo) >= batch_size:
+                        pool = self._count_batch(filepaths, todo, results, jobs, pool)
+                        todo = []
+            self._count_batch(filepaths, todo, results, jobs, pool)
+        finally:
+            if pool is not None:
+                pool.shutdown()
+        return results
+
+    def _count_streamed(self, filepath: Path, entry: Optional[tuple], results: List, i: int):
+        try:
+            results[i] = self.count_file_stream(filepath)
         except Exception as e:
             print(f"Warning: Could not read {filepath}: {e}", file=sys.stderr)
-            return 0, 0
+            return
+        if entry is not None:
+            self.cache.store(*entry, *results[i])
+
+    def _count_batch(
+        self,
+        filepaths: List[Path],
+        todo: List[tuple],
+        results: List,
+        jobs: int,
+        pool: Optional[ProcessPoolExecutor],
+    ) -> Optional[ProcessPoolExecutor]:
+        """Count one batch of loaded files; returns the (reused) process pool."""
+        if jobs > 1 and len(todo) > 1 and self.encoder is None and pool is None:
+            pool = ProcessPoolExecutor(max_workers=jobs)
+        counts = self._count_texts([content for _, content, _ in todo], jobs, pool)
+        for (i, content, entry), tokens in zip(todo, counts):
+            if tokens is None:
+                print(f"Warning: Could not count tokens in {filepaths[i]}", file=sys.stderr)
+                continue
+            lines = len(content.splitlines())
+            if entry is not None:
+                self.cache.store(*entry, tokens, lines)
+            results[i] = (tokens, lines)
+        return pool
+
+    def _load(self, filepath: Path) -> Tuple[Optional[Tuple[int, int]], Optional[str], Optional[tuple]]:
+        """(cached counts, None, None) or (None, content, cache entry to store).
+
+        Content is None for files over STREAM_THRESHOLD_BYTES, which are
+        left for count_file_stream().
+        """
+        stat = filepath.stat()
+        stream = stat.st_size > STREAM_THRESHOLD_BYTES
+        if self.cache is None:
+            return None, None if stream else filepath.read_text(encoding="utf-8"), None
+
+        key = os.path.relpath(filepath.resolve(), self.cache.path.parent)
+        cached = self.cache.lookup(key, stat)
+        if cached:
+            return cached, None, None
+
+        if stream:
+            data = None
+            digest = _hash_file(filepath)
+        else:
+            data = filepath.read_bytes()
+            digest = hashlib.sha256(data).hexdigest()
+        cached = self.cache.lookup_hash(key, digest)
+        if cached:
+            self.cache.store(key, stat, digest, *cached)
+            return cached, None, None
+        return None, None if data is None else _decode(data), (key, stat, digest)
+
+    def _count_one(self, text: str) -> Optional[int]:
+        try:
+            return self.count_tokens(text)
+        except Exception:
+            return None
+
+    def _count_texts(
+        self, texts: List[str], jobs: int, pool: Optional[ProcessPoolExecutor] = None
+    ) -> List[Optional[int]]:
+        if jobs <= 1 or len(texts) < 2:
+            return [self._count_one(text) for text in texts]
+
+        try:
+            if self.encoder:
+                return [len(t) for t in self.encoder.encode_batch(texts, num_threads=jobs)]
+
+            chunksize = max(1, len(texts) // (jobs * 4))
+            if pool is not None:
+                return list(pool.map(estimate_tokens, texts, chunksize=chunksize))
+            with ProcessPoolExecutor(max_workers=jobs) as pool:
+                return list(pool.map(estimate_tokens, texts, chunksize=chunksize))
+        except Exception as e:
+            # One bad file fails the whole batch; count one by one instead
+            print(f"Warning: Parallel counting failed ({e}), counting sequentially", file=sys.stderr)
+            return [self._count_one(text) for text in texts]
+
+    def save_cache(self):
+        if self.cache is not None:
+            self.cache.save()
 
 
 def find_memory_files(base_path: Path) -> Dict[str, List[Path]]:
@@ -122,12 +437,23 @@ def find_memory_files(base_path: Path) -> Dict[str, List[Path]]:
     return files
 
 
-def generate_report(base_path: Path, counter: TokenCounter) -> Dict:
+def budget_status(tokens: int, budget: int) -> str:
+    """OK, WARNING (>90% used) or OVER_BUDGET."""
+    if tokens > budget:
+        return "OVER_BUDGET"
+    if tokens > budget * 0.9:
+        return "WARNING"
+    return "OK"
+
+
+def generate_report(base_path: Path, counter: TokenCounter, jobs: int = 1) -> Dict:
     """Generate comprehensive token usage report."""
     files = find_memory_files(base_path)
+    all_files = [filepath for file_list in files.values() for filepath in file_list]
+    counts = dict(zip(all_files, counter.count_files(all_files, jobs)))
     report = {
         "generated_at": datetime.now().isoformat(),
-        "tiktoken_available": TIKTOKEN_AVAILABLE and counter.encoder is not None,
+        "tiktoken_available": counter.encoder_name != "estimate",
         "categories": {},
         "totals": {
             "files": 0,
@@ -147,7 +473,7 @@ def generate_report(base_path: Path, counter: TokenCounter) -> Dict:
         }
 
         for filepath in file_list:
-            tokens, lines = counter.count_file_tokens(filepath)
+            tokens, lines = counts[filepath]
             relative_path = str(filepath.relative_to(base_path))
 
             file_data = {
@@ -161,19 +487,16 @@ def generate_report(base_path: Path, counter: TokenCounter) -> Dict:
                 budget = TOKEN_BUDGETS[relative_path]
                 file_data["budget"] = budget
                 file_data["usage_percent"] = round(tokens / budget * 100, 1)
+                file_data["status"] = budget_status(tokens, budget)
 
-                if tokens > budget:
-                    file_data["status"] = "OVER_BUDGET"
+                if file_data["status"] == "OVER_BUDGET":
                     report["warnings"].append(
                         f"{relative_path}: {tokens}/{budget} tokens (OVER BUDGET)"
                     )
-                elif tokens > budget * 0.9:
-                    file_data["status"] = "WARNING"
+                elif file_data["status"] == "WARNING":
                     report["warnings"].append(
                         f"{relative_path}: {tokens}/{budget} tokens (>90% used)"
                     )
-                else:
-                    file_data["status"] = "OK"
 
             category_data["files"].append(file_data)
             category_data["total_tokens"] += tokens
@@ -288,6 +611,187 @@ def print_budget_check(report: Dict):
     return 1 if has_errors else 0
 
 
+# ==============================================================================
+# WATCH MODE
+# ==============================================================================
+
+
+class BudgetWatcher:
+    """Per-file counts and budget status, updated as files change."""
+
+    def __init__(self, base_path: Path, counter: TokenCounter, jobs: int = 1):
+        self.base_path = base_path
+        self.counter = counter
+        self.jobs = jobs
+        self.stats: Dict[Path, Tuple[int, int]] = {}  # (size, mtime_ns)
+        self.counts: Dict[Path, Tuple[int, int]] = {}
+        self.status: Dict[str, str] = {}
+
+    def current_files(self) -> List[Path]:
+        files = find_memory_files(self.base_path)
+        return [filepath for file_list in files.values() for filepath in file_list]
+
+    def totals(self) -> Dict:
+        return {
+            "files": len(self.counts),
+            "lines": sum(lines for _, lines in self.counts.values()),
+            "tokens": sum(tokens for tokens, _ in self.counts.values()),
+        }
+
+    def budget_entry(self, relative_path: str) -> Dict:
+        tokens = self.counts.get(self.base_path / relative_path, (0, 0))[0]
+        budget = TOKEN_BUDGETS[relative_path]
+        return {
+            "path": relative_path,
+            "tokens": tokens,
+            "budget": budget,
+            "usage_percent": round(tokens / budget * 100, 1),
+            "status": budget_status(tokens, budget),
+        }
+
+    def update(self, candidates: Optional[List[Path]] = None) -> List[Dict]:
+        """Re-count new and changed files; returns budget status changes.
+
+        `candidates` limits the stat() calls to paths known to have changed
+        (filesystem events); None checks every tracked file (polling).
+        """
+        files = self.current_files()
+        tracked = set(files)
+        check = tracked if candidates is None else tracked & set(candidates)
+
+        changed = []
+        for filepath in files:
+            if filepath not in check and filepath in self.counts:
+                continue
+            try:
+                st = filepath.stat()
+            except OSError:
+                continue
+            stat = (st.st_size, st.st_mtime_ns)
+            if self.stats.get(filepath) != stat:
+                self.stats[filepath] = stat
+                changed.append(filepath)
+
+        for filepath in set(self.counts) - tracked:
+            del self.counts[filepath]
+            self.stats.pop(filepath, None)
+
+        if changed:
+            self.counts.update(zip(changed, self.counter.count_files(changed, self.jobs)))
+            self.counter.save_cache()
+
+        events = []
+        for relative_path in TOKEN_BUDGETS:
+            if (self.base_path / relative_path) not in tracked and relative_path not in self.status:
+                continue
+            entry = self.budget_entry(relative_path)
+            previous = self.status.get(relative_path)
+            if entry["status"] != previous:
+                self.status[relative_path] = entry["status"]
+                events.append({**entry, "previous_status": previous})
+        return events
+
+
+if WATCHDOG_AVAILABLE:
+
+    class _ChangeHandler(FileSystemEventHandler):
+        """Collects changed paths from watchdog's observer thread."""
+
+        def __init__(self):
+            self.lock = threading.Lock()
+            self.changed: set = set()
+            self.wakeup = threading.Event()
+
+        def on_any_event(self, event):
+            with self.lock:
+                self.changed.add(Path(event.src_path))
+                if getattr(event, "dest_path", ""):
+                    self.changed.add(Path(event.dest_path))
+            self.wakeup.set()
+
+        def take(self) -> List[Path]:
+            # Clear first: an event landing after this is in the swap or wakes us again
+            self.wakeup.clear()
+            with self.lock:
+                changed, self.changed = self.changed, set()
+            return list(changed)
+
+
+# Directories watched recursively (find_memory_files() only looks in these)
+WATCHED_DIRS = ("memory", "docs")
+
+
+def _schedule_dirs(observer, handler, base_path: Path, watches: Dict[str, tuple]):
+    """(Re)schedule recursive watches on WATCHED_DIRS that exist now.
+
+    Directories created (or deleted and recreated) after startup show up as
+    events on the top-level watch; update() rescans for files, so nothing
+    written before the new watch starts is missed.
+    """
+    for name in WATCHED_DIRS:
+        path = base_path / name
+        try:
+            inode = path.stat().st_ino if path.is_dir() else None
+        except OSError:
+            inode = None
+        current = watches.get(name)
+        if current is not None and current[1] == inode:
+            continue
+        if current is not None:
+            observer.unschedule(current[0])
+            del watches[name]
+        if inode is not None:
+            watches[name] = (observer.schedule(handler, str(path), recursive=True), inode)
+
+
+def emit(event: Dict):
+    print(json.dumps(event), flush=True)
+
+
+def watch(base_path: Path, counter: TokenCounter, jobs: int = 1, interval: float = 1.0):
+    """Print a JSON line per budget status change until interrupted."""
+    watcher = BudgetWatcher(base_path, counter, jobs)
+    watcher.update()
+    emit({
+        "event": "start",
+        "watching": "events" if WATCHDOG_AVAILABLE else "polling",
+        "totals": watcher.totals(),
+        "budgets": [watcher.budget_entry(path) for path in watcher.status],
+    })
+
+    observer = None
+    handler = None
+    watches: Dict[str, tuple] = {}
+    if WATCHDOG_AVAILABLE:
+        handler = _ChangeHandler()
+        observer = Observer()
+        # Top level (non-recursive) for CLAUDE.md and new memory/ or docs/ dirs
+        observer.schedule(handler, str(base_path), recursive=False)
+        _schedule_dirs(observer, handler, base_path, watches)
+        observer.start()
+
+    try:
+        while True:
+            if handler is not None:
+                handler.wakeup.wait()
+                time.sleep(0.25)  # Let writers finish (one save = several events)
+                _schedule_dirs(observer, handler, base_path, watches)
+                events = watcher.update(handler.take())
+            else:
+                time.sleep(interval)
+                events = watcher.update()
+
+            for event in events:
+                emit({"event": "budget", **event, "totals": watcher.totals()})
+    except KeyboardInterrupt:
+        pass
+    finally:
+        if observer is not None:
+            observer.stop()
+            observer.join()
+        counter.save_cache()
+
+
 def main():
     parser = argparse.ArgumentParser(
         description="Token Usage Calculator for Memory System"
@@ -318,14 +822,46 @@ def main():
         action="store_true",
         help="Disable tiktoken even if available"
     )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=1,
+        help="Files to tokenize in parallel (0 = one per CPU, default: 1)"
+    )
+    parser.add_argument(
+        "--watch", "-w",
+        action="store_true",
+        help="Keep running and print a JSON line on each budget status change"
+    )
+    parser.add_argument(
+        "--interval",
+        type=float,
+        default=1.0,
+        help="Polling interval in seconds for --watch without watchdog (default: 1.0)"
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help=f"Re-tokenize every file, ignoring {CACHE_FILE}"
+    )
 
     args = parser.parse_args()
 
     base_path = Path(args.path).resolve()
-    counter = TokenCounter(use_tiktoken=not args.no_tiktoken)
+    counter = TokenCounter(
+        use_tiktoken=not args.no_tiktoken,
+        cache_path=None if args.no_cache else base_path / CACHE_FILE,
+    )
+
+    jobs = args.jobs if args.jobs > 0 else os.cpu_count() or 1
+
+    if args.watch:
+        watch(base_path, counter, jobs, args.interval)
+        sys.exit(0)
 
     # Generate report
-    report = generate_report(base_path, counter)
+    report = generate_report(base_path, counter, jobs)
+    counter.save_cache()
 
     # Output
     if args.json:
@@ -0,0 +1,348 @@
+#!/usr/bin/env python3
+"""
+generate-index.py - Project Component Index Generator
+
+Purpose: Extract and index all code components, configs, and doc sections
+Usage: python3 scripts/generate-index.py [--check] [--jobs N]
+
+Single-pass replacement for the grep/sed pipeline in generate-index.sh
+(which runs this script when python3 is available). Each Python file is
+parsed once with `ast`, in parallel across files, so public classes,
+methods and async functions are indexed with their line numbers (`_private`
+names are left out to keep the index near its MAX_LINES budget, and going
+over it prints a warning). JS/TS and Go files are scanned with the same
+patterns as the shell version.
+
+Exit codes:
+  0 - Index generated/up-to-date
+  1 - Index outdated (--check mode)
+  2 - Script error
+"""
+
+import argparse
+import ast
+import os
+import re
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+INDEX_FILE = "refs/index/INDEX.md"
+MAX_LINES = 300
+
+# Directories never indexed
+SKIP_DIRS = {".git", "venv", ".venv", "node_modules", "__pycache__"}
+
+ENV_FILES = [".env.example", ".env.sample", ".env.template"]
+DOC_FILES = ["CLAUDE.md", "RULES.md", "memory/NOW.md", "memory/FIND.md", "refs/PROJECT-CONTEXT.md"]
+
+JS_EXTENSIONS = (".js", ".ts", ".jsx", ".tsx")
+
+# Below this many Python files a process pool costs more than it saves
+PARALLEL_MIN_FILES = 32
+
+# (name, line) pairs
+Entries = List[Tuple[str, int]]
+
+# Colors
+RED = "\033[0;31m"
+GREEN = "\033[0;32m"
+YELLOW = "\033[1;33m"
+BLUE = "\033[0;34m"
+NC = "\033[0m"
+
+# Line-based patterns (same as generate-index.sh)
+PY_DEF_RE = re.compile(r"^(?:async\s+)?def\s+([A-Za-z_]\w*)")
+PY_CLASS_RE = re.compile(r"^class\s+([A-Za-z_]\w*)")
+JS_FUNCTION_RE = re.compile(
+    r"^(?:export\s+)?(?:async\s+)?function\s*\*?\s*([A-Za-z_$][\w$]*)"
+    r"|^(?:export\s+)?const\s+([A-Za-z][\w$]*)\s*=.*=>"
+)
+JS_CLASS_RE = re.compile(r"^(?:export\s+)?(?:default\s+)?class\s+([A-Za-z_$][\w$]*)")
+GO_FUNC_RE = re.compile(r"^func\s+(?:\([^)]*\)\s*)?([A-Za-z_]\w*)")
+ENV_RE = re.compile(r"^([A-Z_][A-Z0-9_]*)=")
+
+
+# ==============================================================================
+# EXTRACTION
+# ==============================================================================
+
+
+def _visit(body: List[ast.stmt], prefix: str, functions: Entries, classes: Entries):
+    for node in body:
+        if getattr(node, "name", "").startswith("_"):
+            continue  # Private (and everything defined in a private class)
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+            # Module functions and methods; functions nested in functions are skipped
+            functions.append((prefix + node.name, node.lineno))
+        elif isinstance(node, ast.ClassDef):
+            classes.append((prefix + node.name, node.lineno))
+            _visit(node.body, f"{prefix}{node.name}.", functions, classes)
+
+
+def extract_python(path: str) -> Tuple[Entries, Entries]:
+    """Functions (incl. async and methods as `Class.method`) and classes."""
+    try:
+        source = Path(path).read_bytes()
+    except OSError as e:
+        print(f"Warning: Could not read {path}: {e}", file=sys.stderr)
+        return [], []
+
+    functions: Entries = []
+    classes: Entries = []
+    try:
+        tree = ast.parse(source, filename=path)
+    except (SyntaxError, ValueError):
+        # Not parseable by this interpreter: fall back to line patterns
+        for num, line in enumerate(source.decode("utf-8", "replace").splitlines(), 1):
+            match = PY_DEF_RE.match(line)
+            if match and not match.group(1).startswith("_"):
+                functions.append((match.group(1), num))
+            match = PY_CLASS_RE.match(line)
+            if match and not match.group(1).startswith("_"):
+                classes.append((match.group(1), num))
+        return functions, classes
+
+    _visit(tree.body, "", functions, classes)
+    return sorted(functions, key=lambda e: e[1]), classes
+
+
+def _read_lines(path: str) -> List[str]:
+    try:
+        return Path(path).read_text(encoding="utf-8", errors="replace").splitlines()
+    except OSError as e:
+        print(f"Warning: Could not read {path}: {e}", file=sys.stderr)
+        return []
+
+
+def extract_javascript(path: str) -> Tuple[Entries, Entries]:
+    functions: Entries = []
+    classes: Entries = []
+    for num, line in enumerate(_read_lines(path), 1):
+        match = JS_FUNCTION_RE.match(line)
+        if match:
+            functions.append((match.group(1) or match.group(2), num))
+        match = JS_CLASS_RE.match(line)
+        if match:
+            classes.append((match.group(1), num))
+    return functions, classes
+
+
+def extract_go(path: str) -> Entries:
+    functions: Entries = []
+    for num, line in enumerate(_read_lines(path), 1):
+        match = GO_FUNC_RE.match(line)
+        if match:
+            functions.append((match.group(1), num))
+    return functions
+
+
+def find_source_files(base_path: Path) -> Dict[str, List[str]]:
+    """Source files by language, as sorted "./relative" paths."""
+    files: Dict[str, List[str]] = {"python": [], "javascript": [], "go": []}
+    for root, dirs, names in os.walk(base_path):
+        dirs[:] = [d for d in dirs if d not in SKIP_DIRS]
+        rel_root = os.path.relpath(root, base_path)
+        for name in names:
+            path = "./" + (name if rel_root == "." else f"{rel_root}/{name}")
+            if name.endswith(".py"):
+                files["python"].append(path)
+            elif name.endswith(JS_EXTENSIONS):
+                files["javascript"].append(path)
+            elif name.endswith(".go"):
+                files["go"].append(path)
+    for paths in files.values():
+        paths.sort()
+    return files
+
+
+# ==============================================================================
+# RENDERING
+# ==============================================================================
+
+
+def _rows(entries: Entries, path: str) -> List[str]:
+    return [f"| `{name}` | {path} | {num} | - |" for name, num in entries]
+
+
+def render_index(base_path: Path, jobs: int = 1) -> str:
+    """Render INDEX.md in memory."""
+    cwd = os.getcwd()
+    os.chdir(base_path)
+    try:
+        files = find_source_files(Path("."))
+        python_files = files["python"]
+        if jobs > 1 and len(python_files) >= PARALLEL_MIN_FILES:
+            chunksize = max(1, len(python_files) // (jobs * 4))
+            with ProcessPoolExecutor(max_workers=jobs) as pool:
+                python = list(pool.map(extract_python, python_files, chunksize=chunksize))
+        else:
+            python = [extract_python(path) for path in python_files]
+        javascript = [extract_javascript(path) for path in files["javascript"]]
+        go = [extract_go(path) for path in files["go"]]
+
+        functions: List[str] = []
+        classes: List[str] = []
+        for path, (funcs, clss) in zip(python_files, python):
+            functions += _rows(funcs, path)
+            classes += _rows(clss, path)
+        for path, (funcs, clss) in zip(files["javascript"], javascript):
+            functions += _rows(funcs, path)
+            classes += _rows(clss, path)
+        for path, funcs in zip(files["go"], go):
+            functions += _rows(funcs, path)
+
+        env_vars: List[str] = []
+        for path in ENV_FILES:
+            if not os.path.isfile(path):
+                continue
+            for line in _read_lines(path):
+                match = ENV_RE.match(line)
+                if match:
+                    required = "Yes" if "# required" in line else "No"
+                    env_vars.append(f"| `{match.group(1)}` | {path} | {required} | - |")
+
+        sections: List[str] = []
+        for path in DOC_FILES:
+            if not os.path.isfile(path):
+                continue
+            for num, line in enumerate(_read_lines(path), 1):
+                if line.startswith("## "):
+                    sections.append(f"| {line.rsplit('## ', 1)[1].strip()} | {path} | Line {num} |")
+    finally:
+        os.chdir(cwd)
+
+    lines = [
+        "# Project Component Index",
+        "",
+        f"**Generated**: {datetime.now().strftime('%Y-%m-%d %H:%M')}",
+        "**Lines**: {CURRENT}/" + str(MAX_LINES),
+        "",
+        "> Auto-generated by `scripts/generate-index.sh`. Do NOT edit manually.",
+        "",
+        "---",
+        "",
+        "## Code Components",
+        "",
+        "### Functions",
+        "",
+        "| Name | File | Line | Description |",
+        "|------|------|------|-------------|",
+        *functions,
+        "",
+        "### Classes",
+        "",
+        "| Name | File | Line | Description |",
+        "|------|------|------|-------------|",
+        *classes,
+        "",
+        "---",
+        "",
+        "## Configuration",
+        "",
+        "### Environment Variables",
+        "",
+        "| Name | File | Required | Description |",
+        "|------|------|----------|-------------|",
+        *env_vars,
+        "",
+        "---",
+        "",
+        "## Documentation Sections",
+        "",
+        "| Section | File | Location |",
+        "|---------|------|----------|",
+        *sections,
+        "",
+        "---",
+        "",
+        "**Token cost**: ~1,200 tokens (300 lines max)",
+        "**Update trigger**: Pre-commit hook (auto-regenerate)",
+    ]
+    return "\n".join(lines).replace("{CURRENT}", str(len(lines)), 1) + "\n"
+
+
+def _without_timestamp(text: str) -> List[str]:
+    return [line for line in text.splitlines() if not line.startswith("**Generated**:")]
+
+
+# ==============================================================================
+# MAIN
+# ==============================================================================
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Project Component Index Generator"
+    )
+    parser.add_argument(
+        "--check",
+        action="store_true",
+        help="Only verify if index is up-to-date (for CI)"
+    )
+    parser.add_argument(
+        "--path", "-p",
+        type=str,
+        default=".",
+        help="Project root (default: current directory)"
+    )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=0,
+        help="Python files to parse in parallel (0 = one per CPU, default)"
+    )
+
+    args = parser.parse_args()
+
+    base_path = Path(args.path).resolve()
+    index_path = base_path / INDEX_FILE
+    jobs = args.jobs if args.jobs > 0 else os.cpu_count() or 1
+
+    print("")
+    print(f"{BLUE}══════════════════════════════════════════════════════════════{NC}")
+    print(f"{BLUE}  Project Index Generator{NC}")
+    print(f"{BLUE}══════════════════════════════════════════════════════════════{NC}")
+    print("")
+    print(f"{BLUE}[Index]{NC} Scanning project files...")
+
+    try:
+        content = render_index(base_path, jobs)
+    except Exception as e:
+        print(f"{RED}[ERROR]{NC} Index generation failed: {e}")
+        sys.exit(2)
+
+    lines = content.count("\n")
+    if lines > MAX_LINES:
+        print(f"{YELLOW}[WARN]{NC} Index is {lines} lines, over its {MAX_LINES}-line budget")
+
+    existing = index_path.read_text(encoding="utf-8") if index_path.exists() else None
+    up_to_date = existing is not None and _without_timestamp(existing) == _without_timestamp(content)
+
+    if args.check:
+        if existing is None:
+            print(f"{RED}[MISSING]{NC} Index file not found: {INDEX_FILE}")
+            sys.exit(1)
+        if not up_to_date:
+            print(f"{RED}[OUTDATED]{NC} Index needs regeneration")
+            print("")
+            print("  Run: ./scripts/generate-index.sh")
+            sys.exit(1)
+        print(f"{GREEN}[OK]{NC} Index is up-to-date")
+        sys.exit(0)
+
+    if up_to_date:
+        # Keep the old timestamp so the pre-commit hook sees no change
+        print(f"{GREEN}[OK]{NC} Index is up-to-date: {INDEX_FILE} ({lines} lines)")
+        sys.exit(0)
+
+    index_path.parent.mkdir(parents=True, exist_ok=True)
+    index_path.write_text(content, encoding="utf-8")
+    print(f"{GREEN}[OK]{NC} Index generated: {INDEX_FILE} ({lines} lines)")
+    sys.exit(0)
+
+
+if __name__ == "__main__":
+    main()
@@ -13,6 +13,14 @@
 #   1 - Index outdated (--check mode)
 #   2 - Script error
 #
+# Runs scripts/generate-index.py (single-pass, ast-based) when python3 is
+# available; the grep/sed implementation below is the fallback.
+#
+
+SCRIPT_DIR="$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)"
+if command -v python3 > /dev/null 2>&1 && [ -f "$SCRIPT_DIR/generate-index.py" ]; then
+    exec python3 "$SCRIPT_DIR/generate-index.py" "$@"
+fi
 
 set -e
 
@@ -0,0 +1,148 @@
+"""
+Admission Control
+
+Caps concurrent inference work and sheds load early instead of letting
+latency collapse for everyone when traffic spikes.
+
+- At most `max_concurrency` requests run at once; the rest wait in a
+  bounded priority queue (interactive before batch, FIFO within a class)
+- A request is rejected up front (503 + Retry-After) when its estimated
+  queue wait already exceeds its deadline, and with 429 when the queue is full
+"""
+
+import asyncio
+import heapq
+import itertools
+import math
+import time
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Dict, List, Tuple
+
+from prometheus_client import Counter, Gauge
+
+from profiling import record_phase
+
+# Lower value = served first
+PRIORITY_CLASSES = {"interactive": 0, "batch": 1}
+
+ADMISSION_QUEUE_LENGTH = Gauge(
+    "inference_admission_queue_length",
+    "Requests waiting for an inference slot",
+    ["priority"],
+)
+ADMISSION_IN_FLIGHT = Gauge(
+    "inference_admission_in_flight",
+    "Requests currently holding an inference slot",
+)
+REQUESTS_SHED = Counter(
+    "inference_requests_shed_total",
+    "Requests rejected by admission control",
+    ["reason"],
+)
+
+
+class AdmissionRejected(Exception):
+    """Raised when a request is shed instead of admitted."""
+
+    def __init__(self, status_code: int, reason: str, retry_after: float):
+        super().__init__(reason)
+        self.status_code = status_code
+        self.reason = reason
+        self.retry_after = max(1, math.ceil(retry_after))
+
+
+class AdmissionController:
+    """Concurrency limiter with a bounded priority wait queue."""
+
+    def __init__(
+        self,
+        max_concurrency: int = 32,
+        max_queue: int = 256,
+        initial_service_time: float = 0.05,
+    ):
+        self.max_concurrency = max_concurrency
+        self.max_queue = max_queue
+        self._in_flight = 0
+        self._heap: List[Tuple[int, int, asyncio.Future]] = []
+        self._seq = itertools.count()
+        self._waiting: Dict[int, int] = {p: 0 for p in PRIORITY_CLASSES.values()}
+        # Exponentially weighted moving average of slot hold time
+        self._service_time = initial_service_time
+
+    @property
+    def queue_length(self) -> int:
+        return sum(self._waiting.values())
+
+    def estimated_wait(self, priority: int) -> float:
+        """Expected queue wait for a new request of the given priority."""
+        if self._in_flight < self.max_concurrency and not self.queue_length:
+            return 0.0
+        ahead = sum(n for p, n in self._waiting.items() if p <= priority)
+        return (ahead + 1) / self.max_concurrency * self._service_time
+
+    def _shed(self, status_code: int, reason: str, retry_after: float):
+        REQUESTS_SHED.labels(reason=reason).inc()
+        raise AdmissionRejected(status_code, reason, retry_after)
+
+    def _set_waiting(self, priority: int, delta: int):
+        self._waiting[priority] += delta
+        name = next(k for k, v in PRIORITY_CLASSES.items() if v == priority)
+        ADMISSION_QUEUE_LENGTH.labels(priority=name).set(self._waiting[priority])
+
+    async def acquire(self, priority: int, timeout: float):
+        """Wait for a slot, or raise AdmissionRejected."""
+        if self._in_flight < self.max_concurrency and not self.queue_length:
+            self._in_flight += 1
+            ADMISSION_IN_FLIGHT.set(self._in_flight)
+            return
+
+        if self.queue_length >= self.max_queue:
+            self._shed(429, "queue_full", self.estimated_wait(priority))
+
+        estimate = self.estimated_wait(priority)
+        if estimate > timeout:
+            self._shed(503, "deadline", estimate)
+
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._heap, (priority, next(self._seq), future))
+        self._set_waiting(priority, 1)
+        queued_at = time.perf_counter()
+        try:
+            # release() hands the slot over directly; in_flight is unchanged
+            await asyncio.wait_for(future, timeout)
+        except BaseException as e:
+            if future.done() and not future.cancelled():
+                # The slot arrived just as we gave up; pass it on
+                self._hand_off()
+            if isinstance(e, asyncio.TimeoutError):
+                self._shed(503, "timeout", self.estimated_wait(priority))
+            raise
+        finally:
+            self._set_waiting(priority, -1)
+            record_phase("admission", time.perf_counter() - queued_at)
+
+    def release(self, service_time: float):
+        """Free a slot, handing it to the highest-priority waiter if any."""
+        self._service_time = 0.8 * self._service_time + 0.2 * service_time
+        self._hand_off()
+
+    def _hand_off(self):
+        while self._heap:
+            _, _, future = heapq.heappop(self._heap)
+            # Waiters that timed out or disconnected are skipped lazily
+            if not future.done():
+                future.set_result(True)
+                return
+
+        self._in_flight -= 1
+        ADMISSION_IN_FLIGHT.set(self._in_flight)
+
+    @asynccontextmanager
+    async def slot(self, priority: int, timeout: float) -> AsyncIterator[None]:
+        """Hold an inference slot for the duration of the block."""
+        await self.acquire(priority, timeout)
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.release(time.perf_counter() - started)
@@ -0,0 +1,147 @@
+"""
+Dynamic Micro-Batching
+
+Gathers concurrent requests into a single batched model call. A batch is
+flushed when it reaches `max_batch_size` or when the oldest request has
+waited `max_wait_ms`, whichever comes first.
+"""
+
+import asyncio
+import time
+from typing import Any, Awaitable, Callable, List, Optional, Tuple
+
+from prometheus_client import Gauge, Histogram
+
+from profiling import background_task
+
+# Prometheus metrics (exposed via the Instrumentator /metrics endpoint)
+BATCH_SIZE = Histogram(
+    "inference_batch_size",
+    "Number of requests per batched model call",
+    buckets=(1, 2, 4, 8, 16, 32, 64, 128),
+)
+BATCH_QUEUE_DEPTH = Gauge(
+    "inference_batch_queue_depth",
+    "Requests waiting to be batched",
+)
+BATCH_WAIT_SECONDS = Histogram(
+    "inference_batch_wait_seconds",
+    "Time a request waits in the queue before its batch runs",
+    buckets=(0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0),
+)
+
+BatchHandler = Callable[[List[Any]], Awaitable[List[Any]]]
+
+
+class BatcherClosed(RuntimeError):
+    """Raised by submit() once the batcher has been stopped."""
+
+
+class MicroBatcher:
+    """Asyncio queue that runs concurrent submissions as batches."""
+
+    def __init__(
+        self,
+        handler: BatchHandler,
+        max_batch_size: int = 8,
+        max_wait_ms: float = 5.0,
+        max_queue_size: int = 1024,
+    ):
+        self.handler = handler
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000
+        self._queue: asyncio.Queue[Tuple[Any, asyncio.Future, float]] = asyncio.Queue(
+            maxsize=max_queue_size
+        )
+        self._worker: Optional[asyncio.Task] = None
+        self._closed = False
+
+    async def start(self):
+        """Start the background batching loop."""
+        if self._worker is None:
+            # Serves many requests, so it must not inherit the first caller's profile
+            self._worker = background_task(self._run())
+
+    async def stop(self, drain: bool = False):
+        """Stop the batching loop.
+
+        With `drain`, queued requests are run first; otherwise they fail.
+        Later submit() calls raise BatcherClosed.
+        """
+        if drain and self._worker is not None:
+            await self._queue.join()
+        self._closed = True
+        if self._worker is not None:
+            self._worker.cancel()
+            try:
+                await self._worker
+            except asyncio.CancelledError:
+                pass
+            self._worker = None
+
+        while not self._queue.empty():
+            _, future, _ = self._queue.get_nowait()
+            self._queue.task_done()
+            if not future.done():
+                future.set_exception(RuntimeError("Batcher stopped"))
+        BATCH_QUEUE_DEPTH.set(0)
+
+    async def submit(self, item: Any) -> Any:
+        """Queue an item and wait for its result from the batched call."""
+        if self._closed:
+            raise BatcherClosed("Batcher stopped")
+        future = asyncio.get_running_loop().create_future()
+        # Blocks when the queue is full, applying backpressure to callers
+        await self._queue.put((item, future, time.perf_counter()))
+        BATCH_QUEUE_DEPTH.set(self._queue.qsize())
+        return await future
+
+    async def _collect(self) -> List[Tuple[Any, asyncio.Future, float]]:
+        """Wait for the first item, then gather more until size or time limit."""
+        batch = [await self._queue.get()]
+        deadline = batch[0][2] + self.max_wait
+
+        while len(batch) < self.max_batch_size:
+            timeout = deadline - time.perf_counter()
+            if timeout <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+            except asyncio.TimeoutError:
+                break
+
+        BATCH_QUEUE_DEPTH.set(self._queue.qsize())
+        return batch
+
+    async def _run(self):
+        while True:
+            collected = await self._collect()
+            try:
+                await self._run_batch(collected)
+            finally:
+                # Lets stop(drain=True) wait for everything queued so far
+                for _ in collected:
+                    self._queue.task_done()
+
+    async def _run_batch(self, batch: List[Tuple[Any, asyncio.Future, float]]):
+        # Skip requests whose callers have already gone away
+        batch = [entry for entry in batch if not entry[1].done()]
+        if not batch:
+            return
+
+        now = time.perf_counter()
+        for _, _, enqueued_at in batch:
+            BATCH_WAIT_SECONDS.observe(now - enqueued_at)
+        BATCH_SIZE.observe(len(batch))
+
+        try:
+            results = await self.handler([item for item, _, _ in batch])
+        except Exception as e:
+            for _, future, _ in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        for (_, future, _), result in zip(batch, results):
+            if not future.done():
+                future.set_result(result)
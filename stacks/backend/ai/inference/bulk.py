@@ -0,0 +1,91 @@
+"""
+Bulk NDJSON Processing
+
+Helpers for streaming a newline-delimited JSON upload through the model in
+fixed-size batches. Memory is bounded by the number of batches in flight,
+never by the size of the upload, and results come back in input order.
+"""
+
+import asyncio
+from typing import AsyncIterator, Awaitable, Callable, List, Optional, Tuple, TypeVar
+
+T = TypeVar("T")
+
+# (record index, raw JSON line)
+Record = Tuple[int, bytes]
+
+
+class LineTooLong(Exception):
+    """Raised when a single NDJSON record exceeds the size limit."""
+
+
+async def iter_records(
+    chunks: AsyncIterator[bytes],
+    max_line_bytes: int,
+) -> AsyncIterator[Record]:
+    """Split a byte stream into numbered, non-empty NDJSON lines."""
+    buffer = b""
+    index = 0
+    async for chunk in chunks:
+        buffer += chunk
+        *lines, buffer = buffer.split(b"\n")
+        for line in lines:
+            line = line.strip()
+            if line:
+                yield index, line
+                index += 1
+        if len(buffer) > max_line_bytes:
+            raise LineTooLong(f"Record {index} exceeds {max_line_bytes} bytes")
+
+    if buffer.strip():
+        yield index, buffer.strip()
+
+
+async def iter_batches(
+    records: AsyncIterator[Record],
+    batch_size: int,
+) -> AsyncIterator[List[Record]]:
+    """Group records into lists of at most `batch_size`."""
+    batch: List[Record] = []
+    async for record in records:
+        batch.append(record)
+        if len(batch) >= batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+async def ordered_pipeline(
+    batches: AsyncIterator[List[Record]],
+    process: Callable[[List[Record]], Awaitable[T]],
+    max_pending: int = 2,
+) -> AsyncIterator[T]:
+    """Process batches concurrently while yielding results in input order.
+
+    At most `max_pending` batches are read ahead of the one being yielded,
+    so a slow client (or model) stops the upload from being read further.
+    """
+    pending: "asyncio.Queue[Optional[asyncio.Future]]" = asyncio.Queue(maxsize=max_pending)
+
+    async def produce():
+        try:
+            async for batch in batches:
+                await pending.put(asyncio.ensure_future(process(batch)))
+        except Exception:
+            await pending.put(None)
+            raise
+        await pending.put(None)
+
+    producer = asyncio.ensure_future(produce())
+    try:
+        while (task := await pending.get()) is not None:
+            yield await task
+        # Surface read errors (e.g. LineTooLong) after the last good batch
+        await producer
+    finally:
+        producer.cancel()
+        while not pending.empty():
+            task = pending.get_nowait()
+            if task is not None:
+                task.cancel()
@@ -0,0 +1,181 @@
+"""
+Inference Result Cache
+
+Content-addressed cache for repeated inference requests. Keys are a hash of
+the normalized request plus the model name and version, so a model reload
+never serves stale results.
+
+Tiers:
+    L1 - in-process LRU with TTL (always on)
+    L2 - Redis shared across workers and pods (optional, set REDIS_URL)
+"""
+
+import asyncio
+import hashlib
+import json
+import time
+import unicodedata
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+from prometheus_client import Counter
+
+from profiling import background_task, phase
+
+# Optional Redis tier
+try:
+    import redis.asyncio as redis
+    REDIS_AVAILABLE = True
+except ImportError:
+    REDIS_AVAILABLE = False
+
+CACHE_HITS = Counter(
+    "inference_cache_hits_total",
+    "Inference results served from cache",
+    ["tier"],
+)
+CACHE_MISSES = Counter(
+    "inference_cache_misses_total",
+    "Inference requests not found in cache",
+)
+CACHE_BYPASS = Counter(
+    "inference_cache_bypass_total",
+    "Inference requests that skipped the cache (non-deterministic sampling)",
+)
+
+KEY_PREFIX = "inference:result:"
+
+
+def cache_key(model_name: str, model_version: str, params: Dict[str, Any]) -> str:
+    """Hash a normalized request together with the model identity."""
+    normalized = {
+        key: unicodedata.normalize("NFC", value) if isinstance(value, str) else value
+        for key, value in params.items()
+    }
+    payload = json.dumps(
+        {"model": model_name, "version": model_version, "params": normalized},
+        sort_keys=True,
+        separators=(",", ":"),
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class LRUCache:
+    """Size-bounded in-process LRU with per-entry TTL."""
+
+    def __init__(self, max_entries: int = 1024, ttl_seconds: float = 300):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+
+    def get(self, key: str) -> Optional[Any]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at < time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    def set(self, key: str, value: Any):
+        self._entries[key] = (time.monotonic() + self.ttl_seconds, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class ResultCache:
+    """Two-tier result cache with single-flight deduplication."""
+
+    def __init__(
+        self,
+        max_entries: int = 1024,
+        ttl_seconds: int = 300,
+        redis_url: str = "",
+        cache_nondeterministic: bool = False,
+    ):
+        self.ttl_seconds = ttl_seconds
+        self.cache_nondeterministic = cache_nondeterministic
+        self.local = LRUCache(max_entries, ttl_seconds)
+        self.redis = None
+        if redis_url:
+            if not REDIS_AVAILABLE:
+                print("Warning: REDIS_URL set but redis is not installed, using L1 only")
+            else:
+                self.redis = redis.from_url(redis_url, decode_responses=True)
+        self._inflight: Dict[str, asyncio.Future] = {}
+
+    def should_cache(self, temperature: Optional[float]) -> bool:
+        """Sampling with temperature > 0 is only cached when opted in."""
+        if self.cache_nondeterministic or not temperature:
+            return True
+        CACHE_BYPASS.inc()
+        return False
+
+    async def get(self, key: str) -> Optional[Dict[str, Any]]:
+        value = self.local.get(key)
+        if value is not None:
+            CACHE_HITS.labels(tier="local").inc()
+            return value
+
+        if self.redis is not None:
+            try:
+                raw = await self.redis.get(KEY_PREFIX + key)
+            except Exception as e:
+                print(f"Warning: Redis cache read failed: {e}")
+                raw = None
+            if raw is not None:
+                value = json.loads(raw)
+                self.local.set(key, value)
+                CACHE_HITS.labels(tier="redis").inc()
+                return value
+
+        CACHE_MISSES.inc()
+        return None
+
+    async def set(self, key: str, value: Dict[str, Any]):
+        self.local.set(key, value)
+        if self.redis is not None:
+            try:
+                await self.redis.set(KEY_PREFIX + key, json.dumps(value), ex=self.ttl_seconds)
+            except Exception as e:
+                print(f"Warning: Redis cache write failed: {e}")
+
+    async def get_or_compute(
+        self,
+        key: str,
+        compute: Callable[[], Awaitable[Dict[str, Any]]],
+    ) -> Dict[str, Any]:
+        """Return a cached value, computing it once for concurrent callers."""
+        with phase("cache"):
+            value = await self.get(key)
+        if value is not None:
+            return value
+
+        # Identical in-flight requests share one computation, which keeps
+        # running (and fills the cache) even if the first caller disconnects
+        task = self._inflight.get(key)
+        if task is None:
+            task = background_task(self._compute(key, compute))
+            self._inflight[key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(key, None))
+        return await asyncio.shield(task)
+
+    async def _compute(
+        self,
+        key: str,
+        compute: Callable[[], Awaitable[Dict[str, Any]]],
+    ) -> Dict[str, Any]:
+        value = await compute()
+        with phase("cache"):
+            await self.set(key, value)
+        return value
+
+    async def close(self):
+        if self.redis is not None:
+            await self.redis.aclose()
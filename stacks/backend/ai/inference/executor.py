@@ -0,0 +1,279 @@
+"""
+Model Execution Backend
+
+Runs blocking model calls off the event loop so /healthz, /readyz and
+/metrics stay responsive while the model is busy.
+
+Backends:
+    thread   - thread pool, for runtimes that release the GIL (torch, onnx)
+    process  - process pool, each worker loads the models it serves, for
+               pure-Python models that would otherwise serialize on the GIL.
+               The parent only keeps metadata (models.ModelInfo); batches and
+               token streams both run in the workers. A stream occupies its
+               worker until it ends, and workers drop models the parent's
+               registry no longer holds.
+"""
+
+import asyncio
+import multiprocessing
+import os
+import queue
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional
+
+from models import PlaceholderModel, load_model_from_path
+
+ModelLoader = Callable[[str, str], PlaceholderModel]
+
+# Tokens a worker may generate ahead of the client reading them
+STREAM_BUFFER_TOKENS = 16
+# How often blocked stream hand-offs re-check for cancellation or failure
+STREAM_POLL_SECONDS = 0.1
+
+# ==============================================================================
+# PROCESS WORKER STATE
+# ==============================================================================
+
+# Models loaded inside a pool worker process, keyed by name
+_worker_models: Dict[str, PlaceholderModel] = {}
+_worker_model_path = "./models"
+_worker_loader: ModelLoader = load_model_from_path
+
+
+def _init_worker(loader: ModelLoader, model_path: str, preload: Optional[str]):
+    """Process pool initializer - load the default model once per worker."""
+    global _worker_loader, _worker_model_path
+    _worker_loader = loader
+    _worker_model_path = model_path
+    if preload:
+        _worker_models[preload] = loader(preload, model_path)
+
+
+def _worker_model(
+    model_name: str, model_version: str, resident: Optional[List[str]]
+) -> PlaceholderModel:
+    """The worker's copy of a model, loaded on first use.
+
+    A version mismatch means the parent swapped in new weights, so the
+    worker reloads its copy as well. Models missing from `resident` (the
+    parent registry's models) were evicted there and are dropped here too.
+    """
+    if resident is not None:
+        for name in list(_worker_models):
+            if name != model_name and name not in resident:
+                del _worker_models[name]
+
+    model = _worker_models.get(model_name)
+    if model is None or model.version != model_version:
+        model = _worker_loader(model_name, _worker_model_path)
+        _worker_models[model_name] = model
+    return model
+
+
+def _worker_generate_batch(
+    model_name: str,
+    model_version: str,
+    resident: Optional[List[str]],
+    texts: List[str],
+    max_lengths: List[int],
+    temperatures: List[float],
+) -> List[str]:
+    """Run a batch inside a worker process."""
+    model = _worker_model(model_name, model_version, resident)
+    return model.generate_batch(texts, max_lengths, temperatures)
+
+
+def _put_token(tokens: Any, cancel: Any, token: Optional[str]) -> bool:
+    """Hand a token to the parent; False once the parent closed the stream."""
+    while not cancel.is_set():
+        try:
+            tokens.put(token, timeout=STREAM_POLL_SECONDS)
+            return True
+        except queue.Full:
+            continue
+    return False
+
+
+def _worker_stream(
+    model_name: str,
+    model_version: str,
+    resident: Optional[List[str]],
+    text: str,
+    max_length: int,
+    temperature: float,
+    tokens: Any,
+    cancel: Any,
+):
+    """Generate a token stream inside a worker process.
+
+    Tokens go through a bounded manager queue, so a slow reader still slows
+    generation down; None marks the end of the stream.
+    """
+    model = _worker_model(model_name, model_version, resident)
+    stream = model.generate_stream(text, max_length, temperature)
+    try:
+        for token in stream:
+            if not _put_token(tokens, cancel, token):
+                break
+    finally:
+        stream.close()
+        _put_token(tokens, cancel, None)
+
+
+class WorkerTokenStream:
+    """Parent side of a _worker_stream: iterate tokens, close() to cancel."""
+
+    def __init__(self, future: Future, tokens: Any, cancel: Any):
+        self._future = future
+        self._tokens = tokens
+        self._cancel = cancel
+
+    def __iter__(self) -> Iterator[str]:
+        return self
+
+    def __next__(self) -> str:
+        while True:
+            try:
+                token = self._tokens.get(timeout=STREAM_POLL_SECONDS)
+                break
+            except queue.Empty:
+                if not self._future.done():
+                    continue
+            # The worker finished (or died): take what it left, then stop
+            try:
+                token = self._tokens.get_nowait()
+                break
+            except queue.Empty:
+                token = None
+                break
+
+        if token is None:
+            # Re-raises the worker's error if generation failed
+            self._future.result()
+            raise StopIteration
+        return token
+
+    def close(self):
+        self._cancel.set()
+
+
+# ==============================================================================
+# EXECUTOR
+# ==============================================================================
+
+
+class ModelExecutor:
+    """Dispatches model calls to a thread or process pool."""
+
+    def __init__(
+        self,
+        kind: str = "thread",
+        max_workers: Optional[int] = None,
+        loader: ModelLoader = load_model_from_path,
+        model_path: str = "./models",
+        preload: Optional[str] = None,
+        resident: Optional[Callable[[], Iterable[str]]] = None,
+    ):
+        """
+        Args:
+            resident: Names of the models the parent keeps loaded; process
+                workers drop any other model they hold
+        """
+        if kind not in ("thread", "process"):
+            raise ValueError(f"Unknown executor backend: {kind}")
+
+        self.kind = kind
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.resident = resident
+        self._pool: Executor
+        self._manager = None
+        if kind == "process":
+            # spawn avoids forking a process that already runs an event loop
+            context = multiprocessing.get_context("spawn")
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                mp_context=context,
+                initializer=_init_worker,
+                initargs=(loader, model_path, preload),
+            )
+            # Carries token queues and cancel flags between parent and workers
+            self._manager = context.Manager()
+            # Threads here only wait on worker queues, never run the model
+            self._stream_pool: Executor = ThreadPoolExecutor(
+                thread_name_prefix="inference-stream"
+            )
+        else:
+            self._pool = ThreadPoolExecutor(
+                max_workers=self.max_workers, thread_name_prefix="inference"
+            )
+            self._stream_pool = self._pool
+
+    def _resident(self) -> Optional[List[str]]:
+        return None if self.resident is None else list(self.resident())
+
+    async def generate_batch(
+        self,
+        model: PlaceholderModel,
+        texts: List[str],
+        max_lengths: List[int],
+        temperatures: List[float],
+    ) -> List[str]:
+        """Run a batched generation on the pool."""
+        loop = asyncio.get_running_loop()
+        if self.kind == "process":
+            return await loop.run_in_executor(
+                self._pool,
+                _worker_generate_batch,
+                model.name,
+                model.version,
+                self._resident(),
+                texts,
+                max_lengths,
+                temperatures,
+            )
+        return await loop.run_in_executor(
+            self._pool, model.generate_batch, texts, max_lengths, temperatures
+        )
+
+    async def open_stream(
+        self,
+        model: PlaceholderModel,
+        text: str,
+        max_length: int,
+        temperature: float,
+    ) -> Iterator[str]:
+        """Start a token stream; step it with next_token(), then close() it."""
+        if self.kind != "process":
+            return model.generate_stream(text, max_length, temperature)
+
+        loop = asyncio.get_running_loop()
+        # Creating manager proxies is a round trip to the manager process
+        tokens, cancel = await loop.run_in_executor(
+            self._stream_pool,
+            lambda: (self._manager.Queue(STREAM_BUFFER_TOKENS), self._manager.Event()),
+        )
+        future = self._pool.submit(
+            _worker_stream,
+            model.name,
+            model.version,
+            self._resident(),
+            text,
+            max_length,
+            temperature,
+            tokens,
+            cancel,
+        )
+        return WorkerTokenStream(future, tokens, cancel)
+
+    async def next_token(self, tokens: Iterator[str]) -> Optional[str]:
+        """Advance a token stream off the event loop; None when it is exhausted."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._stream_pool, next, tokens, None)
+
+    def shutdown(self):
+        """Stop the worker pools."""
+        if self._stream_pool is not self._pool:
+            self._stream_pool.shutdown(wait=False, cancel_futures=True)
+        self._pool.shutdown(wait=True, cancel_futures=True)
+        if self._manager is not None:
+            self._manager.shutdown()
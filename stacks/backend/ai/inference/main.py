@@ -6,24 +6,148 @@ Usage:
     Production:  gunicorn main:app -w 2 -k uvicorn.workers.UvicornWorker
 """
 
+import asyncio
+import json
+import time
 from contextlib import asynccontextmanager
-from typing import Optional
+from functools import partial
+from typing import AsyncIterator, Dict, List, Optional, Set, Tuple
 
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel
+from fastapi.responses import JSONResponse, StreamingResponse
+from pydantic import BaseModel, ValidationError
+from starlette.background import BackgroundTask
 from prometheus_fastapi_instrumentator import Instrumentator
 
 import os
 
+from admission import PRIORITY_CLASSES, AdmissionController, AdmissionRejected
+from batching import BatcherClosed, MicroBatcher
+from bulk import (
+    LineTooLong,
+    Record,
+    iter_batches,
+    iter_records,
+    ordered_pipeline,
+)
+from cache import ResultCache, cache_key
+from executor import ModelExecutor
+from models import PlaceholderModel, load_model_from_path, load_model_info
+from profiling import (
+    ProfilerMiddleware,
+    ProfileStore,
+    RequestProfile,
+    add_debug_routes,
+    background_task,
+    current_profile,
+    phase,
+)
+from registry import ModelRegistry
+from streaming import DuplexStreamingResponse
+from tokenization import Tokenizer, load_tokenizer, record_usage
+
 # Configuration
 ENV = os.getenv("ENV", "development")
 DEBUG = os.getenv("DEBUG", "true").lower() == "true"
 MODEL_PATH = os.getenv("MODEL_PATH", "./models")
 CORS_ORIGINS = os.getenv("CORS_ORIGINS", "http://localhost:3000").split(",")
+# Models are directories under MODEL_PATH (./models/placeholder ships with the template)
+DEFAULT_MODEL = os.getenv("DEFAULT_MODEL", "placeholder")
+MODEL_MEMORY_BUDGET_MB = int(os.getenv("MODEL_MEMORY_BUDGET_MB", "0"))
+# Memory-map .safetensors weights (lazy, shared across gunicorn workers)
+WEIGHTS_MMAP = os.getenv("WEIGHTS_MMAP", "false").lower() == "true"
+# Synthetic batches run on each newly loaded model before it serves traffic
+WARMUP_BATCHES = int(os.getenv("WARMUP_BATCHES", "2"))
+
+# Execution backend: "thread" (GIL-releasing runtimes) or "process"
+# (models live in the worker processes; MODEL_MEMORY_BUDGET_MB counts one
+# copy per worker unless WEIGHTS_MMAP shares the pages, and each stream
+# holds a worker until it ends)
+INFERENCE_EXECUTOR = os.getenv("INFERENCE_EXECUTOR", "thread")
+INFERENCE_WORKERS = int(os.getenv("INFERENCE_WORKERS", "0")) or os.cpu_count() or 1
+
+# Result cache (Redis tier is optional, same REDIS_URL as the API stack)
+CACHE_ENABLED = os.getenv("CACHE_ENABLED", "true").lower() == "true"
+CACHE_MAX_ENTRIES = int(os.getenv("CACHE_MAX_ENTRIES", "1024"))
+CACHE_TTL_SECONDS = int(os.getenv("CACHE_TTL_SECONDS", "300"))
+CACHE_NONDETERMINISTIC = os.getenv("CACHE_NONDETERMINISTIC", "false").lower() == "true"
+REDIS_URL = os.getenv("REDIS_URL", "")
+
+# Admission control / load shedding
+ADMISSION_MAX_CONCURRENCY = int(os.getenv("ADMISSION_MAX_CONCURRENCY", "32"))
+ADMISSION_MAX_QUEUE = int(os.getenv("ADMISSION_MAX_QUEUE", "256"))
+# Default deadline when the client sends no X-Request-Timeout header
+REQUEST_TIMEOUT_SECONDS = float(os.getenv("REQUEST_TIMEOUT_SECONDS", "30"))
+
+# Micro-batching
+BATCH_MAX_SIZE = int(os.getenv("BATCH_MAX_SIZE", "8"))
+BATCH_MAX_WAIT_MS = float(os.getenv("BATCH_MAX_WAIT_MS", "5"))
+BATCH_MAX_QUEUE = int(os.getenv("BATCH_MAX_QUEUE", "1024"))
+
+# Bulk NDJSON endpoint
+BULK_MAX_PENDING_BATCHES = int(os.getenv("BULK_MAX_PENDING_BATCHES", "2"))
+BULK_MAX_LINE_BYTES = int(os.getenv("BULK_MAX_LINE_BYTES", str(1024 * 1024)))
+# Request profiling (see profiling.py)
+PROFILING_ENABLED = os.getenv("PROFILING_ENABLED", "false").lower() == "true"
+PROFILE_SAMPLE_RATE = float(os.getenv("PROFILE_SAMPLE_RATE", "0"))
+PROFILE_HEADER_TRIGGER = os.getenv("PROFILE_HEADER_TRIGGER", "true").lower() == "true"
+PROFILE_INTERVAL_MS = float(os.getenv("PROFILE_INTERVAL_MS", "5"))
+# X-Profile-Token secret; the header trigger and debug routes need it
+PROFILE_TOKEN = os.getenv("PROFILE_TOKEN", "")
+
+model_loader = partial(load_model_from_path, mmap_weights=WEIGHTS_MMAP)
+if INFERENCE_EXECUTOR == "process":
+    # The parent only routes requests; the executor's workers load the weights
+    registry_loader = partial(
+        load_model_info, copies=1 if WEIGHTS_MMAP else INFERENCE_WORKERS
+    )
+else:
+    registry_loader = model_loader
+
+# Worker pool for model calls (created on startup)
+executor: Optional[ModelExecutor] = None
+result_cache: Optional[ResultCache] = None
+# One batching queue per resident model (see get_batcher)
+batchers: Dict[str, MicroBatcher] = {}
+# Batchers draining after their model was evicted
+_stopping_batchers: Set[asyncio.Task] = set()
+admission = AdmissionController(
+    max_concurrency=ADMISSION_MAX_CONCURRENCY,
+    max_queue=ADMISSION_MAX_QUEUE,
+)
+
 
-# Model placeholder (will be loaded on startup)
-model = None
+async def warmup_model(model: PlaceholderModel):
+    """Load the tokenizer and run a few full-size synthetic batches so caches
+    and kernels are hot before the model serves traffic."""
+    await asyncio.to_thread(get_tokenizer, model)
+    for _ in range(WARMUP_BATCHES):
+        await executor.generate_batch(
+            model,
+            ["warmup"] * BATCH_MAX_SIZE,
+            [16] * BATCH_MAX_SIZE,
+            [0.0] * BATCH_MAX_SIZE,
+        )
+
+
+def drop_batcher(model_name: str):
+    """Registry eviction hook: drain and stop the model's batching queue."""
+    batcher = batchers.pop(model_name, None)
+    if batcher is not None:
+        task = background_task(batcher.stop(drain=True))
+        _stopping_batchers.add(task)
+        task.add_done_callback(_stopping_batchers.discard)
+
+
+# Model registry (default model is loaded in the background on startup)
+registry = ModelRegistry(
+    registry_loader,
+    MODEL_PATH,
+    memory_budget_bytes=MODEL_MEMORY_BUDGET_MB * 1024 * 1024,
+    warmup=warmup_model,
+    on_evict=drop_batcher,
+)
 
 
 class InferenceRequest(BaseModel):
@@ -32,6 +156,7 @@ class InferenceRequest(BaseModel):
     text: str
     max_length: Optional[int] = 100
     temperature: Optional[float] = 0.7
+    model: Optional[str] = None
 
 
 class InferenceResponse(BaseModel):
@@ -39,28 +164,188 @@ class InferenceResponse(BaseModel):
 
     result: str
     model: str
+    prompt_tokens: int
+    completion_tokens: int
     tokens_used: int
 
 
+async def get_model(model_name: str) -> PlaceholderModel:
+    """Get a model from the registry, loading it on demand."""
+    try:
+        return await registry.get(model_name)
+    except FileNotFoundError:
+        raise HTTPException(status_code=404, detail=f"Model not found: {model_name}")
+    except Exception as e:
+        raise HTTPException(status_code=503, detail=f"Model failed to load: {e}")
+
+
+def admission_params(http_request: Request) -> Tuple[int, float]:
+    """Read priority class and deadline from request headers.
+
+    X-Priority: interactive (default) | batch
+    X-Request-Timeout: seconds the client is willing to wait
+    """
+    priority_name = http_request.headers.get("X-Priority", "interactive").lower()
+    if priority_name not in PRIORITY_CLASSES:
+        raise HTTPException(
+            status_code=400,
+            detail=f"X-Priority must be one of: {', '.join(PRIORITY_CLASSES)}",
+        )
+
+    try:
+        timeout = float(http_request.headers.get("X-Request-Timeout", REQUEST_TIMEOUT_SECONDS))
+    except ValueError:
+        raise HTTPException(status_code=400, detail="X-Request-Timeout must be a number")
+
+    return PRIORITY_CLASSES[priority_name], timeout
+
+
+async def get_batcher(model_name: str) -> MicroBatcher:
+    """Get the batching queue for a model, creating it on first use.
+
+    Queues only exist for models the registry has loaded, and are stopped
+    when the registry evicts the model (see drop_batcher).
+    """
+    while registry.peek(model_name) is None:
+        await get_model(model_name)
+
+    batcher = batchers.get(model_name)
+    if batcher is None:
+        batcher = MicroBatcher(
+            partial(run_queued_batch, model_name),
+            max_batch_size=BATCH_MAX_SIZE,
+            max_wait_ms=BATCH_MAX_WAIT_MS,
+            max_queue_size=BATCH_MAX_QUEUE,
+        )
+        batchers[model_name] = batcher
+        await batcher.start()
+    return batcher
+
+
+async def submit_batched(
+    model_name: str,
+    request: InferenceRequest,
+    profile: Optional[RequestProfile],
+) -> InferenceResponse:
+    """Queue a request on its model's batcher and wait for the result.
+
+    `profile` is the profiled request the batch's phases are charged to.
+    """
+    while True:
+        batcher = await get_batcher(model_name)
+        try:
+            return await batcher.submit((request, profile))
+        except BatcherClosed:
+            # The model was evicted after we got its batcher
+            continue
+
+
+def get_tokenizer(model: PlaceholderModel) -> Tokenizer:
+    """Tokenizer for a loaded model (cached per model name and version).
+
+    A cache miss loads tokenizer files from disk, so call this off the event
+    loop (warmup_model preloads it for every newly loaded model).
+    """
+    return load_tokenizer(os.path.join(MODEL_PATH, model.name), model.version)
+
+
+def count_tokens(model: PlaceholderModel, texts: List[str]) -> List[int]:
+    """Token counts for `texts` with the model's tokenizer (blocking)."""
+    return get_tokenizer(model).count_batch(texts)
+
+
+async def run_queued_batch(
+    model_name: str, items: List[Tuple[InferenceRequest, Optional[RequestProfile]]]
+) -> List[InferenceResponse]:
+    """Batcher handler: run queued requests, timing them for each submitter."""
+    return await run_batch(
+        model_name, [request for request, _ in items], [profile for _, profile in items]
+    )
+
+
+async def run_batch(
+    model_name: str,
+    requests: List[InferenceRequest],
+    profiles: Optional[List[Optional[RequestProfile]]] = None,
+) -> List[InferenceResponse]:
+    """Run a batch of requests for one model as one model call.
+
+    Phases go to `profiles` when given (the batcher's requests), otherwise
+    to the current request.
+    """
+    # Resolve the model once so an eviction cannot split the batch
+    current = await get_model(model_name)
+
+    with phase("model", profiles):
+        results = await executor.generate_batch(
+            current,
+            [r.text for r in requests],
+            [r.max_length for r in requests],
+            [r.temperature for r in requests],
+        )
+
+    # One batched encode for all prompts and completions, off the event loop
+    with phase("tokenize", profiles):
+        counts = await asyncio.to_thread(
+            count_tokens, current, [r.text for r in requests] + results
+        )
+    prompt_counts, completion_counts = counts[: len(requests)], counts[len(requests) :]
+    record_usage(current.name, sum(prompt_counts), sum(completion_counts))
+
+    return [
+        InferenceResponse(
+            result=result,
+            model=current.name,
+            prompt_tokens=prompt,
+            completion_tokens=completion,
+            tokens_used=prompt + completion,
+        )
+        for result, prompt, completion in zip(results, prompt_counts, completion_counts)
+    ]
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Application lifespan handler - load and unload model."""
-    global model
-
-    # Startup - Load model
-    print(f"Loading model from {MODEL_PATH}...")
-    # TODO: Load your model here
-    # Example with transformers:
-    # from transformers import AutoModelForCausalLM, AutoTokenizer
-    # model = AutoModelForCausalLM.from_pretrained(MODEL_PATH)
-    model = {"name": "placeholder", "loaded": True}
-    print("Model loaded successfully")
+    global executor, result_cache
+
+    # Startup - Start worker pool and load default model
+    executor = ModelExecutor(
+        INFERENCE_EXECUTOR,
+        max_workers=INFERENCE_WORKERS,
+        loader=model_loader,
+        model_path=MODEL_PATH,
+        preload=DEFAULT_MODEL,
+        resident=lambda: registry.loaded,
+    )
+    print(f"Started {executor.kind} executor with {executor.max_workers} workers")
+    # Serve probes while the default model loads; /readyz gates traffic
+    registry.load_in_background(DEFAULT_MODEL)
+
+    if CACHE_ENABLED:
+        result_cache = ResultCache(
+            max_entries=CACHE_MAX_ENTRIES,
+            ttl_seconds=CACHE_TTL_SECONDS,
+            redis_url=REDIS_URL,
+            cache_nondeterministic=CACHE_NONDETERMINISTIC,
+        )
 
     yield
 
     # Shutdown - Cleanup
-    print("Unloading model...")
-    model = None
+    for batcher in batchers.values():
+        await batcher.stop()
+    batchers.clear()
+
+    if result_cache is not None:
+        await result_cache.close()
+        result_cache = None
+
+    executor.shutdown()
+    executor = None
+
+    print("Unloading models...")
+    registry.unload_all()
 
 
 # Create FastAPI app
@@ -85,6 +370,32 @@ app.add_middleware(
 # Prometheus metrics
 Instrumentator().instrument(app).expose(app, endpoint="/metrics")
 
+# Sampling request profiler (outermost, so it sees the whole request)
+if PROFILING_ENABLED:
+    profile_store = ProfileStore(interval_ms=PROFILE_INTERVAL_MS)
+    app.add_middleware(
+        ProfilerMiddleware,
+        store=profile_store,
+        sample_rate=PROFILE_SAMPLE_RATE,
+        header_trigger=PROFILE_HEADER_TRIGGER,
+        token=PROFILE_TOKEN,
+    )
+    # The header trigger and /debug/profile need a token; sampling works without
+    if PROFILE_TOKEN:
+        add_debug_routes(app, profile_store, token=PROFILE_TOKEN)
+    else:
+        print("Warning: PROFILE_TOKEN not set; X-Profile trigger and /debug/profile disabled")
+
+
+@app.exception_handler(AdmissionRejected)
+async def admission_rejected_handler(request: Request, exc: AdmissionRejected):
+    """Shed requests with 429/503 and a Retry-After hint."""
+    return JSONResponse(
+        status_code=exc.status_code,
+        content={"detail": f"Request shed: {exc.reason}"},
+        headers={"Retry-After": str(exc.retry_after)},
+    )
+
 
 # ==============================================================================
 # ENDPOINTS
@@ -97,14 +408,14 @@ async def root():
     return {
         "service": "AI Inference",
         "version": "0.1.0",
-        "model_loaded": model is not None,
+        "model_loaded": bool(registry.loaded),
     }
 
 
 @app.get("/health")
 async def health():
     """Health check endpoint."""
-    if model is None:
+    if registry.peek(DEFAULT_MODEL) is None:
         raise HTTPException(status_code=503, detail="Model not loaded")
     return {"status": "healthy", "model_loaded": True}
 
@@ -117,48 +428,199 @@ async def healthz():
 
 @app.get("/readyz")
 async def readyz():
-    """Kubernetes-style readiness check."""
-    if model is None:
-        raise HTTPException(status_code=503, detail="Model not ready")
-    return {"status": "ready", "model_loaded": True}
+    """Kubernetes-style readiness check (reports model load progress)."""
+    if registry.peek(DEFAULT_MODEL) is None:
+        raise HTTPException(
+            status_code=503,
+            detail={"status": "loading", "models": registry.load_status()},
+        )
+    return {"status": "ready", "model_loaded": True, "models": registry.load_status()}
 
 
 @app.post("/inference", response_model=InferenceResponse)
-async def inference(request: InferenceRequest):
-    """Run inference on the loaded model."""
-    if model is None:
-        raise HTTPException(status_code=503, detail="Model not loaded")
-
-    # TODO: Implement actual inference
-    # Example:
-    # result = model.generate(request.text, max_length=request.max_length)
+async def inference(request: InferenceRequest, http_request: Request):
+    """Run inference on the requested (or default) model."""
+    priority, timeout = admission_params(http_request)
+    model_name = request.model or DEFAULT_MODEL
+    # Load (or fail fast) before queueing anything for the name
+    current = await get_model(model_name)
+
+    if result_cache is None or not result_cache.should_cache(request.temperature):
+        async with admission.slot(priority, timeout):
+            # Concurrent requests are grouped into one batched model call
+            return await submit_batched(model_name, request, current_profile())
+
+    key = cache_key(
+        current.name,
+        current.version,
+        request.model_dump(exclude={"model"}),
+    )
 
-    return InferenceResponse(
-        result=f"Processed: {request.text[:50]}...",
-        model=model.get("name", "unknown"),
-        tokens_used=len(request.text.split()),
+    # compute() runs detached from this request (see ResultCache)
+    profile = current_profile()
+
+    async def compute():
+        # Only cache misses take an admission slot
+        async with admission.slot(priority, timeout):
+            response = await submit_batched(model_name, request, profile)
+        return response.model_dump()
+
+    return InferenceResponse(**await result_cache.get_or_compute(key, compute))
+
+
+@app.post("/inference/stream")
+async def inference_stream(request: InferenceRequest, http_request: Request):
+    """Stream generated tokens as Server-Sent Events."""
+    priority, timeout = admission_params(http_request)
+    current = await get_model(request.model or DEFAULT_MODEL)
+
+    # The slot is held for the whole stream, not just until headers are sent
+    await admission.acquire(priority, timeout)
+    started = time.perf_counter()
+    released = False
+
+    def release_slot():
+        nonlocal released
+        if not released:
+            released = True
+            admission.release(time.perf_counter() - started)
+
+    async def event_stream() -> AsyncIterator[str]:
+        with phase("tokenize"):
+            (prompt_tokens,) = await asyncio.to_thread(
+                count_tokens, current, [request.text]
+            )
+        tokens = await executor.open_stream(
+            current, request.text, request.max_length, request.temperature
+        )
+
+        async def next_token() -> Optional[str]:
+            with phase("model"):
+                return await executor.next_token(tokens)
+
+        # Streamed chunks are model tokens, so they are counted directly
+        count = 0
+        try:
+            # Tokens are produced on the executor so the event loop stays free
+            while (token := await next_token()) is not None:
+                # Stop generating as soon as the client goes away
+                if await http_request.is_disconnected():
+                    break
+                count += 1
+                # Each yield waits for the client to accept the previous
+                # chunk, so a slow reader also slows generation down
+                yield f"data: {json.dumps({'token': token})}\n\n"
+            else:
+                done = {
+                    "model": current.name,
+                    "prompt_tokens": prompt_tokens,
+                    "completion_tokens": count,
+                    "tokens_used": prompt_tokens + count,
+                }
+                yield f"event: done\ndata: {json.dumps(done)}\n\n"
+        finally:
+            record_usage(current.name, prompt_tokens, count)
+            try:
+                tokens.close()
+            except ValueError:
+                # Still running on a worker; it is closed when collected
+                pass
+            release_slot()
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+        # Also release if the stream ends without iterating the generator
+        background=BackgroundTask(release_slot),
     )
 
 
+@app.post("/inference/bulk")
+async def inference_bulk(http_request: Request):
+    """Run a streamed NDJSON upload of InferenceRequest records.
+
+    Records are processed in batches of BATCH_MAX_SIZE at batch priority and
+    results are streamed back as NDJSON in input order, one line per record:
+    {"index": n, "result": {...}} or {"index": n, "error": "..."}.
+    """
+    _, timeout = admission_params(http_request)
+    priority = PRIORITY_CLASSES["batch"]
+
+    async def process(batch: List[Record]) -> List[dict]:
+        output: List[Optional[dict]] = [None] * len(batch)
+        groups: Dict[str, List[Tuple[int, InferenceRequest]]] = {}
+
+        for pos, (index, line) in enumerate(batch):
+            try:
+                request = InferenceRequest.model_validate_json(line)
+            except ValidationError as e:
+                output[pos] = {"index": index, "error": str(e)}
+                continue
+            groups.setdefault(request.model or DEFAULT_MODEL, []).append((pos, request))
+
+        for model_name, items in groups.items():
+            try:
+                async with admission.slot(priority, timeout):
+                    responses = await run_batch(model_name, [r for _, r in items])
+                results = [{"result": r.model_dump()} for r in responses]
+            except HTTPException as e:
+                results = [{"error": str(e.detail)}] * len(items)
+            except AdmissionRejected as e:
+                results = [{"error": f"Request shed: {e.reason}"}] * len(items)
+            except Exception as e:
+                results = [{"error": str(e)}] * len(items)
+
+            for (pos, _), result in zip(items, results):
+                output[pos] = {"index": batch[pos][0], **result}
+
+        return output
+
+    async def ndjson() -> AsyncIterator[str]:
+        records = iter_records(http_request.stream(), BULK_MAX_LINE_BYTES)
+        batches = iter_batches(records, BATCH_MAX_SIZE)
+        try:
+            async for results in ordered_pipeline(
+                batches, process, max_pending=BULK_MAX_PENDING_BATCHES
+            ):
+                for result in results:
+                    yield json.dumps(result) + "\n"
+        except LineTooLong as e:
+            yield json.dumps({"error": str(e)}) + "\n"
+
+    return DuplexStreamingResponse(ndjson(), media_type="application/x-ndjson")
+
+
 @app.get("/models")
 async def list_models():
-    """List available models."""
-    # TODO: Implement model listing
+    """List available and resident models."""
     return {
-        "available": ["placeholder"],
-        "loaded": model.get("name") if model else None,
+        "available": registry.available(),
+        "loaded": registry.loaded,
+        "default": DEFAULT_MODEL,
+        "memory_bytes": registry.memory_bytes,
+        "memory_budget_bytes": registry.memory_budget_bytes,
+        "status": registry.load_status(),
+        "weights": {
+            name: registry.peek(name).weights_stats() for name in registry.loaded
+        },
     }
 
 
-@app.post("/models/{model_name}/load")
-async def load_model(model_name: str):
-    """Load a specific model."""
-    global model
+@app.post("/models/{model_name}/load", status_code=202)
+async def load_model(model_name: str, reload: bool = False):
+    """Load a model in the background.
 
-    # TODO: Implement model loading
-    model = {"name": model_name, "loaded": True}
+    With `reload=true` a resident model keeps serving until the new instance
+    is warmed up, then is swapped out atomically (zero-downtime rollout).
+    Poll /models or /readyz for progress.
+    """
+    try:
+        registry.load_in_background(model_name, reload=reload)
+    except FileNotFoundError:
+        raise HTTPException(status_code=404, detail=f"Model not found: {model_name}")
 
-    return {"status": "loaded", "model": model_name}
+    return {"status": registry.status[model_name]["state"], "model": model_name}
 
 
 if __name__ == "__main__":
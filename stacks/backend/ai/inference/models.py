@@ -0,0 +1,166 @@
+"""
+Model Backend
+
+Wraps the loaded model behind a small batched interface so the serving
+layer does not depend on a specific ML framework.
+"""
+
+import hashlib
+import os
+from typing import Dict, Iterator, List, Optional
+
+from weights import MappedWeights, map_model_dir, resident_bytes
+
+
+class ModelInfo:
+    """A model that is loaded inside executor worker processes.
+
+    With the process executor the parent only needs name, version and size
+    for routing, cache keys and the registry budget; the weights live in
+    the workers (see executor.py).
+    """
+
+    def __init__(self, name: str, memory_bytes: int = 0, version: str = "0"):
+        self.name = name
+        self.version = version
+        self.memory_bytes = memory_bytes
+
+    def weights_stats(self) -> Dict[str, Optional[int]]:
+        # Mapped by the worker processes, not visible from here
+        return {"mapped_bytes": None, "resident_bytes": None}
+
+
+class PlaceholderModel:
+    """Placeholder model - replace with your actual model."""
+
+    def __init__(
+        self,
+        name: str,
+        memory_bytes: int = 0,
+        version: str = "0",
+        weights: Optional[List[MappedWeights]] = None,
+    ):
+        self.name = name
+        # Changes whenever the weights change (used in result cache keys)
+        self.version = version
+        # Resident size used by the registry's memory budget
+        self.memory_bytes = memory_bytes
+        # Memory-mapped weight files (empty when loaded into the heap)
+        self.weights = weights or []
+
+    def weights_stats(self) -> Dict[str, Optional[int]]:
+        """Mapped vs resident bytes of memory-mapped weights."""
+        return {
+            "mapped_bytes": sum(w.mapped_bytes for w in self.weights),
+            "resident_bytes": resident_bytes([w.path for w in self.weights]),
+        }
+
+    def generate_batch(
+        self,
+        texts: List[str],
+        max_lengths: List[int],
+        temperatures: List[float],
+    ) -> List[str]:
+        """Generate one completion per input text in a single model call."""
+        # TODO: Implement actual batched inference
+        # Example with transformers:
+        # inputs = tokenizer(texts, return_tensors="pt", padding=True)
+        # outputs = model.generate(**inputs, max_new_tokens=max(max_lengths))
+        # return tokenizer.batch_decode(outputs, skip_special_tokens=True)
+        return [f"Processed: {text[:50]}..." for text in texts]
+
+    def generate_stream(
+        self,
+        text: str,
+        max_length: int,
+        temperature: float,
+    ) -> Iterator[str]:
+        """Yield tokens as they are produced.
+
+        Closing the iterator must stop generation, so abandoned streams
+        release the model immediately.
+        """
+        # TODO: Implement actual token streaming
+        # Example with transformers:
+        # streamer = TextIteratorStreamer(tokenizer, skip_prompt=True)
+        # Thread(target=model.generate, kwargs={..., "streamer": streamer}).start()
+        # yield from streamer
+        for token in f"Processed: {text[:50]}...".split(" ")[:max_length]:
+            yield token + " "
+
+
+def model_dir(name: str, path: str) -> str:
+    """Directory of a model: a plain directory directly under `path`.
+
+    Raises FileNotFoundError for anything else (missing directories, names
+    with path separators or `..`), so client-supplied names cannot load or
+    publish models that do not exist.
+    """
+    if name in ("", ".", "..") or any(sep in name for sep in ("/", "\\", "\0")):
+        raise FileNotFoundError(f"Invalid model name: {name!r}")
+    directory = os.path.join(path, name)
+    if not os.path.isdir(directory):
+        raise FileNotFoundError(f"Model directory not found: {directory}")
+    return directory
+
+
+def weights_size(path: str) -> int:
+    """Total size of the files in a model directory."""
+    if not os.path.isdir(path):
+        return 0
+    return sum(
+        os.path.getsize(os.path.join(root, f))
+        for root, _, files in os.walk(path)
+        for f in files
+    )
+
+
+def weights_version(path: str) -> str:
+    """Fingerprint a model directory from file names, sizes and mtimes."""
+    if not os.path.isdir(path):
+        return "0"
+    digest = hashlib.sha256()
+    for root, _, files in sorted(os.walk(path)):
+        for f in sorted(files):
+            stat = os.stat(os.path.join(root, f))
+            digest.update(f"{f}:{stat.st_size}:{stat.st_mtime_ns};".encode())
+    return digest.hexdigest()[:12]
+
+
+def load_model_info(name: str, path: str, copies: int = 1) -> ModelInfo:
+    """Describe a model without loading it (parent of the process executor).
+
+    `copies` is how many worker processes may hold their own copy of the
+    weights; it is counted against the registry's memory budget.
+    """
+    directory = model_dir(name, path)
+    return ModelInfo(
+        name,
+        memory_bytes=weights_size(directory) * copies,
+        version=weights_version(directory),
+    )
+
+
+def load_model_from_path(
+    name: str, path: str, mmap_weights: bool = False
+) -> PlaceholderModel:
+    """Load a model by name from the model directory.
+
+    With `mmap_weights`, .safetensors files are memory-mapped instead of
+    read into the heap: startup only parses headers, and pages are shared
+    between worker processes through the page cache.
+    """
+    directory = model_dir(name, path)
+    weights = map_model_dir(directory) if mmap_weights else []
+    # TODO: Load your model here
+    # Example with transformers:
+    # from transformers import AutoModelForCausalLM
+    # return AutoModelForCausalLM.from_pretrained(directory)
+    # Example building tensors on the mapped weights (zero-copy):
+    # state_dict = {k: torch.frombuffer(w.tensor(k), dtype=...) for w in weights for k in w.keys()}
+    return PlaceholderModel(
+        name,
+        memory_bytes=weights_size(directory),
+        version=weights_version(directory),
+        weights=weights,
+    )
@@ -0,0 +1,399 @@
+"""
+Request Profiling
+
+Sampling profiler for individual requests, for finding out *why* a route is
+slow when the latency histogram only says *that* it is.
+
+- A configurable fraction of requests (or any request sent with
+  `X-Profile: 1`) is profiled; everything else pays one random() call
+- While a profiled request is in flight, a background thread samples the
+  event loop every few milliseconds: the running stack when the request is
+  on the CPU, or the stack it is awaiting on when it is suspended
+- Code marks phases (db, cache, model, serialization, ...) with phase() /
+  record_phase(); these are no-ops outside profiled requests
+- Shared work that outlives or serves several requests (batch loops,
+  single-flight fills, model loads) runs in background_task(), detached from
+  the request that started it; batched work passes the profiles of the
+  requests it serves to phase() explicitly
+- Results are aggregated per route and served as collapsed stacks
+  (flamegraph.pl / speedscope compatible) on /debug/profile/flamegraph
+
+The API and inference stacks each ship this file (they are built and
+deployed separately); `make check-shared` fails if the copies drift.
+
+Usage:
+    store = ProfileStore()
+    app.add_middleware(ProfilerMiddleware, store=store, sample_rate=0.01)
+    add_debug_routes(app, store, token=PROFILE_TOKEN)
+
+    with phase("db"):
+        rows = await session.execute(...)
+"""
+
+import asyncio
+import contextvars
+import hmac
+import random
+import sys
+import threading
+import time
+from collections import Counter, deque
+from contextvars import ContextVar
+from typing import Any, Coroutine, Deque, Dict, Iterable, Optional, Set
+
+from fastapi import FastAPI, HTTPException, Request
+from fastapi.responses import PlainTextResponse
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+_current: ContextVar[Optional["RequestProfile"]] = ContextVar("request_profile", default=None)
+
+
+# ==============================================================================
+# PHASES
+# ==============================================================================
+
+
+class RequestProfile:
+    """Samples and phase timings for one profiled request."""
+
+    def __init__(self, method: str, path: str, task: Optional[asyncio.Task]):
+        self.method = method
+        self.path = path
+        self.task = task
+        self.started = time.perf_counter()
+        self.duration = 0.0
+        self.phases: Dict[str, float] = {}
+        self.wall_samples: Counter = Counter()
+        self.cpu_samples: Counter = Counter()
+
+    def add_phase(self, name: str, seconds: float):
+        self.phases[name] = self.phases.get(name, 0.0) + seconds
+
+
+def current_profile() -> Optional[RequestProfile]:
+    """The profile of the request being handled (None if not profiled)."""
+    return _current.get()
+
+
+def record_phase(name: str, seconds: float):
+    """Add time to a phase of the current profiled request (if any)."""
+    profile = _current.get()
+    if profile is not None:
+        profile.add_phase(name, seconds)
+
+
+def background_task(coro: Coroutine) -> asyncio.Task:
+    """Schedule `coro` as a task that belongs to no profiled request.
+
+    Tasks copy the caller's context, so without this a long-lived task
+    would keep adding phases to whichever request happened to start it.
+    """
+    context = contextvars.copy_context()
+    context.run(_current.set, None)
+    return context.run(asyncio.ensure_future, coro)
+
+
+class phase:
+    """Time a block as a named phase; usable with `with` and `async with`.
+
+    The time goes to the current profiled request, or to each of `profiles`
+    when given (one block of work done for several requests, e.g. a batch).
+    """
+
+    __slots__ = ("name", "profiles", "targets", "started")
+
+    def __init__(self, name: str, profiles: Optional[Iterable[Optional[RequestProfile]]] = None):
+        self.name = name
+        self.profiles = profiles
+
+    def __enter__(self):
+        if self.profiles is None:
+            profile = _current.get()
+            self.targets = () if profile is None else (profile,)
+        else:
+            self.targets = [p for p in self.profiles if p is not None]
+        if self.targets:
+            self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        if self.targets:
+            elapsed = time.perf_counter() - self.started
+            for profile in self.targets:
+                profile.add_phase(self.name, elapsed)
+
+    async def __aenter__(self):
+        return self.__enter__()
+
+    async def __aexit__(self, *exc_info):
+        self.__exit__(*exc_info)
+
+
+# ==============================================================================
+# STACK SAMPLING
+# ==============================================================================
+
+
+def _frame_name(frame) -> str:
+    return f"{frame.f_globals.get('__name__', '?')}:{frame.f_code.co_name}"
+
+
+def _running_stack(frame) -> str:
+    frames = []
+    while frame is not None:
+        frames.append(frame)
+        frame = frame.f_back
+    frames.reverse()
+    # Drop the event loop machinery below the task being run
+    for i in range(len(frames) - 1, -1, -1):
+        if frames[i].f_globals.get("__name__") == "asyncio.events":
+            frames = frames[i + 1 :]
+            break
+    return ";".join(_frame_name(f) for f in frames)
+
+
+def _suspended_stack(task: asyncio.Task) -> str:
+    try:
+        frames = task.get_stack()
+    except Exception:
+        # The task moved on while we were walking it
+        return "[unknown]"
+    return ";".join([_frame_name(f) for f in frames] + ["[waiting]"])
+
+
+class StackSampler:
+    """Background thread sampling the event loop for active profiles."""
+
+    def __init__(self, interval_ms: float):
+        self.interval = interval_ms / 1000
+        self.active: Set[RequestProfile] = set()
+        self._wakeup = threading.Event()
+        self._loop_thread: Optional[int] = None
+        self._thread: Optional[threading.Thread] = None
+
+    def add(self, profile: RequestProfile):
+        if self._thread is None:
+            self._loop_thread = threading.get_ident()
+            self._thread = threading.Thread(target=self._run, name="profiler", daemon=True)
+            self._thread.start()
+        self.active.add(profile)
+        self._wakeup.set()
+
+    def remove(self, profile: RequestProfile):
+        self.active.discard(profile)
+        if not self.active:
+            self._wakeup.clear()
+
+    def _run(self):
+        while True:
+            self._wakeup.wait()
+            time.sleep(self.interval)
+            loop_frame = sys._current_frames().get(self._loop_thread)
+            for profile in list(self.active):
+                self._sample(profile, loop_frame)
+
+    def _sample(self, profile: RequestProfile, loop_frame):
+        if profile.task is None or profile.task.done():
+            return
+        if getattr(profile.task.get_coro(), "cr_running", False) and loop_frame is not None:
+            stack = _running_stack(loop_frame)
+            profile.cpu_samples[stack] += 1
+        else:
+            stack = _suspended_stack(profile.task)
+        profile.wall_samples[stack] += 1
+
+
+# ==============================================================================
+# AGGREGATION
+# ==============================================================================
+
+
+# Requests that matched no route (404 scans, mounted apps) or used a method
+# the route does not serve share one entry, so arbitrary paths cannot grow
+# the store
+UNMATCHED_ROUTE = "<unmatched>"
+
+
+class ProfileStore:
+    """Aggregates finished profiles per route."""
+
+    def __init__(self, interval_ms: float = 5.0, max_recent: int = 100):
+        self.interval_ms = interval_ms
+        self.wall: Counter = Counter()
+        self.cpu: Counter = Counter()
+        self.routes: Dict[str, Dict[str, Any]] = {}
+        self.recent: Deque[Dict[str, Any]] = deque(maxlen=max_recent)
+
+    def add(self, route: str, profile: RequestProfile):
+        root = route.replace(";", ":").replace(" ", "_")
+        # Copies: the sampler thread may still be finishing a sample
+        for stack, count in list(profile.wall_samples.items()):
+            self.wall[f"{root};{stack}"] += count
+        for stack, count in list(profile.cpu_samples.items()):
+            self.cpu[f"{root};{stack}"] += count
+
+        cpu_ms = sum(profile.cpu_samples.values()) * self.interval_ms
+        stats = self.routes.setdefault(
+            route, {"count": 0, "wall_ms": 0.0, "cpu_ms": 0.0, "phases_ms": {}}
+        )
+        stats["count"] += 1
+        stats["wall_ms"] += profile.duration * 1000
+        stats["cpu_ms"] += cpu_ms
+        for name, seconds in profile.phases.items():
+            stats["phases_ms"][name] = stats["phases_ms"].get(name, 0.0) + seconds * 1000
+
+        self.recent.append(
+            {
+                "route": route,
+                "wall_ms": round(profile.duration * 1000, 2),
+                "cpu_ms_estimate": round(cpu_ms, 2),
+                "phases_ms": {k: round(v * 1000, 2) for k, v in profile.phases.items()},
+            }
+        )
+
+    def collapsed(self, kind: str = "wall", route: Optional[str] = None) -> str:
+        samples = self.cpu if kind == "cpu" else self.wall
+        prefix = route.replace(";", ":").replace(" ", "_") + ";" if route else ""
+        lines = [f"{stack} {count}" for stack, count in samples.items() if stack.startswith(prefix)]
+        return "\n".join(sorted(lines)) + "\n"
+
+    def summary(self) -> Dict[str, Any]:
+        routes = {}
+        for route, stats in self.routes.items():
+            count = stats["count"]
+            routes[route] = {
+                "count": count,
+                "avg_wall_ms": round(stats["wall_ms"] / count, 2),
+                "avg_cpu_ms_estimate": round(stats["cpu_ms"] / count, 2),
+                "avg_phases_ms": {k: round(v / count, 2) for k, v in stats["phases_ms"].items()},
+            }
+        return {"interval_ms": self.interval_ms, "routes": routes, "recent": list(self.recent)}
+
+    def reset(self):
+        self.wall.clear()
+        self.cpu.clear()
+        self.routes.clear()
+        self.recent.clear()
+
+
+# ==============================================================================
+# MIDDLEWARE
+# ==============================================================================
+
+
+def _route_key(scope: Scope) -> str:
+    route = scope.get("route")
+    if scope["method"] not in (getattr(route, "methods", None) or ()):
+        return UNMATCHED_ROUTE
+    return f"{scope['method']} {route.path}"
+
+
+class ProfilerMiddleware:
+    """Profiles sampled requests and adds a Server-Timing header to them.
+
+    Args:
+        sample_rate: Fraction of requests to profile (0 disables sampling)
+        header_trigger: Also profile requests sent with `X-Profile: 1`
+            and a matching `X-Profile-Token` (disabled without a token)
+        token: Shared secret for the header trigger
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        store: ProfileStore,
+        sample_rate: float = 0.0,
+        header_trigger: bool = True,
+        token: str = "",
+    ):
+        self.app = app
+        self.store = store
+        self.sample_rate = sample_rate
+        self.header_trigger = header_trigger and bool(token)
+        self.token = token.encode()
+        self.sampler = StackSampler(store.interval_ms)
+
+    def _should_profile(self, scope: Scope) -> bool:
+        if self.sample_rate and random.random() < self.sample_rate:
+            return True
+        if not self.header_trigger:
+            return False
+        triggered = authorized = False
+        for name, value in scope["headers"]:
+            if name == b"x-profile":
+                triggered = value == b"1"
+            elif name == b"x-profile-token":
+                authorized = hmac.compare_digest(value, self.token)
+        return triggered and authorized
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http" or not self._should_profile(scope):
+            await self.app(scope, receive, send)
+            return
+
+        profile = RequestProfile(scope["method"], scope["path"], asyncio.current_task())
+        token = _current.set(profile)
+
+        async def send_with_timing(message: Message):
+            if message["type"] == "http.response.start":
+                elapsed = (time.perf_counter() - profile.started) * 1000
+                timings = [f"{n};dur={s * 1000:.2f}" for n, s in profile.phases.items()]
+                timings.append(f"app;dur={elapsed:.2f}")
+                MutableHeaders(scope=message).append("Server-Timing", ", ".join(timings))
+            await send(message)
+
+        self.sampler.add(profile)
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            self.sampler.remove(profile)
+            _current.reset(token)
+            profile.duration = time.perf_counter() - profile.started
+            self.store.add(_route_key(scope), profile)
+
+
+# ==============================================================================
+# DEBUG ENDPOINTS
+# ==============================================================================
+
+
+def add_debug_routes(
+    app: FastAPI,
+    store: ProfileStore,
+    token: str,
+    prefix: str = "/debug/profile",
+):
+    """Expose aggregated profiles, guarded by X-Profile-Token.
+
+    Profiles show internal call stacks and routes, so a token is required.
+    """
+    if not token:
+        raise ValueError("add_debug_routes() needs a non-empty token")
+    expected = token.encode()
+
+    def check_token(request: Request):
+        supplied = request.headers.get("x-profile-token", "").encode()
+        if not hmac.compare_digest(supplied, expected):
+            raise HTTPException(status_code=403, detail="Invalid profile token")
+
+    @app.get(prefix, include_in_schema=False)
+    async def profile_summary(request: Request):
+        check_token(request)
+        return store.summary()
+
+    @app.get(f"{prefix}/flamegraph", include_in_schema=False)
+    async def profile_flamegraph(
+        request: Request,
+        kind: str = "wall",
+        route: Optional[str] = None,
+    ):
+        """Collapsed stacks: `flamegraph.pl` or drop into speedscope.app."""
+        check_token(request)
+        return PlainTextResponse(store.collapsed(kind, route))
+
+    @app.delete(prefix, include_in_schema=False)
+    async def profile_reset(request: Request):
+        check_token(request)
+        store.reset()
+        return {"status": "reset"}
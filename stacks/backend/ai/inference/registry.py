@@ -0,0 +1,171 @@
+"""
+Model Registry
+
+Keeps several models resident, loads them on demand and evicts the least
+recently used ones when the configured memory budget is exceeded.
+
+Loads run in the background and include an optional warmup pass. A model is
+only published once it is warm, and (re)loading swaps the entry atomically:
+in-flight requests finish on the old instance, new ones get the new one.
+"""
+
+import asyncio
+import os
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from models import PlaceholderModel, model_dir
+from profiling import background_task
+
+ModelLoader = Callable[[str, str], PlaceholderModel]
+ModelWarmup = Callable[[PlaceholderModel], Awaitable[None]]
+EvictHook = Callable[[str], None]
+
+
+class ModelRegistry:
+    """LRU cache of loaded models with a memory budget."""
+
+    def __init__(
+        self,
+        loader: ModelLoader,
+        model_path: str,
+        memory_budget_bytes: int = 0,
+        warmup: Optional[ModelWarmup] = None,
+        on_evict: Optional[EvictHook] = None,
+    ):
+        self.loader = loader
+        self.model_path = model_path
+        self.warmup = warmup
+        # Called with the model name after the model is evicted
+        self.on_evict = on_evict
+        # 0 disables the budget (keep every loaded model resident)
+        self.memory_budget_bytes = memory_budget_bytes
+        self._models: "OrderedDict[str, PlaceholderModel]" = OrderedDict()
+        self._loading: Dict[str, asyncio.Future] = {}
+        # Load progress per model name (see load_status())
+        self.status: Dict[str, Dict[str, Any]] = {}
+
+    @property
+    def loaded(self) -> List[str]:
+        """Names of resident models, least recently used first."""
+        return list(self._models)
+
+    @property
+    def memory_bytes(self) -> int:
+        """Total memory used by resident models."""
+        return sum(m.memory_bytes for m in self._models.values())
+
+    def available(self) -> List[str]:
+        """Models that can be loaded from the model directory."""
+        names = set(self._models)
+        if os.path.isdir(self.model_path):
+            names.update(
+                entry.name for entry in os.scandir(self.model_path) if entry.is_dir()
+            )
+        return sorted(names)
+
+    def peek(self, name: str) -> Optional[PlaceholderModel]:
+        """Return a resident model without loading it or touching LRU order."""
+        return self._models.get(name)
+
+    async def get(self, name: str) -> PlaceholderModel:
+        """Return a model, loading it first if it is not resident."""
+        model = self._models.get(name)
+        if model is not None:
+            self._models.move_to_end(name)
+            return model
+
+        return await asyncio.shield(self.load_in_background(name))
+
+    def load_in_background(self, name: str, reload: bool = False) -> asyncio.Future:
+        """Start loading a model without waiting for it.
+
+        Concurrent callers share a single in-flight load. With `reload`, a
+        resident model keeps serving until the new instance is ready.
+        Raises FileNotFoundError (before any state is recorded) unless the
+        name is a model directory under model_path.
+        """
+        model_dir(name, self.model_path)
+        future = self._loading.get(name)
+        if future is not None:
+            return future
+
+        if name in self._models and not reload:
+            future = asyncio.get_running_loop().create_future()
+            future.set_result(self._models[name])
+            return future
+
+        self._set_status(name, "loading")
+        future = background_task(self._load(name))
+        self._loading[name] = future
+        future.add_done_callback(lambda f: self._on_load_done(name, f))
+        return future
+
+    def _on_load_done(self, name: str, future: asyncio.Future):
+        self._loading.pop(name, None)
+        # Background loads may have no awaiter; the error is kept in status
+        if not future.cancelled():
+            future.exception()
+
+    def _set_status(self, name: str, state: str, **extra: Any):
+        if state == "loading":
+            started_at = time.time()
+        else:
+            started_at = self.status.get(name, {}).get("started_at", time.time())
+        self.status[name] = {"state": state, "started_at": started_at, **extra}
+        if state in ("ready", "failed"):
+            self.status[name]["elapsed_seconds"] = round(time.time() - started_at, 3)
+
+    def load_status(self) -> Dict[str, Dict[str, Any]]:
+        """Load progress per model, with live elapsed time for pending loads."""
+        now = time.time()
+        return {
+            name: {"elapsed_seconds": round(now - status["started_at"], 3), **status}
+            for name, status in self.status.items()
+        }
+
+    async def _load(self, name: str) -> PlaceholderModel:
+        print(f"Loading model {name} from {self.model_path}...")
+        try:
+            model = await asyncio.to_thread(self.loader, name, self.model_path)
+
+            if self.warmup is not None:
+                self._set_status(name, "warming_up")
+                await self.warmup(model)
+        except Exception as e:
+            self._set_status(name, "failed", error=str(e))
+            print(f"Model {name} failed to load: {e}")
+            raise
+
+        # Atomic swap: requests already holding the old instance finish on it
+        self._models[name] = model
+        self._models.move_to_end(name)
+        self._evict(keep=name)
+        self._set_status(name, "ready", version=model.version)
+        print(f"Model {name} loaded successfully")
+        return model
+
+    def _evict(self, keep: str):
+        """Drop least recently used models until within the memory budget."""
+        if not self.memory_budget_bytes:
+            return
+
+        for name in list(self._models):
+            if self.memory_bytes <= self.memory_budget_bytes:
+                break
+            if name == keep:
+                continue
+            # In-flight requests keep their own reference and finish normally
+            print(f"Evicting model {name} (memory budget exceeded)")
+            del self._models[name]
+            self.status.pop(name, None)
+            if self.on_evict is not None:
+                self.on_evict(name)
+
+    def unload_all(self):
+        """Drop every resident model and cancel pending loads."""
+        for future in self._loading.values():
+            future.cancel()
+        self._models.clear()
+        self.status.clear()
@@ -0,0 +1,90 @@
+"""Admission control tests."""
+
+import asyncio
+
+import pytest
+
+from admission import PRIORITY_CLASSES, AdmissionController, AdmissionRejected
+
+INTERACTIVE = PRIORITY_CLASSES["interactive"]
+BATCH = PRIORITY_CLASSES["batch"]
+
+
+async def queue_up(controller, order, name, priority):
+    await controller.acquire(priority, timeout=5)
+    order.append(name)
+    controller.release(0.01)
+
+
+@pytest.mark.asyncio
+async def test_interactive_waiters_are_served_before_batch_fifo_within_class():
+    controller = AdmissionController(max_concurrency=1, initial_service_time=0.001)
+    await controller.acquire(BATCH, timeout=1)
+
+    order = []
+    waiters = []
+    for name, priority in [("b1", BATCH), ("b2", BATCH), ("i1", INTERACTIVE), ("i2", INTERACTIVE)]:
+        waiters.append(asyncio.ensure_future(queue_up(controller, order, name, priority)))
+        await asyncio.sleep(0)
+    assert controller.queue_length == 4
+
+    controller.release(0.01)
+    await asyncio.gather(*waiters)
+
+    assert order == ["i1", "i2", "b1", "b2"]
+    assert controller._in_flight == 0
+
+
+@pytest.mark.asyncio
+async def test_full_queue_is_shed_with_429():
+    controller = AdmissionController(max_concurrency=1, max_queue=1, initial_service_time=0.5)
+    await controller.acquire(BATCH, timeout=1)
+    waiter = asyncio.ensure_future(controller.acquire(BATCH, timeout=5))
+    await asyncio.sleep(0)
+
+    with pytest.raises(AdmissionRejected) as rejected:
+        await controller.acquire(INTERACTIVE, timeout=5)
+
+    assert rejected.value.status_code == 429
+    assert rejected.value.reason == "queue_full"
+    assert rejected.value.retry_after >= 1
+    controller.release(0.5)
+    await waiter
+
+
+@pytest.mark.asyncio
+async def test_expected_wait_past_the_deadline_is_shed_with_503():
+    controller = AdmissionController(max_concurrency=1, initial_service_time=4.0)
+    await controller.acquire(BATCH, timeout=1)
+
+    with pytest.raises(AdmissionRejected) as rejected:
+        await controller.acquire(INTERACTIVE, timeout=1)
+
+    assert rejected.value.status_code == 503
+    assert rejected.value.reason == "deadline"
+    assert rejected.value.retry_after == 4
+    assert controller.queue_length == 0
+
+
+@pytest.mark.asyncio
+async def test_timed_out_waiter_gives_up_its_place():
+    controller = AdmissionController(max_concurrency=1, initial_service_time=0.001)
+    await controller.acquire(BATCH, timeout=1)
+
+    with pytest.raises(AdmissionRejected) as rejected:
+        await controller.acquire(BATCH, timeout=0.05)
+    assert rejected.value.reason == "timeout"
+
+    controller.release(0.01)
+    assert controller.queue_length == 0
+    assert controller._in_flight == 0
+
+
+@pytest.mark.asyncio
+async def test_shed_requests_get_retry_after():
+    import main
+
+    response = await main.admission_rejected_handler(None, AdmissionRejected(429, "queue_full", 2.3))
+
+    assert response.status_code == 429
+    assert response.headers["retry-after"] == "3"
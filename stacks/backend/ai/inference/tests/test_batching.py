@@ -0,0 +1,156 @@
+"""Micro-batching tests."""
+
+import asyncio
+
+import httpx
+import pytest
+import pytest_asyncio
+
+from batching import BatcherClosed, MicroBatcher
+from models import PlaceholderModel
+from profiling import RequestProfile
+
+
+class RecordingModel:
+    """Records each generate_batch call."""
+
+    def __init__(self):
+        self.calls = []
+
+    def generate_batch(self, texts, max_lengths, temperatures):
+        self.calls.append(list(texts))
+        return [text.upper() for text in texts]
+
+
+def make_batcher(model, **kwargs):
+    async def handler(items):
+        return model.generate_batch(items, [16] * len(items), [0.0] * len(items))
+
+    return MicroBatcher(handler, **kwargs)
+
+
+@pytest.mark.asyncio
+async def test_concurrent_submits_are_coalesced():
+    model = RecordingModel()
+    batcher = make_batcher(model, max_batch_size=8, max_wait_ms=50)
+    await batcher.start()
+    try:
+        results = await asyncio.gather(*(batcher.submit(f"r{i}") for i in range(5)))
+    finally:
+        await batcher.stop()
+
+    assert results == ["R0", "R1", "R2", "R3", "R4"]
+    assert model.calls == [["r0", "r1", "r2", "r3", "r4"]]
+
+
+@pytest.mark.asyncio
+async def test_batches_are_capped_at_max_batch_size():
+    model = RecordingModel()
+    batcher = make_batcher(model, max_batch_size=2, max_wait_ms=50)
+    await batcher.start()
+    try:
+        await asyncio.gather(*(batcher.submit(f"r{i}") for i in range(5)))
+    finally:
+        await batcher.stop()
+
+    assert [len(call) for call in model.calls] == [2, 2, 1]
+
+
+@pytest.mark.asyncio
+async def test_drain_runs_queued_requests_then_rejects_new_ones():
+    model = RecordingModel()
+    batcher = make_batcher(model, max_batch_size=8, max_wait_ms=20)
+    await batcher.start()
+    pending = [asyncio.create_task(batcher.submit(f"r{i}")) for i in range(3)]
+    await asyncio.sleep(0)
+
+    await batcher.stop(drain=True)
+
+    assert [task.result() for task in pending] == ["R0", "R1", "R2"]
+    with pytest.raises(BatcherClosed):
+        await batcher.submit("late")
+
+
+@pytest_asyncio.fixture
+async def client(monkeypatch):
+    import main
+
+    calls = []
+    generate_batch = PlaceholderModel.generate_batch
+
+    def spy(self, texts, max_lengths, temperatures):
+        calls.append(list(texts))
+        return generate_batch(self, texts, max_lengths, temperatures)
+
+    monkeypatch.setattr(PlaceholderModel, "generate_batch", spy)
+    monkeypatch.setattr(main, "BATCH_MAX_WAIT_MS", 100.0)
+    monkeypatch.setattr(main, "CACHE_ENABLED", False)
+
+    async with main.app.router.lifespan_context(main.app):
+        await main.registry.get(main.DEFAULT_MODEL)
+        calls.clear()  # Warmup batches
+        transport = httpx.ASGITransport(app=main.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as c:
+            yield c, calls
+
+
+@pytest.mark.asyncio
+async def test_concurrent_inference_requests_share_one_model_call(client):
+    c, calls = client
+    responses = await asyncio.gather(
+        *(c.post("/inference", json={"text": f"prompt {i}"}) for i in range(4))
+    )
+
+    assert [r.status_code for r in responses] == [200] * 4
+    assert len(calls) == 1
+    assert sorted(calls[0]) == [f"prompt {i}" for i in range(4)]
+
+
+@pytest.mark.asyncio
+async def test_unknown_models_get_no_batcher(client):
+    import main
+
+    c, _ = client
+    response = await c.post("/inference", json={"text": "hi", "model": "missing"})
+
+    assert response.status_code == 404
+    assert "missing" not in main.batchers
+
+
+@pytest.mark.asyncio
+async def test_evicting_a_model_stops_its_batcher(client, monkeypatch, tmp_path):
+    import main
+
+    for name in ("a", "b"):
+        (tmp_path / name).mkdir()
+        (tmp_path / name / "weights.bin").write_bytes(b"\0" * 100)
+    monkeypatch.setattr(main.registry, "model_path", str(tmp_path))
+    monkeypatch.setattr(main.registry, "memory_budget_bytes", 150)
+
+    c, _ = client
+    assert (await c.post("/inference", json={"text": "hi", "model": "a"})).status_code == 200
+    batcher = main.batchers["a"]
+
+    assert (await c.post("/inference", json={"text": "hi", "model": "b"})).status_code == 200
+    await asyncio.gather(*main._stopping_batchers)
+
+    assert "a" not in main.batchers
+    with pytest.raises(BatcherClosed):
+        await batcher.submit(main.InferenceRequest(text="late"))
+
+
+@pytest.mark.asyncio
+async def test_batch_phases_are_charged_to_each_submitter(client):
+    import main
+
+    first = RequestProfile("POST", "/inference", None)
+    second = RequestProfile("POST", "/inference", None)
+    request = main.InferenceRequest(text="hi")
+
+    await asyncio.gather(
+        main.submit_batched(main.DEFAULT_MODEL, request, first),
+        main.submit_batched(main.DEFAULT_MODEL, request, second),
+    )
+
+    for profile in (first, second):
+        assert set(profile.phases) == {"model", "tokenize"}
@@ -0,0 +1,80 @@
+"""Request profiler tests."""
+
+import asyncio
+
+import httpx
+import pytest
+from fastapi import FastAPI
+
+from profiling import (
+    UNMATCHED_ROUTE,
+    ProfilerMiddleware,
+    ProfileStore,
+    RequestProfile,
+    _current,
+    add_debug_routes,
+    background_task,
+    current_profile,
+)
+
+
+def http_scope(headers):
+    return {"type": "http", "method": "GET", "path": "/", "headers": headers}
+
+
+@pytest.mark.asyncio
+async def test_background_tasks_do_not_inherit_the_request_profile():
+    async def profile_seen():
+        await asyncio.sleep(0)
+        return current_profile()
+
+    token = _current.set(RequestProfile("GET", "/", None))
+    try:
+        inherited = await asyncio.ensure_future(profile_seen())
+        detached = await background_task(profile_seen())
+    finally:
+        _current.reset(token)
+
+    assert inherited is not None
+    assert detached is None
+
+
+def test_header_trigger_needs_the_token():
+    store = ProfileStore()
+    middleware = ProfilerMiddleware(None, store, token="secret")
+    untriggered = ProfilerMiddleware(None, store, token="")
+
+    assert middleware._should_profile(
+        http_scope([(b"x-profile", b"1"), (b"x-profile-token", b"secret")])
+    )
+    assert not middleware._should_profile(
+        http_scope([(b"x-profile", b"1"), (b"x-profile-token", b"wrong")])
+    )
+    assert not middleware._should_profile(http_scope([(b"x-profile", b"1")]))
+    assert not untriggered._should_profile(http_scope([(b"x-profile", b"1")]))
+
+
+def test_debug_routes_need_a_token():
+    with pytest.raises(ValueError):
+        add_debug_routes(FastAPI(), ProfileStore(), token="")
+
+
+@pytest.mark.asyncio
+async def test_unmatched_requests_share_one_store_entry():
+    app = FastAPI()
+
+    @app.get("/items/{item_id}")
+    async def get_item(item_id: int):
+        return {"id": item_id}
+
+    store = ProfileStore()
+    app.add_middleware(ProfilerMiddleware, store=store, sample_rate=1.0, token="")
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as c:
+        for path in ("/items/1", "/items/2", "/scan/a", "/scan/b", "/.env"):
+            await c.get(path)
+        await c.request("BREW", "/items/3")
+
+    assert store.routes["GET /items/{item_id}"]["count"] == 2
+    assert store.routes[UNMATCHED_ROUTE]["count"] == 4
+    assert set(store.routes) == {"GET /items/{item_id}", UNMATCHED_ROUTE}
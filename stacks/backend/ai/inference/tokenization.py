@@ -0,0 +1,77 @@
+"""
+Tokenizer Accounting
+
+Counts prompt and completion tokens with the tokenizer that belongs to the
+loaded model, so tokens_used and the Prometheus token counters reflect what
+the model actually processes.
+
+Requirements: pip install transformers (optional, falls back to a
+word/punctuation approximation when no tokenizer files are present)
+"""
+
+import os
+import re
+from functools import lru_cache
+from typing import List, Union
+
+from prometheus_client import Counter
+
+# Try to import transformers for the model's own tokenizer
+try:
+    from transformers import AutoTokenizer
+    TRANSFORMERS_AVAILABLE = True
+except ImportError:
+    TRANSFORMERS_AVAILABLE = False
+
+PROMPT_TOKENS = Counter(
+    "inference_prompt_tokens_total",
+    "Prompt tokens processed",
+    ["model"],
+)
+COMPLETION_TOKENS = Counter(
+    "inference_completion_tokens_total",
+    "Completion tokens generated",
+    ["model"],
+)
+
+TOKENIZER_FILES = ("tokenizer.json", "tokenizer_config.json", "tokenizer.model")
+
+
+class RegexTokenizer:
+    """Fallback tokenizer - one token per word or punctuation mark."""
+
+    pattern = re.compile(r"\w+|[^\w\s]", re.UNICODE)
+
+    def count_batch(self, texts: List[str]) -> List[int]:
+        return [len(self.pattern.findall(text)) for text in texts]
+
+
+class HFTokenizer:
+    """Wraps a transformers tokenizer; fast tokenizers encode batches natively."""
+
+    def __init__(self, tokenizer):
+        self.tokenizer = tokenizer
+
+    def count_batch(self, texts: List[str]) -> List[int]:
+        if not texts:
+            return []
+        encoded = self.tokenizer(texts, add_special_tokens=False)["input_ids"]
+        return [len(ids) for ids in encoded]
+
+
+Tokenizer = Union[RegexTokenizer, HFTokenizer]
+
+
+@lru_cache(maxsize=32)
+def load_tokenizer(model_dir: str, version: str) -> Tokenizer:
+    """Load the tokenizer for a model directory (cached per model version)."""
+    has_files = any(os.path.exists(os.path.join(model_dir, f)) for f in TOKENIZER_FILES)
+    if TRANSFORMERS_AVAILABLE and has_files:
+        return HFTokenizer(AutoTokenizer.from_pretrained(model_dir))
+    return RegexTokenizer()
+
+
+def record_usage(model_name: str, prompt_tokens: int, completion_tokens: int):
+    """Export token throughput per model."""
+    PROMPT_TOKENS.labels(model=model_name).inc(prompt_tokens)
+    COMPLETION_TOKENS.labels(model=model_name).inc(completion_tokens)
@@ -0,0 +1,102 @@
+"""
+Memory-Mapped Model Weights
+
+Reads safetensors files (8-byte header length, JSON header, flat tensor
+data) through a read-only mmap instead of copying them into the heap.
+
+- Pages are loaded lazily the first time a tensor is touched
+- Mapped pages live in the OS page cache and are shared by every gunicorn
+  worker that maps the same file, so per-worker RSS stays small
+"""
+
+import json
+import mmap
+import os
+import struct
+from typing import Any, Dict, List, Optional
+
+# safetensors dtype -> memoryview format character
+DTYPE_FORMATS = {
+    "F64": "d",
+    "F32": "f",
+    "F16": "e",
+    "I64": "q",
+    "I32": "i",
+    "I16": "h",
+    "I8": "b",
+    "U8": "B",
+    "BOOL": "?",
+}
+
+
+class MappedWeights:
+    """A safetensors file mapped read-only into memory."""
+
+    def __init__(self, path: str):
+        self.path = os.path.realpath(path)
+        with open(self.path, "rb") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        (header_size,) = struct.unpack("<Q", self._mmap[:8])
+        header = json.loads(self._mmap[8 : 8 + header_size])
+        self.metadata: Dict[str, str] = header.pop("__metadata__", {})
+        self.tensors: Dict[str, Dict[str, Any]] = header
+        self._data_start = 8 + header_size
+
+    @property
+    def mapped_bytes(self) -> int:
+        return len(self._mmap)
+
+    def keys(self) -> List[str]:
+        return list(self.tensors)
+
+    def tensor(self, name: str) -> memoryview:
+        """Zero-copy view of a tensor's data (faults pages in on access)."""
+        info = self.tensors[name]
+        start, end = info["data_offsets"]
+        view = memoryview(self._mmap)[self._data_start + start : self._data_start + end]
+        fmt = DTYPE_FORMATS.get(info["dtype"])
+        if fmt is None:
+            # e.g. BF16 has no struct format; callers reinterpret raw bytes
+            return view
+        return view.cast(fmt, info["shape"]) if info["shape"] else view.cast(fmt)
+
+    def close(self):
+        self._mmap.close()
+
+
+def resident_bytes(paths: List[str]) -> Optional[int]:
+    """Bytes of the given mapped files currently resident in this process.
+
+    Reads /proc/self/smaps (Linux only); returns None elsewhere.
+    """
+    try:
+        with open("/proc/self/smaps") as f:
+            smaps = f.read().splitlines()
+    except OSError:
+        return None
+
+    wanted = set(paths)
+    total = 0
+    in_mapping = False
+    for line in smaps:
+        fields = line.split()
+        if not fields:
+            continue
+        if "-" in fields[0] and len(fields) >= 5:
+            # Mapping header: address perms offset dev inode [path]
+            in_mapping = len(fields) >= 6 and fields[5] in wanted
+        elif in_mapping and fields[0] == "Rss:":
+            total += int(fields[1]) * 1024
+    return total
+
+
+def map_model_dir(path: str) -> List[MappedWeights]:
+    """Map every .safetensors file in a model directory."""
+    if not os.path.isdir(path):
+        return []
+    return [
+        MappedWeights(os.path.join(path, f))
+        for f in sorted(os.listdir(path))
+        if f.endswith(".safetensors")
+    ]
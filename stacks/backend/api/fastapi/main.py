@@ -4,15 +4,28 @@ FastAPI Backend - Main Application
 Usage:
     Development: uvicorn main:app --reload --host 0.0.0.0 --port 8000
     Production:  gunicorn main:app -w 4 -k uvicorn.workers.UvicornWorker
+    Migrate:     python main.py migrate
+    Profile:     python main.py --profile-startup
 """
 
 from contextlib import asynccontextmanager
-from fastapi import FastAPI
+from fastapi import FastAPI, Request
+from fastapi.datastructures import Default
+from fastapi.responses import JSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 from prometheus_fastapi_instrumentator import Instrumentator
 
 from src.core.config import settings
-from src.core.database import engine, Base
+from src.core.database import dispose_engines
+from src.core.cache import init_cache, close_cache
+from src.core.health import check_readiness
+from src.core.compression import CompressionMiddleware
+from src.core.profiling import ProfilerMiddleware, ProfileStore, add_debug_routes
+from src.core.ratelimit import RateLimitMiddleware
+from src.core.schema import ensure_schema
+from src.core.startup import timed
+from src.core.responses import FastJSONResponse
+from src.schemas.pagination import InvalidCursor
 from src.api import router as api_router
 
 
@@ -22,15 +35,20 @@ async def lifespan(app: FastAPI):
     # Startup
     print(f"Starting application in {settings.ENV} mode...")
 
-    # Create database tables
-    async with engine.begin() as conn:
-        await conn.run_sync(Base.metadata.create_all)
+    # Check the schema hash (create_all only runs when models changed)
+    with timed("schema"):
+        await ensure_schema(settings.DB_SCHEMA_MODE)
+
+    # Create Redis client (connection pool)
+    with timed("cache"):
+        await init_cache()
 
     yield
 
     # Shutdown
     print("Shutting down application...")
-    await engine.dispose()
+    await close_cache()
+    await dispose_engines()
 
 
 # Create FastAPI app
@@ -42,8 +60,15 @@ app = FastAPI(
     redoc_url="/redoc" if settings.DEBUG else None,
     openapi_url="/openapi.json" if settings.DEBUG else None,
     lifespan=lifespan,
+    # Kept as a Default() so routes with a response_model still take
+    # FastAPI's own direct-to-JSON path where it has one
+    default_response_class=Default(FastJSONResponse if settings.FAST_JSON else JSONResponse),
 )
 
+# Rate limiting (inside CORS so 429s still carry CORS headers)
+if settings.RATE_LIMIT_ENABLED:
+    app.add_middleware(RateLimitMiddleware, limits=settings.RATE_LIMITS)
+
 # CORS middleware
 app.add_middleware(
     CORSMiddleware,
@@ -53,13 +78,44 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Response compression (brotli/gzip above a size threshold)
+if settings.COMPRESSION_ENABLED:
+    app.add_middleware(
+        CompressionMiddleware,
+        minimum_size=settings.COMPRESSION_MIN_SIZE,
+        gzip_level=settings.GZIP_LEVEL,
+        brotli_quality=settings.BROTLI_QUALITY,
+    )
+
 # Prometheus metrics
 Instrumentator().instrument(app).expose(app, endpoint="/metrics")
 
+# Sampling request profiler (outermost, so it sees the whole request)
+if settings.PROFILING_ENABLED:
+    profile_store = ProfileStore(interval_ms=settings.PROFILE_INTERVAL_MS)
+    app.add_middleware(
+        ProfilerMiddleware,
+        store=profile_store,
+        sample_rate=settings.PROFILE_SAMPLE_RATE,
+        header_trigger=settings.PROFILE_HEADER_TRIGGER,
+        token=settings.PROFILE_TOKEN,
+    )
+    # The header trigger and /debug/profile need a token; sampling works without
+    if settings.PROFILE_TOKEN:
+        add_debug_routes(app, profile_store, token=settings.PROFILE_TOKEN)
+    else:
+        print("Warning: PROFILE_TOKEN not set; X-Profile trigger and /debug/profile disabled")
+
 # Include API router
 app.include_router(api_router, prefix="/api/v1")
 
 
+@app.exception_handler(InvalidCursor)
+async def invalid_cursor_handler(request: Request, exc: InvalidCursor):
+    """Stale or tampered pagination cursors are client errors."""
+    return JSONResponse({"detail": str(exc)}, status_code=400)
+
+
 # ==============================================================================
 # HEALTH CHECK
 # ==============================================================================
@@ -84,9 +140,9 @@ async def health():
 @app.get("/health/ready")
 async def readiness():
     """Readiness check - verifies all dependencies are ready."""
-    # TODO: Check database connection
-    # TODO: Check Redis connection
-    return {"status": "ready"}
+    report = await check_readiness()
+    status_code = 200 if report["status"] == "ready" else 503
+    return JSONResponse(report, status_code=status_code)
 
 
 @app.get("/health/live")
@@ -105,12 +161,44 @@ async def healthz():
 @app.get("/readyz")
 async def readyz():
     """Kubernetes-style readiness probe."""
-    # TODO: Check database connection
-    # TODO: Check Redis connection
-    return {"status": "ready"}
+    return await readiness()
 
 
 if __name__ == "__main__":
+    import argparse
+    import asyncio
+    import sys
+
+    parser = argparse.ArgumentParser(description=settings.PROJECT_NAME)
+    parser.add_argument("command", nargs="?", default="serve", choices=["serve", "migrate"])
+    parser.add_argument(
+        "--profile-startup",
+        action="store_true",
+        help="Report import and init time per module, then exit (schema is only verified)",
+    )
+    args = parser.parse_args()
+
+    if args.profile_startup:
+        from src.core.startup import profile_startup
+
+        # Profiling runs the real lifespan; it may read the schema hash but
+        # must never create or migrate tables
+        if settings.DB_SCHEMA_MODE == "create":
+            settings.DB_SCHEMA_MODE = "verify"
+        sys.exit(profile_startup(app, settings.STARTUP_BUDGET_MS))
+
+    if args.command == "migrate":
+        from src.core.schema import migrate
+
+        async def run_migrate():
+            try:
+                print(f"Schema migrated (hash {await migrate()})")
+            finally:
+                await dispose_engines()
+
+        asyncio.run(run_migrate())
+        sys.exit(0)
+
     import uvicorn
 
     uvicorn.run(
@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+Response Serialization Benchmark
+
+Compares per-request CPU time on a large list payload returned from a route
+without a response_model:
+
+- default JSONResponse (jsonable_encoder + json.dumps)
+- FastJSONResponse as the default class (FAST_JSON; jsonable_encoder still
+  runs, only json.dumps is replaced)
+- FastJSONResponse returned explicitly (no jsonable_encoder), with and
+  without compression
+
+Usage:
+    python scripts/benchmark_responses.py [--items 5000] [--requests 50]
+"""
+
+import argparse
+import asyncio
+import sys
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import List
+from uuid import UUID, uuid4
+
+import httpx
+from fastapi import FastAPI
+from fastapi.datastructures import Default
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.core.compression import BROTLI_AVAILABLE, CompressionMiddleware  # noqa: E402
+from src.core.responses import ORJSON_AVAILABLE, FastJSONResponse  # noqa: E402
+
+
+class Item(BaseModel):
+    id: UUID
+    name: str
+    price: float
+    tags: List[str]
+    created_at: datetime
+
+
+class ItemList(BaseModel):
+    items: List[Item]
+
+
+def make_payload(count: int) -> ItemList:
+    now = datetime.now(timezone.utc)
+    return ItemList(
+        items=[
+            Item(id=uuid4(), name=f"item-{i}", price=i * 1.5, tags=["a", "b", "c"], created_at=now)
+            for i in range(count)
+        ]
+    )
+
+
+def build_app(payload: ItemList, default_class: type, explicit: bool, compress: bool) -> FastAPI:
+    app = FastAPI(default_response_class=Default(default_class))
+    if compress:
+        app.add_middleware(CompressionMiddleware, minimum_size=1024)
+
+    @app.get("/items")
+    async def items():
+        # No response_model: the common "return a dict/model" route shape
+        return FastJSONResponse(payload) if explicit else payload
+
+    return app
+
+
+async def measure(app: FastAPI, requests: int, accept_encoding: str):
+    transport = httpx.ASGITransport(app=app)
+    headers = {"Accept-Encoding": accept_encoding}
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        response = await client.get("/items", headers=headers)  # warm up
+        size = int(response.headers["content-length"])
+        cpu_start, wall_start = time.process_time(), time.perf_counter()
+        for _ in range(requests):
+            await client.get("/items", headers=headers)
+        cpu = (time.process_time() - cpu_start) / requests
+        wall = (time.perf_counter() - wall_start) / requests
+    return cpu, wall, size
+
+
+def render_only(payload: ItemList, rounds: int):
+    start = time.process_time()
+    for _ in range(rounds):
+        JSONResponse(jsonable_encoder(payload))
+    default = (time.process_time() - start) / rounds
+
+    start = time.process_time()
+    for _ in range(rounds):
+        FastJSONResponse(payload)
+    fast = (time.process_time() - start) / rounds
+    return default, fast
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark JSON rendering and compression")
+    parser.add_argument("--items", type=int, default=5000, help="Items per response")
+    parser.add_argument("--requests", type=int, default=50, help="Requests per scenario")
+    args = parser.parse_args()
+
+    payload = make_payload(args.items)
+    print(f"orjson: {ORJSON_AVAILABLE}  brotli: {BROTLI_AVAILABLE}  items/response: {args.items}\n")
+
+    default, fast = render_only(payload, args.requests)
+    print("Serialization only (CPU ms per response)")
+    print(f"  jsonable_encoder + JSONResponse  {default * 1000:8.2f}")
+    print(f"  FastJSONResponse                 {fast * 1000:8.2f}  ({default / fast:.1f}x)\n")
+
+    scenarios = [
+        ("default JSONResponse", JSONResponse, False, False, ""),
+        ("default FastJSONResponse", FastJSONResponse, False, False, ""),
+        ("return FastJSONResponse", JSONResponse, True, False, ""),
+        ("return FastJSONResponse + gzip", JSONResponse, True, True, "gzip"),
+    ]
+    if BROTLI_AVAILABLE:
+        scenarios.append(("return FastJSONResponse + br", JSONResponse, True, True, "br"))
+
+    print("End to end through ASGI (per request)")
+    print(f"  {'scenario':<32} {'CPU ms':>8} {'wall ms':>8} {'bytes':>10}")
+    for name, default_class, explicit, compress, encoding in scenarios:
+        app = build_app(payload, default_class, explicit, compress)
+        cpu, wall, size = asyncio.run(measure(app, args.requests, encoding))
+        print(f"  {name:<32} {cpu * 1000:8.2f} {wall * 1000:8.2f} {size:>10}")
+
+
+if __name__ == "__main__":
+    main()
@@ -3,12 +3,14 @@
 from fastapi import APIRouter
 
 # Import routers
+from src.api.bulk import router as bulk_router
 # from src.api.auth import router as auth_router
 # from src.api.users import router as users_router
 
 router = APIRouter()
 
 # Include routers
+router.include_router(bulk_router, prefix="/bulk", tags=["bulk"])
 # router.include_router(auth_router, prefix="/auth", tags=["auth"])
 # router.include_router(users_router, prefix="/users", tags=["users"])
 
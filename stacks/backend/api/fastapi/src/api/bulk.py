@@ -0,0 +1,48 @@
+"""Bulk write endpoints - NDJSON in, per-chunk NDJSON reports out."""
+
+import json
+from typing import Literal, Optional
+
+from fastapi import APIRouter, HTTPException, Query, Request
+
+from src.core.config import settings
+from src.core.database import get_engine
+from src.core.streaming import DuplexStreamingResponse
+from src.services.bulk import (
+    BulkWriteError,
+    bulk_write_stream,
+    get_bulk_table,
+    iter_ndjson_chunks,
+)
+
+router = APIRouter()
+
+
+@router.post("/{table}")
+async def bulk_write_table(
+    table: str,
+    request: Request,
+    mode: Literal["insert", "upsert", "ignore"] = "insert",
+    chunk_size: int = Query(settings.BULK_CHUNK_SIZE, ge=1, le=settings.BULK_MAX_CHUNK_SIZE),
+    conflict: Optional[str] = Query(None, description="Comma-separated conflict columns"),
+):
+    """Stream NDJSON rows into a table, committing every `chunk_size` rows.
+
+    Responds with one NDJSON line per chunk ({"chunk", "status", ...}) and a
+    final {"done": true, ...} summary. Failed chunks are rolled back and
+    reported; the rest of the upload still runs.
+    """
+    try:
+        target = get_bulk_table(table)
+    except BulkWriteError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+
+    conflict_columns = [c.strip() for c in conflict.split(",")] if conflict else None
+    chunks = iter_ndjson_chunks(request.stream(), chunk_size, settings.BULK_MAX_LINE_BYTES)
+
+    async def body():
+        reports = bulk_write_stream(get_engine(), target, chunks, mode, conflict_columns)
+        async for report in reports:
+            yield json.dumps(report) + "\n"
+
+    return DuplexStreamingResponse(body(), media_type="application/x-ndjson")
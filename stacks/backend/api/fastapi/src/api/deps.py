@@ -0,0 +1,20 @@
+"""Shared API dependencies."""
+
+from typing import Optional
+
+from fastapi import HTTPException, Query
+
+from src.core.config import settings
+from src.schemas.pagination import InvalidCursor, PageParams, decode_cursor
+
+
+def page_params(
+    limit: int = Query(settings.PAGE_DEFAULT_LIMIT, ge=1, le=settings.PAGE_MAX_LIMIT),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+) -> PageParams:
+    """Dependency for ?limit=&cursor= query parameters."""
+    try:
+        after = decode_cursor(cursor) if cursor else None
+    except InvalidCursor as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return PageParams(limit=limit, after=after)
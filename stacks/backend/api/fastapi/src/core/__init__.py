@@ -1,6 +1,28 @@
-"""Core module - configuration, database, security."""
+"""Core module - configuration, database, cache, security.
 
-from src.core.config import settings
-from src.core.database import Base, get_db, engine
+Submodules are imported on first attribute access, so `import src.core`
+does not load SQLAlchemy or Redis until they are needed.
+"""
 
-__all__ = ["settings", "Base", "get_db", "engine"]
+import importlib
+
+_EXPORTS = {
+    "settings": "src.core.config",
+    "Base": "src.core.database",
+    "get_db": "src.core.database",
+    "get_read_db": "src.core.database",
+    "get_engine": "src.core.database",
+    "engine": "src.core.database",
+    "cached": "src.core.cache",
+    "get_redis": "src.core.cache",
+    "invalidate_tags": "src.core.cache",
+    "bearer_subject": "src.core.security",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name: str):
+    if name in _EXPORTS:
+        return getattr(importlib.import_module(_EXPORTS[name]), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
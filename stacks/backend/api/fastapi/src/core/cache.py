@@ -0,0 +1,550 @@
+"""
+Cache Configuration
+
+Pooled async Redis client with an in-process L1 LRU in front of it, and a
+route decorator for caching GET responses with TTL and tag invalidation.
+
+Set REDIS_URL=memory:// to use the in-process stand-in (tests, local dev).
+
+Redis errors degrade to computing the response - a cache outage should not
+take the API down.
+"""
+
+import asyncio
+import base64
+import functools
+import hashlib
+import inspect
+import json
+import secrets
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional, Sequence, Set, Tuple
+
+from fastapi import Request, Response
+from fastapi.concurrency import run_in_threadpool
+from fastapi.datastructures import DefaultPlaceholder
+from fastapi.routing import APIRoute, serialize_response
+from redis.asyncio import BlockingConnectionPool, Redis
+from redis.exceptions import RedisError
+
+from src.core.config import settings
+from src.core.profiling import phase
+from src.core.security import bearer_subject
+
+KEY_PREFIX = "cache:"
+TAG_PREFIX = "cache:tag:"
+LOCK_PREFIX = "cache:lock:"
+
+# Caught around every Redis call; the request then proceeds uncached
+REDIS_ERRORS = (RedisError, OSError, asyncio.TimeoutError)
+
+# Drop the fill lock only if it still holds our token: once it has expired
+# another worker may own it
+RELEASE_LOCK_LUA = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    return redis.call('DEL', KEYS[1])
+end
+return 0
+"""
+
+# Store an entry and index it under its tags in one round-trip. Tag sets only
+# ever have their TTL extended, so they outlive every entry they list.
+# KEYS: entry, tag sets...; ARGV: value, ttl, cache key
+STORE_LUA = """
+local ttl = tonumber(ARGV[2])
+redis.call('SET', KEYS[1], ARGV[1], 'EX', ttl)
+for i = 2, #KEYS do
+    redis.call('SADD', KEYS[i], ARGV[3])
+    if redis.call('TTL', KEYS[i]) < ttl then
+        redis.call('EXPIRE', KEYS[i], ttl)
+    end
+end
+return 1
+"""
+
+
+# ==============================================================================
+# IN-MEMORY STAND-IN
+# ==============================================================================
+
+
+class InMemoryRedis:
+    """Minimal in-process stand-in for the Redis commands used here."""
+
+    def __init__(self):
+        self._data: Dict[str, Tuple[Any, Optional[float]]] = {}
+
+    def _get(self, key: str) -> Any:
+        entry = self._data.get(key)
+        if entry is None:
+            return None
+        value, expires_at = entry
+        if expires_at is not None and expires_at < time.monotonic():
+            del self._data[key]
+            return None
+        return value
+
+    async def ping(self) -> bool:
+        return True
+
+    async def get(self, key: str) -> Optional[str]:
+        return self._get(key)
+
+    async def set(
+        self,
+        key: str,
+        value: str,
+        ex: Optional[int] = None,
+        px: Optional[int] = None,
+        nx: bool = False,
+    ) -> Optional[bool]:
+        if nx and self._get(key) is not None:
+            return None
+        ttl = ex if ex is not None else (px / 1000 if px is not None else None)
+        self._data[key] = (value, time.monotonic() + ttl if ttl is not None else None)
+        return True
+
+    async def delete(self, *keys: str) -> int:
+        return sum(self._data.pop(key, None) is not None for key in keys)
+
+    async def sadd(self, key: str, *members: str) -> int:
+        current = self._get(key) or set()
+        added = len(set(members) - current)
+        self._data[key] = (current | set(members), self._data.get(key, (None, None))[1])
+        return added
+
+    async def smembers(self, key: str) -> Set[str]:
+        return set(self._get(key) or set())
+
+    async def expire(self, key: str, seconds: int) -> bool:
+        value = self._get(key)
+        if value is None:
+            return False
+        self._data[key] = (value, time.monotonic() + seconds)
+        return True
+
+    async def ttl(self, key: str) -> int:
+        if self._get(key) is None:
+            return -2
+        expires_at = self._data[key][1]
+        return -1 if expires_at is None else int(expires_at - time.monotonic())
+
+    async def aclose(self):
+        self._data.clear()
+
+
+# ==============================================================================
+# CLIENT LIFECYCLE
+# ==============================================================================
+
+redis_client: Optional[Redis] = None
+
+
+async def init_cache():
+    """Create the pooled Redis client (called from lifespan)."""
+    global redis_client
+    if settings.REDIS_URL.startswith("memory://"):
+        redis_client = InMemoryRedis()
+        return
+
+    # Blocking pool: callers wait for a free connection instead of erroring
+    pool = BlockingConnectionPool.from_url(
+        settings.REDIS_URL,
+        max_connections=settings.REDIS_POOL_SIZE,
+        timeout=settings.REDIS_POOL_TIMEOUT,
+        decode_responses=True,
+    )
+    redis_client = Redis(connection_pool=pool)
+
+
+async def close_cache():
+    """Close the Redis client and its pool."""
+    global redis_client
+    if redis_client is not None:
+        await redis_client.aclose()
+        redis_client = None
+    response_cache.local.clear()
+
+
+def get_redis() -> Redis:
+    """Dependency for getting the shared Redis client."""
+    if redis_client is None:
+        raise RuntimeError("Cache not initialized - call init_cache() in lifespan")
+    return redis_client
+
+
+# ==============================================================================
+# TWO-TIER RESPONSE CACHE
+# ==============================================================================
+
+
+class LocalLRU:
+    """In-process L1 cache with TTL and tag index."""
+
+    def __init__(self, max_entries: int, ttl_seconds: float):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[str, Tuple[float, str, Sequence[str]]]" = OrderedDict()
+
+    def get(self, key: str) -> Optional[str]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, value, _ = entry
+        if expires_at < time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    def set(self, key: str, value: str, ttl: float, tags: Sequence[str]):
+        # L1 never outlives Redis, and is kept short so invalidations made by
+        # other workers are picked up quickly
+        expires_at = time.monotonic() + min(ttl, self.ttl_seconds)
+        self._entries[key] = (expires_at, value, tuple(tags))
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def invalidate_tags(self, tags: Sequence[str]):
+        wanted = set(tags)
+        for key in [k for k, (_, _, t) in self._entries.items() if wanted & set(t)]:
+            del self._entries[key]
+
+    def clear(self):
+        self._entries.clear()
+
+
+class Uncacheable(Exception):
+    """Raised by a compute function whose value must not be stored or shared."""
+
+    def __init__(self, value: Any):
+        super().__init__("value is not cacheable")
+        self.value = value
+
+
+async def _store(redis: Redis, key: str, value: str, ttl: int, tags: Sequence[str]):
+    if not isinstance(redis, InMemoryRedis):
+        await redis.register_script(STORE_LUA)(
+            keys=[KEY_PREFIX + key, *(TAG_PREFIX + tag for tag in tags)],
+            args=[value, ttl, key],
+        )
+        return
+    await redis.set(KEY_PREFIX + key, value, ex=ttl)
+    for tag in tags:
+        await redis.sadd(TAG_PREFIX + tag, key)
+        if await redis.ttl(TAG_PREFIX + tag) < ttl:
+            await redis.expire(TAG_PREFIX + tag, ttl)
+
+
+async def _release_lock(redis: Redis, key: str, token: str):
+    try:
+        if isinstance(redis, InMemoryRedis):
+            if await redis.get(key) == token:
+                await redis.delete(key)
+        else:
+            await redis.register_script(RELEASE_LOCK_LUA)(keys=[key], args=[token])
+    except REDIS_ERRORS as e:
+        print(f"Cache lock release failed (expires on its own): {e}")
+
+
+class ResponseCache:
+    """L1 LRU + Redis cache with single-flight fills."""
+
+    def __init__(self):
+        self.local = LocalLRU(settings.CACHE_L1_MAX_ENTRIES, settings.CACHE_L1_TTL)
+        self._inflight: Dict[str, asyncio.Future] = {}
+
+    async def get(self, key: str) -> Optional[str]:
+        value = self.local.get(key)
+        if value is not None:
+            return value
+
+        try:
+            value = await get_redis().get(KEY_PREFIX + key)
+        except REDIS_ERRORS as e:
+            print(f"Cache read failed, treating as a miss: {e}")
+            return None
+        if value is not None:
+            self.local.set(key, value, settings.CACHE_L1_TTL, ())
+        return value
+
+    async def set(self, key: str, value: str, ttl: int, tags: Sequence[str] = ()):
+        redis = get_redis()
+        self.local.set(key, value, ttl, tags)
+        try:
+            await _store(redis, key, value, ttl, tags)
+        except REDIS_ERRORS as e:
+            print(f"Cache write failed, kept in this process only: {e}")
+
+    async def invalidate_tags(self, *tags: str):
+        """Drop every cached entry labelled with any of the tags."""
+        redis = get_redis()
+        self.local.invalidate_tags(tags)
+        try:
+            for tag in tags:
+                keys = await redis.smembers(TAG_PREFIX + tag)
+                if keys:
+                    await redis.delete(*(KEY_PREFIX + k for k in keys))
+                await redis.delete(TAG_PREFIX + tag)
+        except REDIS_ERRORS as e:
+            print(f"Cache invalidation of {tags} failed, entries expire with their TTL: {e}")
+
+    async def get_or_set(
+        self,
+        key: str,
+        compute: Callable[[], Any],
+        ttl: int,
+        tags: Sequence[str] = (),
+    ) -> Any:
+        """Return a cached value or compute it exactly once.
+
+        `compute` returns the serialized value, or raises Uncacheable to
+        hand a value back to its own caller only. Concurrent misses in this
+        process wait for the first caller, which computes in its own task
+        (with its own request's dependencies); across processes a short
+        Redis lock makes other workers wait for the winner's result instead
+        of all hitting the database.
+        """
+        with phase("cache"):
+            value = await self.get(key)
+        if value is not None:
+            return value
+
+        future = self._inflight.get(key)
+        if future is not None:
+            value = await asyncio.shield(future)
+            if value is not None:
+                return value
+            # The first caller was cancelled or got an unshareable value
+            try:
+                return await compute()
+            except Uncacheable as e:
+                return e.value
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            value = await self._fill(key, compute, ttl, tags)
+        except Uncacheable as e:
+            future.set_result(None)
+            return e.value
+        except Exception as e:
+            future.set_exception(e)
+            future.exception()  # Retrieved, even when nobody was waiting
+            raise
+        except BaseException:
+            future.set_result(None)
+            raise
+        finally:
+            self._inflight.pop(key, None)
+        future.set_result(value)
+        return value
+
+    async def _fill(
+        self,
+        key: str,
+        compute: Callable[[], Any],
+        ttl: int,
+        tags: Sequence[str],
+    ) -> str:
+        redis = get_redis()
+        lock_key = LOCK_PREFIX + key
+        lock_ms = int(settings.CACHE_LOCK_TIMEOUT * 1000)
+        deadline = time.monotonic() + settings.CACHE_LOCK_TIMEOUT
+        token = secrets.token_hex(16)
+
+        locked = False
+        try:
+            while True:
+                locked = bool(await redis.set(lock_key, token, px=lock_ms, nx=True))
+                # Give up waiting on another worker's fill after the lock timeout
+                if locked or time.monotonic() > deadline:
+                    break
+                await asyncio.sleep(0.05)
+                value = await redis.get(KEY_PREFIX + key)
+                if value is not None:
+                    self.local.set(key, value, ttl, tags)
+                    return value
+        except REDIS_ERRORS as e:
+            print(f"Cache lock unavailable, computing without it: {e}")
+
+        try:
+            value = await compute()
+            with phase("cache"):
+                await self.set(key, value, ttl, tags)
+            return value
+        finally:
+            if locked:
+                await _release_lock(redis, lock_key, token)
+
+
+response_cache = ResponseCache()
+
+
+async def invalidate_tags(*tags: str):
+    """Invalidate cached responses by tag (call after writes)."""
+    await response_cache.invalidate_tags(*tags)
+
+
+# ==============================================================================
+# ROUTE DECORATOR
+# ==============================================================================
+
+
+def request_cache_key(request: Request) -> str:
+    """Cache key from method, path and sorted query parameters."""
+    query = "&".join(f"{k}={v}" for k, v in sorted(request.query_params.multi_items()))
+    raw = f"{request.method}:{request.url.path}?{query}"
+    return hashlib.sha256(raw.encode()).hexdigest()
+
+
+async def _render(request: Request, sub_response: Response, result: Any) -> Response:
+    """The response FastAPI would send for `result`, response_model applied."""
+    if isinstance(result, Response):
+        return result
+
+    route: APIRoute = request.scope["route"]
+    with phase("serialization"):
+        content = await serialize_response(
+            field=route.response_field,
+            response_content=result,
+            include=route.response_model_include,
+            exclude=route.response_model_exclude,
+            by_alias=route.response_model_by_alias,
+            exclude_unset=route.response_model_exclude_unset,
+            exclude_defaults=route.response_model_exclude_defaults,
+            exclude_none=route.response_model_exclude_none,
+        )
+        response_class = route.response_class
+        if isinstance(response_class, DefaultPlaceholder):
+            response_class = response_class.value
+        # A status set on the injected Response wins, as in FastAPI
+        status_code = sub_response.status_code or route.status_code
+        response = response_class(content, **({"status_code": status_code} if status_code else {}))
+    response.raw_headers.extend(sub_response.headers.raw)
+    return response
+
+
+def _is_storable(response: Response) -> bool:
+    # Streaming and file responses have no body to store
+    if not isinstance(getattr(response, "body", None), bytes):
+        return False
+    if not 200 <= response.status_code < 300:
+        return False
+    return all(name != b"set-cookie" for name, _ in response.raw_headers)
+
+
+def _dump_response(response: Response) -> str:
+    headers = [
+        (name.decode("latin-1"), value.decode("latin-1"))
+        for name, value in response.raw_headers
+        if name != b"content-length"
+    ]
+    meta = json.dumps({"status": response.status_code, "headers": headers})
+    # The Redis client decodes replies as text; base64 keeps any body intact
+    return meta + "\n" + base64.b64encode(response.body).decode("ascii")
+
+
+def _load_response(value: str) -> Response:
+    meta, _, body = value.partition("\n")
+    info = json.loads(meta)
+    response = Response(content=base64.b64decode(body), status_code=info["status"])
+    response.raw_headers.extend(
+        (name.encode("latin-1"), value.encode("latin-1")) for name, value in info["headers"]
+    )
+    return response
+
+
+def _injected_param(params: List[inspect.Parameter], name: str, annotation: type) -> str:
+    """Parameter FastAPI fills with `annotation`, appending one if needed.
+
+    FastAPI injects a single Request and a single Response parameter per
+    endpoint, so an existing one must be shared rather than shadowed.
+    """
+    for param in params:
+        if isinstance(param.annotation, type) and issubclass(param.annotation, annotation):
+            return param.name
+    injected = inspect.Parameter(name, inspect.Parameter.KEYWORD_ONLY, annotation=annotation)
+    if params and params[-1].kind == inspect.Parameter.VAR_KEYWORD:
+        params.insert(len(params) - 1, injected)
+    else:
+        params.append(injected)
+    return name
+
+
+def cached(
+    ttl: Optional[int] = None,
+    tags: Sequence[str] = (),
+    key_builder: Callable[[Request], str] = request_cache_key,
+):
+    """Cache a GET route's response.
+
+    The response is stored after response_model filtering, with its status
+    code and headers, and replayed as-is. Requests with a bearer token are
+    cached per token subject. Requests with other credentials (another
+    Authorization scheme, or a CACHE_PRIVATE_HEADERS header such as Cookie)
+    are never cached, nor are streaming/file responses, responses that are
+    not 2xx and responses that set cookies.
+
+    Usage:
+        @router.get("/items")
+        @cached(ttl=60, tags=["items"])
+        async def list_items(db: AsyncSession = Depends(get_db)):
+            ...
+
+        # after a write
+        await invalidate_tags("items")
+    """
+
+    def decorator(func: Callable):
+        signature = inspect.signature(func)
+        params = list(signature.parameters.values())
+        request_name = _injected_param(params, "_cache_request", Request)
+        response_name = _injected_param(params, "_cache_response", Response)
+        injected = {request_name, response_name} - set(signature.parameters)
+
+        async def call(*args, **kwargs):
+            if inspect.iscoroutinefunction(func):
+                return await func(*args, **kwargs)
+            return await run_in_threadpool(func, *args, **kwargs)
+
+        async def compute(request: Request, sub_response: Response, args, kwargs) -> str:
+            response = await _render(request, sub_response, await call(*args, **kwargs))
+            if not _is_storable(response):
+                raise Uncacheable(response)
+            return _dump_response(response)
+
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            request: Request = kwargs[request_name]
+            sub_response: Response = kwargs[response_name]
+            for name in injected:
+                del kwargs[name]
+            if not settings.CACHE_ENABLED or request.method != "GET":
+                return await call(*args, **kwargs)
+
+            if any(name in request.headers for name in settings.CACHE_PRIVATE_HEADERS):
+                return await call(*args, **kwargs)
+            key = key_builder(request)
+            if "authorization" in request.headers:
+                subject = bearer_subject(request.headers)
+                if subject is None:
+                    # Credentials we cannot attribute to a user: never share
+                    return await call(*args, **kwargs)
+                key = f"{key}:sub:{subject}"
+
+            value = await response_cache.get_or_set(
+                key,
+                lambda: compute(request, sub_response, args, kwargs),
+                ttl or settings.CACHE_DEFAULT_TTL,
+                tags,
+            )
+            return value if isinstance(value, Response) else _load_response(value)
+
+        # Ask FastAPI to inject the Request and Response without changing the route's API
+        wrapper.__signature__ = signature.replace(parameters=params)
+        return wrapper
+
+    return decorator
@@ -6,7 +6,7 @@ All settings can be overridden via environment variables.
 """
 
 from functools import lru_cache
-from typing import List
+from typing import Dict, List, Literal
 
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
@@ -36,6 +36,7 @@ class Settings(BaseSettings):
     # ==========================================================================
     HOST: str = "0.0.0.0"
     PORT: int = 8000
+    STARTUP_BUDGET_MS: int = 2000  # Cold start target for --profile-startup
 
     # ==========================================================================
     # Database (PostgreSQL)
@@ -47,11 +48,89 @@ class Settings(BaseSettings):
     DB_MAX_OVERFLOW: int = 10
     DB_POOL_TIMEOUT: int = 30
 
+    # Pool instrumentation
+    DB_SLOW_QUERY_MS: int = 200  # Log statements slower than this
+    DB_POOL_ADAPTIVE: Literal["off", "warn", "grow"] = "off"
+    DB_POOL_WAIT_THRESHOLD_MS: int = 50  # Sustained avg checkout wait that triggers it
+    DB_POOL_ADAPTIVE_INTERVAL: int = 30  # Seconds between adjustments
+    DB_POOL_MAX_OVERFLOW_LIMIT: int = 40  # Upper bound for grow mode
+
+    # Startup schema check: create | verify | skip (see src/core/schema.py)
+    DB_SCHEMA_MODE: Literal["create", "verify", "skip"] = "create"
+
+    # Read replicas (optional) - used by get_read_db()
+    DATABASE_REPLICA_URLS: List[str] = []
+    DB_REPLICA_EJECT_SECONDS: int = 30
+
     # ==========================================================================
     # Cache (Redis)
     # ==========================================================================
-    REDIS_URL: str = "redis://localhost:6379/0"
+    REDIS_URL: str = "redis://localhost:6379/0"  # memory:// for an in-process stand-in
     REDIS_POOL_SIZE: int = 10
+    REDIS_POOL_TIMEOUT: int = 5
+
+    # Response cache
+    CACHE_ENABLED: bool = True
+    CACHE_DEFAULT_TTL: int = 60
+    CACHE_L1_MAX_ENTRIES: int = 1024
+    CACHE_L1_TTL: int = 5  # Short so other workers' invalidations apply quickly
+    CACHE_LOCK_TIMEOUT: float = 5.0
+    # Requests carrying any of these headers bypass @cached (bearer tokens are
+    # instead cached per subject); add API-key headers used for auth here
+    CACHE_PRIVATE_HEADERS: List[str] = ["cookie", "x-api-key"]
+
+    # ==========================================================================
+    # Responses
+    # ==========================================================================
+    # orjson as the default response class; not faster (see src/core/responses.py)
+    FAST_JSON: bool = False
+    COMPRESSION_ENABLED: bool = True
+    COMPRESSION_MIN_SIZE: int = 1024  # Bytes; smaller bodies are sent uncompressed
+    GZIP_LEVEL: int = 6
+    BROTLI_QUALITY: int = 4  # Used when brotli is installed and accepted
+
+    # ==========================================================================
+    # Pagination and streaming lists
+    # ==========================================================================
+    PAGE_DEFAULT_LIMIT: int = 50
+    PAGE_MAX_LIMIT: int = 500
+    STREAM_YIELD_PER: int = 1000  # Rows fetched per server-side cursor round-trip
+
+    # ==========================================================================
+    # Bulk writes (/api/v1/bulk/{table})
+    # ==========================================================================
+    BULK_WRITE_TABLES: List[str] = []  # Allowlist of table names
+    BULK_CHUNK_SIZE: int = 1000  # Rows per transaction
+    BULK_MAX_CHUNK_SIZE: int = 10000
+    BULK_MAX_LINE_BYTES: int = 1_048_576
+
+    # ==========================================================================
+    # Health checks
+    # ==========================================================================
+    HEALTH_CHECK_TIMEOUT: float = 1.0  # Per dependency
+    HEALTH_CACHE_SECONDS: float = 2.0  # Reuse readiness results between probes
+
+    # ==========================================================================
+    # Rate limiting
+    # ==========================================================================
+    # Off by default: behind a proxy every client shares the proxy's IP
+    # unless RATE_LIMIT_TRUSTED_PROXIES is set
+    RATE_LIMIT_ENABLED: bool = False
+    RATE_LIMIT_BACKEND: Literal["memory", "redis"] = "memory"  # redis: shared by all workers
+    # Path prefix -> "N/second|minute|hour|day" (longest prefix wins)
+    RATE_LIMITS: Dict[str, str] = {"/api/v1": "100/second"}
+    # Proxies in front of the app that append to X-Forwarded-For (1 behind
+    # stacks/infra/proxy); 0 keys on the socket peer address
+    RATE_LIMIT_TRUSTED_PROXIES: int = 0
+
+    # ==========================================================================
+    # Request profiling (see src/core/profiling.py)
+    # ==========================================================================
+    PROFILING_ENABLED: bool = False
+    PROFILE_SAMPLE_RATE: float = 0.0  # Fraction of requests profiled
+    PROFILE_HEADER_TRIGGER: bool = True  # Profile requests sent with X-Profile: 1
+    PROFILE_INTERVAL_MS: float = 5.0  # Stack sampling interval
+    PROFILE_TOKEN: str = ""  # X-Profile-Token secret; header trigger and debug routes need it
 
     # ==========================================================================
     # Security
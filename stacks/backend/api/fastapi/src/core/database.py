@@ -2,26 +2,80 @@
 Database Configuration
 
 Async SQLAlchemy setup with PostgreSQL.
+
+- Writes (and reads that must see them) use the primary engine via get_db()
+- Pure reads can use get_read_db(), which routes to read replicas
+  (round-robin, replicas that fail are ejected for a cool-down period)
+- Sessions are created lazily, so requests that never query the database
+  never touch a pool
+- Engines are created on first use (get_engine()), so importing this module
+  does not load the database driver
 """
 
-from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
+import asyncio
+import datetime as dt
+import itertools
+import time
+import uuid
+from decimal import Decimal, InvalidOperation
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional
+
+from sqlalchemy import JSON, event
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
 from sqlalchemy.orm import DeclarativeBase
 
 from src.core.config import settings
+from src.core.pool import InstrumentedPool, instrument_engine
 
 
-# Create async engine
-engine = create_async_engine(
-    settings.DATABASE_URL,
-    pool_size=settings.DB_POOL_SIZE,
-    max_overflow=settings.DB_MAX_OVERFLOW,
-    pool_timeout=settings.DB_POOL_TIMEOUT,
-    echo=settings.DEBUG,
-)
+def _create_engine(url: str, name: str) -> AsyncEngine:
+    db_engine = create_async_engine(
+        url,
+        poolclass=InstrumentedPool,
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT,
+        echo=settings.DEBUG,
+    )
+    instrument_engine(db_engine, name)
+    return db_engine
+
+
+# Engines by pool name ("primary", "replica-0", ...), created on first use
+_engines: Dict[str, AsyncEngine] = {}
+
+
+def get_engine() -> AsyncEngine:
+    """The primary (read-write) engine."""
+    if "primary" not in _engines:
+        _engines["primary"] = _create_engine(settings.DATABASE_URL, "primary")
+    return _engines["primary"]
 
-# Create async session factory
+
+def get_replica_engines() -> List[AsyncEngine]:
+    """Read replica engines (optional, each with its own pool)."""
+    replicas = []
+    for i, url in enumerate(settings.DATABASE_REPLICA_URLS):
+        name = f"replica-{i}"
+        if name not in _engines:
+            _engines[name] = _create_engine(url, name)
+        replicas.append(_engines[name])
+    return replicas
+
+
+def created_engines() -> Dict[str, AsyncEngine]:
+    """Engines created so far (for metrics and shutdown)."""
+    return dict(_engines)
+
+
+# Create async session factory (bound per session to the routed engine)
 async_session = async_sessionmaker(
-    engine,
     class_=AsyncSession,
     expire_on_commit=False,
     autocommit=False,
@@ -35,14 +89,208 @@ class Base(DeclarativeBase):
     pass
 
 
-async def get_db() -> AsyncSession:
-    """Dependency for getting database session."""
-    async with async_session() as session:
-        try:
-            yield session
+# ==============================================================================
+# COLUMN VALUES
+# ==============================================================================
+
+
+def _to_bool(value: Any) -> bool:
+    if isinstance(value, str) and value.lower() in ("true", "false"):
+        return value.lower() == "true"
+    if value in (0, 1):
+        return bool(value)
+    raise ValueError(f"not a boolean: {value!r}")
+
+
+def _to_decimal(value: Any) -> Decimal:
+    try:
+        # Via str so floats keep their JSON digits (1.1, not 1.1000000000000000888)
+        return Decimal(str(value))
+    except InvalidOperation:
+        raise ValueError(f"not a decimal: {value!r}")
+
+
+# JSON has no date, UUID or decimal types; values for these column types
+# arrive as strings (or numbers) and are converted before binding, since
+# asyncpg does not cast text parameters
+_FROM_JSON: Dict[type, Callable[[Any], Any]] = {
+    dt.datetime: dt.datetime.fromisoformat,
+    dt.date: dt.date.fromisoformat,
+    dt.time: dt.time.fromisoformat,
+    uuid.UUID: uuid.UUID,
+    Decimal: _to_decimal,
+    int: int,
+    float: float,
+    bool: _to_bool,
+}
+
+
+def coerce_value(column: Any, value: Any) -> Any:
+    """Convert a JSON-decoded value to the Python type of `column`.
+
+    Raises ValueError or TypeError when the value does not convert. Values
+    of other column types (JSON, enums, ...) are returned unchanged.
+    """
+    if value is None or isinstance(column.type, JSON):
+        return value
+    try:
+        python_type = column.type.python_type
+    except NotImplementedError:
+        return value
+    convert = _FROM_JSON.get(python_type)
+    if convert is None or isinstance(value, python_type):
+        return value
+    return convert(value)
+
+
+# ==============================================================================
+# READ REPLICA ROUTING
+# ==============================================================================
+
+
+class ReplicaRouter:
+    """Round-robin replica selection with health-based ejection."""
+
+    def __init__(self, engines: List[AsyncEngine], eject_seconds: int):
+        self.engines = engines
+        self.eject_seconds = eject_seconds
+        self._cycle = itertools.cycle(range(len(engines))) if engines else None
+        # Replica index -> time it may be used again
+        self._ejected: Dict[int, float] = {}
+
+        for index, replica in enumerate(engines):
+            event.listen(replica.sync_engine, "handle_error", self._error_hook(index))
+
+    def _error_hook(self, index: int) -> Callable:
+        def on_error(context):
+            # Connection-level failures eject the replica; SQL errors do not
+            if context.is_disconnect or context.connection is None:
+                self.eject(index)
+
+        return on_error
+
+    def eject(self, index: int):
+        """Stop routing to a replica for the cool-down period."""
+        self._ejected[index] = time.monotonic() + self.eject_seconds
+        print(f"Ejecting read replica #{index} for {self.eject_seconds}s")
+
+    def choose(self) -> AsyncEngine:
+        """Next healthy replica, or the primary if none is available."""
+        now = time.monotonic()
+        for _ in range(len(self.engines)):
+            index = next(self._cycle)
+            if self._ejected.get(index, 0) <= now:
+                self._ejected.pop(index, None)
+                return self.engines[index]
+        return get_engine()
+
+    def report_failure(self, failed: AsyncEngine, exc: BaseException):
+        """Eject a replica whose connection failed (e.g. refused on connect)."""
+        if failed in self.engines and is_connection_error(exc):
+            self.eject(self.engines.index(failed))
+
+
+def is_connection_error(exc: BaseException) -> bool:
+    """True for network/connect failures rather than SQL errors."""
+    if isinstance(exc, DBAPIError):
+        return exc.connection_invalidated
+    return isinstance(exc, (OSError, asyncio.TimeoutError))
+
+
+_replica_router: Optional[ReplicaRouter] = None
+
+
+def get_replica_router() -> ReplicaRouter:
+    """Shared replica router (creates the replica engines on first use)."""
+    global _replica_router
+    if _replica_router is None:
+        _replica_router = ReplicaRouter(get_replica_engines(), settings.DB_REPLICA_EJECT_SECONDS)
+    return _replica_router
+
+
+# ==============================================================================
+# SESSIONS
+# ==============================================================================
+
+
+class LazySession:
+    """AsyncSession proxy that creates the session on first use.
+
+    Engine routing and session setup are deferred until a route actually
+    touches the database; the pool connection itself is checked out by
+    SQLAlchemy on the first query.
+    """
+
+    def __init__(self, factory: Callable[[], AsyncSession]):
+        self._factory = factory
+        self._session: Optional[AsyncSession] = None
+
+    @property
+    def opened(self) -> bool:
+        return self._session is not None
+
+    @property
+    def session(self) -> AsyncSession:
+        if self._session is None:
+            self._session = self._factory()
+        return self._session
+
+    def __getattr__(self, name: str):
+        return getattr(self.session, name)
+
+    async def close(self):
+        if self._session is not None:
+            await self._session.close()
+
+
+async def get_db() -> AsyncIterator[AsyncSession]:
+    """Dependency for getting database session (primary, read-write)."""
+    session = LazySession(lambda: async_session(bind=get_engine()))
+    try:
+        yield session
+        # Only commit if the request actually started a transaction
+        if session.opened and session.in_transaction():
             await session.commit()
-        except Exception:
+    except Exception:
+        if session.opened:
             await session.rollback()
-            raise
-        finally:
-            await session.close()
+        raise
+    finally:
+        await session.close()
+
+
+async def get_read_db() -> AsyncIterator[AsyncSession]:
+    """Dependency for read-only database session (routed to replicas)."""
+    chosen: List[AsyncEngine] = []
+
+    def open_session() -> AsyncSession:
+        chosen.append(get_replica_router().choose())
+        return async_session(bind=chosen[0])
+
+    session = LazySession(open_session)
+    try:
+        # Never committed; closing the session ends the read transaction
+        yield session
+    except Exception as e:
+        if chosen:
+            get_replica_router().report_failure(chosen[0], e)
+        raise
+    finally:
+        await session.close()
+
+
+async def dispose_engines():
+    """Close the primary and replica connection pools."""
+    for db_engine in _engines.values():
+        await db_engine.dispose()
+
+
+def __getattr__(name: str):
+    # Backwards compatible `from src.core.database import engine`
+    if name == "engine":
+        return get_engine()
+    if name == "replica_engines":
+        return get_replica_engines()
+    if name == "replica_router":
+        return get_replica_router()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
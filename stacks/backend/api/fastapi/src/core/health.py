@@ -0,0 +1,167 @@
+"""
+Health Checks
+
+Readiness probes for PostgreSQL and Redis.
+
+- Both dependencies are checked concurrently, each with a tight timeout
+- Results are cached for HEALTH_CACHE_SECONDS and concurrent probes share a
+  single in-flight check, so frequent kubelet probes across many pods don't
+  each open new database connections
+- Connection pool statistics are included in the response and exported on
+  /metrics
+"""
+
+import asyncio
+import time
+from typing import Any, Dict, Optional
+
+from prometheus_client import REGISTRY, Gauge
+from prometheus_client.core import GaugeMetricFamily
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from src.core import cache
+from src.core.config import settings
+from src.core.database import created_engines, get_engine
+from src.core.profiling import background_task
+
+DB_POOL_PROBE_WAIT = Gauge(
+    "db_pool_probe_wait_seconds",
+    "Time the last readiness probe waited for a pooled connection",
+    ["pool"],
+)
+DEPENDENCY_UP = Gauge(
+    "dependency_up",
+    "Result of the last readiness check (1 = up)",
+    ["dependency"],
+)
+
+
+# ==============================================================================
+# POOL STATISTICS
+# ==============================================================================
+
+
+def pool_stats(db_engine: AsyncEngine) -> Dict[str, Any]:
+    """Snapshot of a QueuePool's counters (empty for pools without them)."""
+    pool = db_engine.pool
+    if not hasattr(pool, "checkedout"):
+        return {}
+    return {
+        "size": pool.size(),
+        "checked_out": pool.checkedout(),
+        "checked_in": pool.checkedin(),
+        "overflow": max(0, pool.overflow()),
+        "waiters": getattr(pool, "waiters", 0),
+    }
+
+
+class PoolStatsCollector:
+    """Exports pool counters at scrape time for every engine created so far."""
+
+    metrics = (
+        ("db_pool_checked_out", "Connections currently checked out of the pool", "checked_out"),
+        ("db_pool_checked_in", "Idle connections in the pool", "checked_in"),
+        ("db_pool_overflow", "Connections opened beyond pool_size", "overflow"),
+    )
+
+    def collect(self):
+        stats = {name: pool_stats(e) for name, e in created_engines().items()}
+        for metric, documentation, key in self.metrics:
+            family = GaugeMetricFamily(metric, documentation, labels=["pool"])
+            for name, values in stats.items():
+                family.add_metric([name], values.get(key, 0))
+            yield family
+
+
+REGISTRY.register(PoolStatsCollector())
+
+
+# ==============================================================================
+# CHECKS
+# ==============================================================================
+
+
+async def check_database(name: str, db_engine: AsyncEngine) -> Dict[str, Any]:
+    """Run SELECT 1 on a pooled connection, timing the checkout."""
+    started = time.perf_counter()
+    async with db_engine.connect() as conn:
+        wait = time.perf_counter() - started
+        DB_POOL_PROBE_WAIT.labels(pool=name).set(wait)
+        await conn.execute(text("SELECT 1"))
+    return {
+        "latency_ms": round((time.perf_counter() - started) * 1000, 2),
+        "pool": {**pool_stats(db_engine), "wait_ms": round(wait * 1000, 2)},
+    }
+
+
+async def check_redis() -> Dict[str, Any]:
+    """PING the shared Redis client."""
+    started = time.perf_counter()
+    await cache.get_redis().ping()
+    return {"latency_ms": round((time.perf_counter() - started) * 1000, 2)}
+
+
+async def _run_check(name: str, check) -> Dict[str, Any]:
+    try:
+        result = await asyncio.wait_for(check, settings.HEALTH_CHECK_TIMEOUT)
+        DEPENDENCY_UP.labels(dependency=name).set(1)
+        return {"status": "up", **result}
+    except asyncio.TimeoutError:
+        error = f"timed out after {settings.HEALTH_CHECK_TIMEOUT}s"
+    except Exception as e:
+        error = f"{type(e).__name__}: {e}"
+    DEPENDENCY_UP.labels(dependency=name).set(0)
+    return {"status": "down", "error": error}
+
+
+async def _check_all() -> Dict[str, Any]:
+    checks = {"database": check_database("primary", get_engine()), "redis": check_redis()}
+    results = await asyncio.gather(*(_run_check(n, c) for n, c in checks.items()))
+    dependencies = dict(zip(checks, results))
+    ready = all(r["status"] == "up" for r in results)
+
+    # Replicas are informational; get_read_db() falls back to the primary
+    replicas = {n: pool_stats(e) for n, e in created_engines().items() if n != "primary"}
+    if replicas:
+        dependencies["replicas"] = replicas
+
+    return {"status": "ready" if ready else "not_ready", "dependencies": dependencies}
+
+
+# ==============================================================================
+# CACHED READINESS
+# ==============================================================================
+
+
+class ReadinessCache:
+    """Caches the last readiness result and collapses concurrent probes."""
+
+    def __init__(self, ttl_seconds: float):
+        self.ttl_seconds = ttl_seconds
+        self._result: Optional[Dict[str, Any]] = None
+        self._checked_at = 0.0
+        self._inflight: Optional[asyncio.Future] = None
+
+    async def get(self) -> Dict[str, Any]:
+        if self._result is not None and time.monotonic() - self._checked_at < self.ttl_seconds:
+            return self._result
+
+        if self._inflight is None:
+            self._inflight = background_task(self._refresh())
+            self._inflight.add_done_callback(lambda _: setattr(self, "_inflight", None))
+        return await asyncio.shield(self._inflight)
+
+    async def _refresh(self) -> Dict[str, Any]:
+        result = await _check_all()
+        self._result = {**result, "checked_at": time.time()}
+        self._checked_at = time.monotonic()
+        return self._result
+
+
+readiness_cache = ReadinessCache(settings.HEALTH_CACHE_SECONDS)
+
+
+async def check_readiness() -> Dict[str, Any]:
+    """Cached readiness report; `status` is "ready" only if all checks pass."""
+    return await readiness_cache.get()
@@ -0,0 +1,180 @@
+"""
+Connection Pool Instrumentation
+
+Exports what the static pool settings hide until requests start timing out:
+
+- Checkout latency, blocked checkouts (wait queue) and checkout timeouts
+- Age of connections handed out
+- Per-statement timing, with slow statements logged
+
+Optional adaptive mode (DB_POOL_ADAPTIVE): when the average checkout wait
+stays above DB_POOL_WAIT_THRESHOLD_MS, "warn" logs a sizing hint and "grow"
+raises max_overflow step by step up to DB_POOL_MAX_OVERFLOW_LIMIT.
+"""
+
+import time
+
+from prometheus_client import Counter, Gauge, Histogram
+from sqlalchemy import event, exc
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+from src.core.config import settings
+from src.core.profiling import record_phase
+
+POOL_CHECKOUT_SECONDS = Histogram(
+    "db_pool_checkout_seconds",
+    "Time spent acquiring a connection from the pool",
+    ["pool"],
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30),
+)
+POOL_WAITERS = Gauge(
+    "db_pool_waiters",
+    "Checkouts blocked waiting for a connection",
+    ["pool"],
+)
+POOL_CHECKOUT_TIMEOUTS = Counter(
+    "db_pool_checkout_timeouts_total",
+    "Checkouts that gave up after DB_POOL_TIMEOUT",
+    ["pool"],
+)
+POOL_MAX_OVERFLOW = Gauge(
+    "db_pool_max_overflow",
+    "Current max_overflow (changes in adaptive grow mode)",
+    ["pool"],
+)
+CONNECTION_AGE_SECONDS = Histogram(
+    "db_connection_age_seconds",
+    "Age of connections at checkout",
+    ["pool"],
+    buckets=(1, 10, 60, 300, 900, 1800, 3600, 7200, 14400),
+)
+STATEMENT_SECONDS = Histogram(
+    "db_statement_seconds",
+    "Statement execution time",
+    ["pool", "operation"],
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10),
+)
+
+# ==============================================================================
+# POOL
+# ==============================================================================
+
+
+class InstrumentedPool(AsyncAdaptedQueuePool):
+    """AsyncAdaptedQueuePool that times checkouts and can grow its overflow."""
+
+    name = "primary"
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.waiters = 0
+        # Exponentially weighted moving average of checkout wait
+        self._wait_avg = 0.0
+        self._last_adapted = time.monotonic()
+
+    def _do_get(self):
+        blocking = (
+            self._pool.empty()
+            and self._max_overflow > -1
+            and self._overflow >= self._max_overflow
+        )
+        if blocking:
+            self.waiters += 1
+            POOL_WAITERS.labels(pool=self.name).set(self.waiters)
+
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        except exc.TimeoutError:
+            POOL_CHECKOUT_TIMEOUTS.labels(pool=self.name).inc()
+            raise
+        finally:
+            elapsed = time.perf_counter() - started
+            POOL_CHECKOUT_SECONDS.labels(pool=self.name).observe(elapsed)
+            record_phase("db_pool_wait", elapsed)
+            if blocking:
+                self.waiters -= 1
+                POOL_WAITERS.labels(pool=self.name).set(self.waiters)
+            self._wait_avg = 0.9 * self._wait_avg + 0.1 * elapsed
+            self._adapt()
+
+    def _adapt(self):
+        mode = settings.DB_POOL_ADAPTIVE
+        now = time.monotonic()
+        if mode == "off" or now - self._last_adapted < settings.DB_POOL_ADAPTIVE_INTERVAL:
+            return
+        self._last_adapted = now
+
+        wait_ms = self._wait_avg * 1000
+        if wait_ms < settings.DB_POOL_WAIT_THRESHOLD_MS:
+            return
+
+        limit = settings.DB_POOL_MAX_OVERFLOW_LIMIT
+        if mode == "grow" and self._max_overflow < limit:
+            step = max(1, self.size() // 2)
+            self._max_overflow = min(limit, self._max_overflow + step)
+            POOL_MAX_OVERFLOW.labels(pool=self.name).set(self._max_overflow)
+            print(
+                f"DB pool '{self.name}': avg checkout wait {wait_ms:.0f}ms, "
+                f"max_overflow raised to {self._max_overflow}"
+            )
+        else:
+            print(
+                f"DB pool '{self.name}': avg checkout wait {wait_ms:.0f}ms "
+                f"(pool_size={self.size()}, max_overflow={self._max_overflow}) - "
+                f"consider raising DB_POOL_SIZE / DB_MAX_OVERFLOW"
+            )
+
+    def recreate(self):
+        # engine.dispose() swaps in a fresh pool; keep its name and grown limit
+        pool = super().recreate()
+        pool.name = self.name
+        pool._max_overflow = self._max_overflow
+        return pool
+
+
+# ==============================================================================
+# ENGINE EVENTS
+# ==============================================================================
+
+
+def instrument_engine(db_engine: AsyncEngine, name: str):
+    """Label an engine's pool and attach connection/statement timing hooks."""
+    pool = db_engine.pool
+    if isinstance(pool, InstrumentedPool):
+        pool.name = name
+        POOL_MAX_OVERFLOW.labels(pool=name).set(pool._max_overflow)
+
+    sync_engine = db_engine.sync_engine
+
+    @event.listens_for(sync_engine, "connect")
+    def on_connect(dbapi_connection, connection_record):
+        connection_record.info["created_at"] = time.monotonic()
+
+    @event.listens_for(sync_engine, "checkout")
+    def on_checkout(dbapi_connection, connection_record, connection_proxy):
+        created_at = connection_record.info.get("created_at")
+        if created_at is not None:
+            CONNECTION_AGE_SECONDS.labels(pool=name).observe(time.monotonic() - created_at)
+
+    @event.listens_for(sync_engine, "before_cursor_execute")
+    def before_execute(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+    @event.listens_for(sync_engine, "after_cursor_execute")
+    def after_execute(conn, cursor, statement, parameters, context, executemany):
+        elapsed = time.perf_counter() - conn.info["query_start"].pop()
+        operation = statement.lstrip().split(None, 1)[0].upper() if statement.strip() else "?"
+        STATEMENT_SECONDS.labels(pool=name, operation=operation).observe(elapsed)
+        record_phase("db", elapsed)
+        if elapsed * 1000 >= settings.DB_SLOW_QUERY_MS:
+            print(f"Slow query on '{name}' ({elapsed * 1000:.0f}ms): {statement[:200]}")
+
+    @event.listens_for(sync_engine, "handle_error")
+    def on_error(context):
+        # A failed statement never reaches after_cursor_execute
+        conn = context.connection
+        starts = conn.info.get("query_start") if conn is not None else None
+        if starts:
+            record_phase("db", time.perf_counter() - starts.pop())
@@ -0,0 +1,253 @@
+"""
+Rate Limiting
+
+Token-bucket rate limiting middleware, keyed by auth subject (JWT `sub`)
+or client IP, with limits configured per path prefix:
+
+    RATE_LIMITS={"/api/v1/bulk": "5/minute", "/api/v1": "100/second"}
+
+The longest matching prefix wins; paths without a match are not limited.
+A "N/period" limit allows bursts of N and refills N tokens per period.
+
+Backends:
+- memory: per-process buckets (single worker, local dev)
+- redis:  one atomic Lua script per decision, shared by every gunicorn
+          worker and pod (falls back to memory for REDIS_URL=memory://)
+
+Redis errors fail open - a cache outage should not take the API down.
+
+Disabled by default. Behind a reverse proxy set RATE_LIMIT_TRUSTED_PROXIES,
+or every anonymous client shares the proxy's address (and one bucket).
+"""
+
+import math
+import time
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+from prometheus_client import Counter, Histogram
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from src.core import cache
+from src.core.config import settings
+from src.core.profiling import record_phase
+from src.core.security import bearer_subject
+
+RATE_LIMIT_DECISION_SECONDS = Histogram(
+    "rate_limit_decision_seconds",
+    "Time taken to make a rate limit decision",
+    ["backend"],
+    buckets=(0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05),
+)
+RATE_LIMIT_REJECTED = Counter(
+    "rate_limit_rejected_total",
+    "Requests rejected with 429",
+    ["prefix"],
+)
+RATE_LIMIT_ERRORS = Counter(
+    "rate_limit_backend_errors_total",
+    "Backend errors (requests were allowed)",
+    ["backend"],
+)
+
+PERIODS = {"second": 1, "minute": 60, "hour": 3600, "day": 86400}
+
+# (allowed, tokens left, seconds until a token is available)
+Decision = Tuple[bool, float, float]
+
+
+class RateLimit:
+    """Bucket capacity and refill rate parsed from "N/period"."""
+
+    def __init__(self, spec: str):
+        count, _, period = spec.partition("/")
+        period = period.strip().lower().rstrip("s") or "second"
+        if period not in PERIODS:
+            raise ValueError(f"Unknown rate limit period in '{spec}'")
+        if not count.strip().isdigit() or int(count) < 1:
+            raise ValueError(f"Rate limit count in '{spec}' must be a positive integer")
+        self.capacity = int(count)
+        self.rate = self.capacity / PERIODS[period]  # Tokens per second
+        self.spec = spec
+
+
+# ==============================================================================
+# BACKENDS
+# ==============================================================================
+
+
+class MemoryBackend:
+    """Per-process token buckets (bounded LRU of client keys)."""
+
+    name = "memory"
+
+    def __init__(self, max_keys: int = 100_000):
+        self.max_keys = max_keys
+        self._buckets: "OrderedDict[str, Tuple[float, float]]" = OrderedDict()
+
+    async def hit(self, key: str, limit: RateLimit) -> Decision:
+        now = time.monotonic()
+        tokens, updated = self._buckets.get(key, (limit.capacity, now))
+        tokens = min(limit.capacity, tokens + (now - updated) * limit.rate)
+
+        allowed = tokens >= 1
+        retry_after = 0.0 if allowed else (1 - tokens) / limit.rate
+        if allowed:
+            tokens -= 1
+
+        self._buckets[key] = (tokens, now)
+        self._buckets.move_to_end(key)
+        while len(self._buckets) > self.max_keys:
+            self._buckets.popitem(last=False)
+        return allowed, tokens, retry_after
+
+
+# Atomic refill-and-take; uses the Redis clock so workers need not agree on time
+TOKEN_BUCKET_LUA = """
+local capacity = tonumber(ARGV[1])
+local rate = tonumber(ARGV[2])
+local now_parts = redis.call('TIME')
+local now = tonumber(now_parts[1]) + tonumber(now_parts[2]) / 1000000
+
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(state[1]) or capacity
+local ts = tonumber(state[2]) or now
+tokens = math.min(capacity, tokens + math.max(0, now - ts) * rate)
+
+local allowed = 0
+local retry_after = 0
+if tokens >= 1 then
+    allowed = 1
+    tokens = tokens - 1
+else
+    retry_after = (1 - tokens) / rate
+end
+
+redis.call('HSET', KEYS[1], 'tokens', tokens, 'ts', now)
+redis.call('EXPIRE', KEYS[1], math.ceil(capacity / rate) + 1)
+return {allowed, tostring(tokens), tostring(retry_after)}
+"""
+
+
+class RedisBackend:
+    """Token buckets in Redis, shared across workers and pods."""
+
+    name = "redis"
+    key_prefix = "ratelimit:"
+
+    def __init__(self):
+        self._script = None
+
+    async def hit(self, key: str, limit: RateLimit) -> Decision:
+        if self._script is None:
+            self._script = cache.get_redis().register_script(TOKEN_BUCKET_LUA)
+        allowed, tokens, retry_after = await self._script(
+            keys=[self.key_prefix + key],
+            args=[limit.capacity, limit.rate],
+        )
+        return bool(allowed), float(tokens), float(retry_after)
+
+
+def create_backend():
+    """Backend selected by RATE_LIMIT_BACKEND."""
+    if settings.RATE_LIMIT_BACKEND == "redis" and not settings.REDIS_URL.startswith("memory://"):
+        return RedisBackend()
+    return MemoryBackend()
+
+
+# ==============================================================================
+# MIDDLEWARE
+# ==============================================================================
+
+
+def client_key(scope: Scope) -> str:
+    """Auth subject from a valid bearer token, else the client IP."""
+    headers = Headers(scope=scope)
+    subject = bearer_subject(headers)
+    if subject:
+        return f"sub:{subject}"
+
+    hops = settings.RATE_LIMIT_TRUSTED_PROXIES
+    if hops > 0:
+        # Each trusted proxy appends the address it saw; anything to the
+        # left of those entries came from the client and can be forged
+        forwarded = [ip.strip() for ip in headers.get("x-forwarded-for", "").split(",")]
+        if len(forwarded) >= hops and forwarded[-hops]:
+            return f"ip:{forwarded[-hops]}"
+    client = scope.get("client")
+    return f"ip:{client[0] if client else 'unknown'}"
+
+
+class RateLimitMiddleware:
+    """Rejects requests over their prefix's limit with 429 + Retry-After.
+
+    Usage:
+        app.add_middleware(RateLimitMiddleware, limits=settings.RATE_LIMITS)
+    """
+
+    def __init__(self, app: ASGIApp, limits: Dict[str, str], backend=None):
+        self.app = app
+        self.backend = backend or create_backend()
+        # Longest prefix first so the most specific limit wins
+        self.limits: List[Tuple[str, RateLimit]] = sorted(
+            ((prefix, RateLimit(spec)) for prefix, spec in limits.items()),
+            key=lambda item: len(item[0]),
+            reverse=True,
+        )
+
+    def match(self, path: str) -> Optional[Tuple[str, RateLimit]]:
+        for prefix, limit in self.limits:
+            if path.startswith(prefix):
+                return prefix, limit
+        return None
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        matched = self.match(scope["path"]) if scope["type"] == "http" else None
+        if matched is None:
+            await self.app(scope, receive, send)
+            return
+
+        prefix, limit = matched
+        started = time.perf_counter()
+        try:
+            decision: Optional[Decision] = await self.backend.hit(
+                f"{prefix}:{client_key(scope)}", limit
+            )
+        except Exception as e:
+            decision = None
+            RATE_LIMIT_ERRORS.labels(backend=self.backend.name).inc()
+            print(f"Rate limiter error, allowing request: {e}")
+        elapsed = time.perf_counter() - started
+        RATE_LIMIT_DECISION_SECONDS.labels(backend=self.backend.name).observe(elapsed)
+        record_phase("ratelimit", elapsed)
+
+        if decision is None:
+            await self.app(scope, receive, send)
+            return
+
+        allowed, remaining, retry_after = decision
+        limit_headers = {
+            "X-RateLimit-Limit": limit.spec,
+            "X-RateLimit-Remaining": str(int(remaining)),
+        }
+
+        if not allowed:
+            RATE_LIMIT_REJECTED.labels(prefix=prefix).inc()
+            response = JSONResponse(
+                {"detail": "Rate limit exceeded"},
+                status_code=429,
+                headers={**limit_headers, "Retry-After": str(max(1, math.ceil(retry_after)))},
+            )
+            await response(scope, receive, send)
+            return
+
+        async def send_with_headers(message: Message):
+            if message["type"] == "http.response.start":
+                headers = MutableHeaders(scope=message)
+                for name, value in limit_headers.items():
+                    headers[name] = value
+            await send(message)
+
+        await self.app(scope, receive, send_with_headers)
@@ -0,0 +1,66 @@
+"""
+Response Classes
+
+FastJSONResponse serializes with orjson (falls back to the stdlib json module
+when orjson is not installed) and serializes Pydantic models directly with
+pydantic-core. Returning it from a route skips jsonable_encoder:
+
+    @router.get("/report")
+    async def report():
+        return FastJSONResponse(ReportRead(...))
+
+FAST_JSON=true (off by default) also makes it the app's default response
+class, which is not a speedup: FastAPI still runs jsonable_encoder on what
+a route without a response_model returns, and routes with a response_model
+are serialized by pydantic-core either way. scripts/benchmark_responses.py
+measures that swap slightly slower; hot routes should return
+FastJSONResponse explicitly.
+
+Requirements: pip install orjson (optional)
+"""
+
+import json
+from typing import Any
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+
+from src.core.profiling import phase
+
+# Try to import orjson for fast serialization
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+
+def _default(obj: Any) -> Any:
+    # orjson handles datetime/UUID/dataclasses natively; models nested in
+    # plain dicts and lists land here, and anything else (Decimal, sets,
+    # ...) gets the same treatment as in JSONResponse
+    if isinstance(obj, BaseModel):
+        return obj.model_dump(mode="json")
+    return jsonable_encoder(obj)
+
+
+class FastJSONResponse(JSONResponse):
+    """JSON response rendered by orjson / pydantic-core."""
+
+    def render(self, content: Any) -> bytes:
+        with phase("serialization"):
+            return self._render(content)
+
+    def _render(self, content: Any) -> bytes:
+        if isinstance(content, BaseModel):
+            return content.model_dump_json().encode("utf-8")
+        if ORJSON_AVAILABLE:
+            return orjson.dumps(content, default=_default, option=orjson.OPT_NON_STR_KEYS)
+        return json.dumps(
+            content,
+            default=_default,
+            ensure_ascii=False,
+            allow_nan=False,
+            separators=(",", ":"),
+        ).encode("utf-8")
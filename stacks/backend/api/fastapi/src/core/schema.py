@@ -0,0 +1,124 @@
+"""
+Schema Management
+
+Avoids running Base.metadata.create_all (a catalog query per table) on every
+worker boot. The migrate command creates tables once and stores a hash of
+the models' DDL; workers then only compare that hash at startup.
+
+DB_SCHEMA_MODE:
+- create: create_all only when the stored hash differs (default); on
+          PostgreSQL an advisory lock lets one booting worker migrate
+          while the others wait and then find the hash up to date
+- verify: refuse to start when the stored hash differs (production)
+- skip:   no check at all (schema managed elsewhere, e.g. Alembic)
+
+Usage:
+    python main.py migrate
+
+create_all never alters existing tables; use Alembic for column changes.
+"""
+
+import hashlib
+from datetime import datetime, timezone
+from typing import Optional
+
+from sqlalchemy import (
+    Column,
+    DateTime,
+    Integer,
+    MetaData,
+    String,
+    Table,
+    delete,
+    func,
+    inspect,
+    select,
+)
+from sqlalchemy.ext.asyncio import AsyncConnection
+from sqlalchemy.schema import CreateIndex, CreateTable
+
+from src.core.database import Base, get_engine
+
+# Kept out of Base.metadata so it doesn't change the hash it stores
+SCHEMA_STATE = Table(
+    "schema_state",
+    MetaData(),
+    Column("id", Integer, primary_key=True),
+    Column("metadata_hash", String(64), nullable=False),
+    Column("applied_at", DateTime(timezone=True), nullable=False),
+)
+
+
+# pg_advisory_xact_lock key serializing migrations across workers and pods
+SCHEMA_LOCK_KEY = int.from_bytes(hashlib.sha256(b"schema_state").digest()[:8], "big", signed=True)
+
+
+class SchemaMismatch(RuntimeError):
+    """Raised in verify mode when the database schema is out of date."""
+
+
+def metadata_hash() -> str:
+    """SHA-256 of the DDL for every table and index in Base.metadata."""
+    dialect = get_engine().dialect
+    digest = hashlib.sha256()
+    for table in Base.metadata.sorted_tables:
+        digest.update(str(CreateTable(table).compile(dialect=dialect)).encode())
+        for index in sorted(table.indexes, key=lambda i: i.name or ""):
+            digest.update(str(CreateIndex(index).compile(dialect=dialect)).encode())
+    return digest.hexdigest()
+
+
+async def stored_hash(conn: AsyncConnection) -> Optional[str]:
+    """Hash recorded by the last migration, or None."""
+    exists = await conn.run_sync(lambda c: inspect(c).has_table(SCHEMA_STATE.name))
+    if not exists:
+        return None
+    result = await conn.execute(select(SCHEMA_STATE.c.metadata_hash).where(SCHEMA_STATE.c.id == 1))
+    return result.scalar_one_or_none()
+
+
+async def migrate(if_changed: bool = False) -> str:
+    """Create missing tables and record the current metadata hash.
+
+    With `if_changed`, nothing is done when the stored hash (read after
+    taking the migration lock) already matches, i.e. another worker
+    migrated while this one waited.
+    """
+    expected = metadata_hash()
+    async with get_engine().begin() as conn:
+        if conn.dialect.name == "postgresql":
+            # Held until this transaction commits or rolls back
+            await conn.execute(select(func.pg_advisory_xact_lock(SCHEMA_LOCK_KEY)))
+        if if_changed and await stored_hash(conn) == expected:
+            return expected
+        await conn.run_sync(Base.metadata.create_all)
+        await conn.run_sync(SCHEMA_STATE.create, checkfirst=True)
+        await conn.execute(delete(SCHEMA_STATE))
+        await conn.execute(
+            SCHEMA_STATE.insert().values(
+                id=1,
+                metadata_hash=expected,
+                applied_at=datetime.now(timezone.utc),
+            )
+        )
+    return expected
+
+
+async def ensure_schema(mode: str):
+    """Startup check according to DB_SCHEMA_MODE."""
+    if mode == "skip":
+        return
+
+    expected = metadata_hash()
+    async with get_engine().connect() as conn:
+        current = await stored_hash(conn)
+    if current == expected:
+        return
+
+    if mode == "verify":
+        raise SchemaMismatch(
+            f"Database schema hash {current or '(none)'} does not match models "
+            f"({expected[:12]}...) - run `python main.py migrate`"
+        )
+    print("Schema changed since last migration, running create_all...")
+    await migrate(if_changed=True)
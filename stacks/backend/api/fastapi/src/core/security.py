@@ -0,0 +1,25 @@
+"""
+Security Helpers
+
+Request identity shared by the rate limiter and the response cache.
+"""
+
+from typing import Optional
+
+from jose import JWTError, jwt
+from starlette.datastructures import Headers
+
+from src.core.config import settings
+
+
+def bearer_subject(headers: Headers) -> Optional[str]:
+    """JWT `sub` of a valid bearer token, else None."""
+    scheme, _, token = headers.get("authorization", "").partition(" ")
+    if scheme.lower() != "bearer" or not token:
+        return None
+    try:
+        payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
+    except JWTError:
+        return None
+    subject = payload.get("sub")
+    return str(subject) if subject else None
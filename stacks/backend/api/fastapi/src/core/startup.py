@@ -0,0 +1,88 @@
+"""
+Startup Profiling
+
+Times lifespan phases and, for `python main.py --profile-startup`, reports
+import time per package (via `python -X importtime`) plus init time per
+phase against STARTUP_BUDGET_MS.
+"""
+
+import asyncio
+import subprocess
+import sys
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Tuple
+
+# Phase name -> seconds, filled in by the lifespan handler
+startup_timings: Dict[str, float] = {}
+
+
+@contextmanager
+def timed(phase: str) -> Iterator[None]:
+    """Record how long a startup phase takes (also when it fails)."""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        startup_timings[phase] = time.perf_counter() - started
+
+
+def import_times(module: str = "main") -> Tuple[float, List[Tuple[str, float]]]:
+    """Import `module` in a fresh interpreter with -X importtime.
+
+    Returns total cumulative seconds and self time summed per top-level
+    package, slowest first.
+    """
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+    )
+    if proc.returncode != 0:
+        raise RuntimeError(f"Importing {module} failed:\n{proc.stderr[-2000:]}")
+
+    per_package: Dict[str, float] = defaultdict(float)
+    total = 0.0
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        name = name.strip()
+        per_package[name.split(".")[0]] += int(self_us) / 1e6
+        if name == module:
+            total = int(cumulative_us) / 1e6
+    return total, sorted(per_package.items(), key=lambda item: item[1], reverse=True)
+
+
+def profile_startup(app, budget_ms: int, top: int = 20) -> int:
+    """Print the startup report; returns a non-zero exit code over budget."""
+    total_import, packages = import_times("main")
+    print(f"Import time (top {top} packages, self time)")
+    for package, seconds in packages[:top]:
+        print(f"  {package:<32} {seconds * 1000:8.1f} ms")
+    print(f"  {'total (import main)':<32} {total_import * 1000:8.1f} ms\n")
+
+    async def run_lifespan():
+        async with app.router.lifespan_context(app):
+            pass
+
+    error = None
+    started = time.perf_counter()
+    try:
+        asyncio.run(run_lifespan())
+    except Exception as e:
+        error = e
+    total_init = time.perf_counter() - started
+
+    print("Startup phases")
+    for phase, seconds in startup_timings.items():
+        print(f"  {phase:<32} {seconds * 1000:8.1f} ms")
+    print(f"  {'total (lifespan)':<32} {total_init * 1000:8.1f} ms")
+    if error is not None:
+        print(f"  startup failed: {type(error).__name__}: {error}")
+
+    total_ms = (total_import + total_init) * 1000
+    within = total_ms <= budget_ms and error is None
+    print(f"\nCold start {total_ms:.0f} ms (budget {budget_ms} ms) - {'OK' if within else 'OVER'}")
+    return 0 if within else 1
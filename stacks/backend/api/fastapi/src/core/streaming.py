@@ -0,0 +1,25 @@
+"""
+Streaming Responses
+
+DuplexStreamingResponse streams a body that is produced while the request
+body is still being read (e.g. NDJSON in, NDJSON out).
+
+Both backend stacks ship this file (they are built as separate images);
+`make check-shared` fails if the copies drift apart.
+"""
+
+import anyio
+from fastapi.responses import StreamingResponse
+from starlette.types import Receive
+
+
+class DuplexStreamingResponse(StreamingResponse):
+    """StreamingResponse whose body iterator reads the request body.
+
+    The stock response listens for disconnects by calling receive(), which
+    would steal request body chunks from the iterator. Disconnects surface
+    through Request.stream() (ClientDisconnect) instead.
+    """
+
+    async def listen_for_disconnect(self, receive: Receive) -> None:
+        await anyio.sleep_forever()
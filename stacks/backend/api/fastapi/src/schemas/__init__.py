@@ -1,5 +1,7 @@
 """Pydantic Schemas for request/response validation."""
 
+from src.schemas.pagination import Page
+
 # from src.schemas.user import UserCreate, UserRead, UserUpdate
 
-__all__ = []
+__all__ = ["Page"]
@@ -0,0 +1,53 @@
+"""Pagination schemas and opaque keyset cursors."""
+
+import base64
+import json
+from dataclasses import dataclass
+from typing import Any, Generic, List, Optional, Sequence, TypeVar
+
+from fastapi.encoders import jsonable_encoder
+from pydantic import BaseModel
+
+T = TypeVar("T")
+
+
+class Page(BaseModel, Generic[T]):
+    """One page of a keyset-paginated list.
+
+    Pass `next_cursor` back as `?cursor=` to fetch the following page;
+    it is null on the last page.
+    """
+
+    items: List[T]
+    next_cursor: Optional[str] = None
+    limit: int
+
+
+@dataclass
+class PageParams:
+    """Parsed ?limit=&cursor= parameters (see src.api.deps.page_params)."""
+
+    limit: int
+    after: Optional[List[Any]] = None  # Sort-key values of the previous page's last row
+
+
+class InvalidCursor(ValueError):
+    """Raised when a cursor cannot be decoded."""
+
+
+def encode_cursor(values: Sequence[Any]) -> str:
+    """Encode the sort-key values of the last row into an opaque cursor."""
+    raw = json.dumps(jsonable_encoder(list(values)), separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> List[Any]:
+    """Decode a cursor produced by encode_cursor()."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        values = json.loads(raw)
+    except (ValueError, TypeError) as e:
+        raise InvalidCursor(f"Invalid cursor: {e}")
+    if not isinstance(values, list):
+        raise InvalidCursor("Invalid cursor")
+    return values
@@ -1,5 +1,8 @@
 """Business Logic Services."""
 
+from src.services.bulk import BulkWriteError, bulk_write, bulk_write_stream
+from src.services.pagination import paginate, stream_rows
+
 # from src.services.user import UserService
 
-__all__ = []
+__all__ = ["BulkWriteError", "bulk_write", "bulk_write_stream", "paginate", "stream_rows"]
@@ -0,0 +1,216 @@
+"""
+Bulk Write Service
+
+Batched inserts and upserts for declarative models, so ingestion clients
+can send thousands of rows in one request instead of one round-trip each.
+
+- Rows are written with a single executemany per chunk; SQLAlchemy's
+  "insertmanyvalues" turns that into multi-row INSERT statements on asyncpg
+- Upserts use PostgreSQL INSERT ... ON CONFLICT (DO UPDATE / DO NOTHING)
+- Streams are committed chunk by chunk, each chunk in its own transaction,
+  and every chunk reports its own result
+- NDJSON values are converted to each column's Python type (dates, UUIDs,
+  decimals, ...) before binding; bulk_write() expects typed values
+
+Usage:
+    async with get_engine().begin() as conn:
+        await bulk_write(conn, User, rows, mode="upsert")
+"""
+
+import json
+from typing import Any, AsyncIterator, Dict, List, Optional, Sequence, Type, Union
+
+from sqlalchemy import Table, insert
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine
+
+from src.core.config import settings
+from src.core.database import Base, coerce_value
+
+Row = Dict[str, Any]
+Target = Union[Type[Base], Table]
+
+BULK_MODES = ("insert", "upsert", "ignore")
+
+
+class BulkWriteError(Exception):
+    """Raised for rows or tables that cannot be bulk written."""
+
+
+# ==============================================================================
+# TABLES
+# ==============================================================================
+
+
+def get_bulk_table(name: str) -> Table:
+    """Resolve an allowlisted table name (BULK_WRITE_TABLES) to its Table."""
+    if name not in settings.BULK_WRITE_TABLES:
+        raise BulkWriteError(f"Table '{name}' is not enabled for bulk writes")
+    table = Base.metadata.tables.get(name)
+    if table is None:
+        raise BulkWriteError(f"Unknown table '{name}'")
+    return table
+
+
+def _table(target: Target) -> Table:
+    return getattr(target, "__table__", target)
+
+
+# ==============================================================================
+# BATCHED WRITES
+# ==============================================================================
+
+
+def _group_by_columns(table: Table, rows: Sequence[Row]) -> Dict[tuple, List[Row]]:
+    # executemany needs the same keys in every row; rows are grouped instead of
+    # padded so omitted columns keep their server defaults
+    groups: Dict[tuple, List[Row]] = {}
+    for row in rows:
+        unknown = set(row) - set(table.columns.keys())
+        if unknown:
+            raise BulkWriteError(f"Unknown columns for '{table.name}': {sorted(unknown)}")
+        groups.setdefault(tuple(sorted(row)), []).append(row)
+    return groups
+
+
+async def bulk_write(
+    conn: AsyncConnection,
+    target: Target,
+    rows: Sequence[Row],
+    mode: str = "insert",
+    conflict_columns: Optional[Sequence[str]] = None,
+) -> int:
+    """Write rows in batched statements; returns the number of rows sent.
+
+    Args:
+        conn: Connection with an open transaction
+        target: Declarative model class or Table
+        rows: Column name -> value mappings
+        mode: "insert", "upsert" (ON CONFLICT DO UPDATE) or
+            "ignore" (ON CONFLICT DO NOTHING)
+        conflict_columns: Conflict target (defaults to the primary key)
+    """
+    if mode not in BULK_MODES:
+        raise BulkWriteError(f"Unknown mode '{mode}', expected one of {BULK_MODES}")
+    if not rows:
+        return 0
+
+    table = _table(target)
+    conflict = list(conflict_columns or [c.name for c in table.primary_key.columns])
+    if mode != "insert" and not conflict:
+        raise BulkWriteError(f"'{table.name}' has no primary key; pass conflict_columns")
+
+    for columns, group in _group_by_columns(table, rows).items():
+        if mode == "insert":
+            stmt = insert(table)
+        elif mode == "ignore":
+            stmt = pg_insert(table).on_conflict_do_nothing(index_elements=conflict)
+        else:
+            stmt = pg_insert(table)
+            updates = {c: stmt.excluded[c] for c in columns if c not in conflict}
+            stmt = (
+                stmt.on_conflict_do_update(index_elements=conflict, set_=updates)
+                if updates
+                else stmt.on_conflict_do_nothing(index_elements=conflict)
+            )
+        await conn.execute(stmt, group)
+
+    return len(rows)
+
+
+# ==============================================================================
+# NDJSON STREAMS
+# ==============================================================================
+
+
+async def iter_ndjson_chunks(
+    chunks: AsyncIterator[bytes],
+    chunk_size: int,
+    max_line_bytes: int,
+) -> AsyncIterator[List[bytes]]:
+    """Split a byte stream into lists of at most `chunk_size` raw NDJSON lines."""
+    buffer = b""
+    lines: List[bytes] = []
+    async for data in chunks:
+        buffer += data
+        *complete, buffer = buffer.split(b"\n")
+        for line in complete:
+            if line.strip():
+                lines.append(line)
+                if len(lines) >= chunk_size:
+                    yield lines
+                    lines = []
+        if len(buffer) > max_line_bytes:
+            raise BulkWriteError(f"NDJSON line exceeds {max_line_bytes} bytes")
+
+    if buffer.strip():
+        lines.append(buffer)
+    if lines:
+        yield lines
+
+
+def _parse_rows(table: Table, lines: List[bytes], first_line: int) -> List[Row]:
+    rows = []
+    for offset, line in enumerate(lines):
+        try:
+            row = json.loads(line)
+        except ValueError as e:
+            raise BulkWriteError(f"Line {first_line + offset}: invalid JSON ({e})")
+        if not isinstance(row, dict):
+            raise BulkWriteError(f"Line {first_line + offset}: expected a JSON object")
+        for key, value in row.items():
+            column = table.columns.get(key)
+            if column is None:
+                continue  # Reported for the whole chunk by _group_by_columns
+            try:
+                row[key] = coerce_value(column, value)
+            except (TypeError, ValueError) as e:
+                raise BulkWriteError(
+                    f"Line {first_line + offset}: invalid value for '{key}' ({e})"
+                )
+        rows.append(row)
+    return rows
+
+
+async def bulk_write_stream(
+    db_engine: AsyncEngine,
+    table: Table,
+    chunks: AsyncIterator[List[bytes]],
+    mode: str = "insert",
+    conflict_columns: Optional[Sequence[str]] = None,
+) -> AsyncIterator[Row]:
+    """Write NDJSON chunks, committing each one; yields a report per chunk.
+
+    A failing chunk is rolled back and reported, and later chunks still run.
+    The final report summarises the whole stream.
+    """
+    written = failed = line = chunk = 0
+    try:
+        async for lines in chunks:
+            report: Row = {"chunk": chunk, "first_line": line, "rows": len(lines)}
+            try:
+                rows = _parse_rows(table, lines, line)
+                async with db_engine.begin() as conn:
+                    await bulk_write(conn, table, rows, mode, conflict_columns)
+                written += len(rows)
+                report["status"] = "committed"
+            except (BulkWriteError, SQLAlchemyError) as e:
+                failed += 1
+                report.update(status="error", error=_describe(e))
+            line += len(lines)
+            chunk += 1
+            yield report
+    except BulkWriteError as e:
+        # Unreadable input stops the stream; committed chunks stay committed
+        failed += 1
+        yield {"chunk": chunk, "first_line": line, "status": "error", "error": str(e)}
+
+    yield {"done": True, "rows_written": written, "failed_chunks": failed}
+
+
+def _describe(error: Exception) -> str:
+    if isinstance(error, SQLAlchemyError) and getattr(error, "orig", None) is not None:
+        # Driver message without the (long) statement and parameters
+        return f"{type(error.orig).__name__}: {error.orig}"
+    return str(error)
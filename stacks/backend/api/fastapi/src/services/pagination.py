@@ -0,0 +1,141 @@
+"""
+Pagination Service
+
+Keyset pagination and streaming list responses.
+
+- paginate() filters on the sort key of the last row seen
+  (WHERE (a, b) > (:a, :b)) instead of using OFFSET, so every page costs the
+  same index seek no matter how deep it is
+- stream_rows() iterates a server-side cursor (stream_scalars with
+  yield_per), so exporting millions of rows never holds them all in memory
+
+Usage:
+    @router.get("/items", response_model=Page[ItemRead])
+    async def list_items(
+        page: PageParams = Depends(page_params),
+        db: AsyncSession = Depends(get_read_db),
+    ):
+        return await paginate(db, select(Item), [Item.created_at, Item.id], page)
+
+    @router.get("/items/export")
+    async def export_items(format: str = "ndjson"):
+        return stream_rows(select(Item).order_by(Item.id), ItemRead, format)
+"""
+
+import json
+from typing import Any, List, Optional, Sequence, Type
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel
+from sqlalchemy import Select, inspect, tuple_
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+
+from src.core.config import settings
+from src.core.database import async_session, coerce_value, get_replica_router
+from src.schemas.pagination import InvalidCursor, Page, PageParams, encode_cursor
+
+
+# ==============================================================================
+# KEYSET PAGINATION
+# ==============================================================================
+
+
+def _coerce(column, value: Any) -> Any:
+    # Cursor values arrive as JSON
+    try:
+        return coerce_value(column, value)
+    except (TypeError, ValueError) as e:
+        raise InvalidCursor(f"Invalid cursor value for '{column.key}': {e}")
+
+
+async def paginate(
+    session: AsyncSession,
+    stmt: Select,
+    order_by: Sequence[Any],
+    params: PageParams,
+    descending: bool = False,
+    schema: Optional[Type[BaseModel]] = None,
+) -> Page:
+    """Fetch one page of `stmt` ordered by `order_by`.
+
+    `order_by` must be unique together (end with the primary key) so that
+    rows sharing a sort value are neither skipped nor repeated, and NOT
+    NULL: a row comparison with NULL is NULL, so such rows would silently
+    drop out of later pages.
+
+    Raises:
+        InvalidCursor: The cursor does not match the sort key
+        ValueError: A sort column is nullable
+    """
+    for col in order_by:
+        if getattr(getattr(col, "expression", col), "nullable", False):
+            raise ValueError(f"Keyset sort column '{col.key}' must be NOT NULL")
+
+    if params.after is not None:
+        if len(params.after) != len(order_by):
+            raise InvalidCursor("Cursor does not match this listing")
+        after = [_coerce(col, value) for col, value in zip(order_by, params.after)]
+        keys, values = tuple_(*order_by), tuple_(*after)
+        stmt = stmt.where(keys < values if descending else keys > values)
+
+    ordering = [col.desc() if descending else col.asc() for col in order_by]
+    # One extra row tells us whether there is a next page
+    rows = list(await session.scalars(stmt.order_by(*ordering).limit(params.limit + 1)))
+
+    next_cursor = None
+    if len(rows) > params.limit:
+        rows = rows[: params.limit]
+        next_cursor = encode_cursor([getattr(rows[-1], col.key) for col in order_by])
+
+    items: List[Any] = rows
+    if schema is not None:
+        items = [schema.model_validate(row, from_attributes=True) for row in rows]
+    return Page(items=items, next_cursor=next_cursor, limit=params.limit)
+
+
+# ==============================================================================
+# STREAMING RESPONSES
+# ==============================================================================
+
+
+def _row_to_json(row: Any, schema: Optional[Type[BaseModel]]) -> str:
+    if schema is not None:
+        return schema.model_validate(row, from_attributes=True).model_dump_json()
+    columns = {attr.key: getattr(row, attr.key) for attr in inspect(row).mapper.column_attrs}
+    return json.dumps(jsonable_encoder(columns))
+
+
+def stream_rows(
+    stmt: Select,
+    schema: Optional[Type[BaseModel]] = None,
+    format: str = "ndjson",
+    bind: Optional[AsyncEngine] = None,
+) -> StreamingResponse:
+    """Stream every row of `stmt` as NDJSON (default) or a JSON array.
+
+    The response opens its own session (a read replica unless `bind` is
+    given), because request-scoped sessions are closed before a streaming
+    body is sent.
+    """
+
+    async def body():
+        async with async_session(bind=bind or get_replica_router().choose()) as session:
+            result = await session.stream_scalars(
+                stmt, execution_options={"yield_per": settings.STREAM_YIELD_PER}
+            )
+            first = True
+            if format == "json":
+                yield "["
+            async for partition in result.partitions():
+                lines = [_row_to_json(row, schema) for row in partition]
+                if format == "json":
+                    yield ("" if first else ",") + ",".join(lines)
+                else:
+                    yield "\n".join(lines) + "\n"
+                first = False
+            if format == "json":
+                yield "]"
+
+    media_type = "application/json" if format == "json" else "application/x-ndjson"
+    return StreamingResponse(body(), media_type=media_type)
@@ -0,0 +1,7 @@
+import os
+import sys
+
+# The service is imported as the `src` package (uvicorn main:app)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+os.environ.setdefault("REDIS_URL", "memory://")
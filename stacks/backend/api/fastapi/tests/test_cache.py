@@ -0,0 +1,204 @@
+"""Response cache tests (REDIS_URL=memory://)."""
+
+import asyncio
+
+import httpx
+import pytest
+import pytest_asyncio
+from fastapi import FastAPI, HTTPException, Request, Response
+from fastapi.responses import StreamingResponse
+from jose import jwt
+from pydantic import BaseModel
+from redis.exceptions import ConnectionError as RedisConnectionError
+
+from src.core import cache
+from src.core.cache import cached, invalidate_tags, response_cache
+from src.core.config import settings
+
+
+class Item(BaseModel):
+    id: int
+    name: str
+
+
+def make_app(calls):
+    app = FastAPI()
+
+    @app.get("/items/{item_id}", response_model=Item, status_code=203)
+    @cached(ttl=60, tags=["items"])
+    async def get_item(item_id: int, response: Response):
+        calls.append(item_id)
+        if item_id == 0:
+            raise HTTPException(status_code=404)
+        response.headers["X-Source"] = "db"
+        return {"id": item_id, "name": "widget", "secret": "not in the model"}
+
+    @app.get("/me")
+    @cached()
+    def me(request: Request):
+        calls.append(request.headers.get("authorization"))
+        return {"calls": len(calls)}
+
+    @app.get("/raw")
+    @cached()
+    async def raw():
+        calls.append("raw")
+        return Response(b"\xff\x00binary", media_type="application/octet-stream")
+
+    @app.get("/stream")
+    @cached()
+    async def stream():
+        calls.append("stream")
+        return StreamingResponse(iter([b"a", b"b"]), media_type="text/plain")
+
+    return app
+
+
+@pytest_asyncio.fixture
+async def client():
+    calls = []
+    await cache.init_cache()
+    transport = httpx.ASGITransport(app=make_app(calls))
+    try:
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as c:
+            yield c, calls
+    finally:
+        await cache.close_cache()
+
+
+def bearer(subject):
+    token = jwt.encode({"sub": subject}, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
+    return {"Authorization": f"Bearer {token}"}
+
+
+@pytest.mark.asyncio
+async def test_hits_replay_the_filtered_response(client):
+    c, calls = client
+    first = await c.get("/items/1")
+    second = await c.get("/items/1")
+
+    assert calls == [1]
+    for response in (first, second):
+        assert response.status_code == 203
+        assert response.json() == {"id": 1, "name": "widget"}
+        assert response.headers["x-source"] == "db"
+
+
+@pytest.mark.asyncio
+async def test_invalidated_and_failed_responses_are_recomputed(client):
+    c, calls = client
+    await c.get("/items/1")
+    await invalidate_tags("items")
+    await c.get("/items/1")
+    assert (await c.get("/items/0")).status_code == 404
+    assert (await c.get("/items/0")).status_code == 404
+
+    assert calls == [1, 1, 0, 0]
+
+
+@pytest.mark.asyncio
+async def test_bearer_requests_are_cached_per_subject(client):
+    c, calls = client
+    alice = (await c.get("/me", headers=bearer("alice"))).json()
+    bob = (await c.get("/me", headers=bearer("bob"))).json()
+    assert (await c.get("/me", headers=bearer("alice"))).json() == alice
+
+    assert alice != bob
+    assert len(calls) == 2
+
+
+@pytest.mark.asyncio
+async def test_unverified_credentials_are_never_cached(client):
+    c, calls = client
+    for headers in ({"Authorization": "Basic dXNlcjpwYXNz"}, {"Authorization": "Bearer forged"}):
+        await c.get("/me", headers=headers)
+        await c.get("/me", headers=headers)
+
+    assert len(calls) == 4
+
+
+@pytest.mark.asyncio
+async def test_cookie_and_api_key_requests_are_never_cached(client):
+    c, calls = client
+    for headers in ({"Cookie": "session=alice"}, {"X-API-Key": "alice-key"}):
+        await c.get("/me", headers=headers)
+        await c.get("/me", headers=headers)
+
+    assert len(calls) == 4
+
+
+@pytest.mark.asyncio
+async def test_binary_bodies_are_cached_and_streams_pass_through(client):
+    c, calls = client
+    bodies = [(await c.get("/raw")).content for _ in range(2)]
+    streams = [(await c.get("/stream")).text for _ in range(2)]
+
+    assert bodies == [b"\xff\x00binary"] * 2
+    assert streams == ["ab"] * 2
+    assert calls == ["raw", "stream", "stream"]
+
+
+@pytest.mark.asyncio
+async def test_tag_index_ttl_is_never_shortened(client):
+    redis = cache.get_redis()
+    await response_cache.set("long", "value", ttl=600, tags=["items"])
+    await response_cache.set("short", "value", ttl=5, tags=["items"])
+
+    assert await redis.ttl(cache.TAG_PREFIX + "items") > 500
+
+
+@pytest.mark.asyncio
+async def test_waiters_recompute_when_the_first_caller_is_cancelled(client):
+    started = asyncio.Event()
+
+    async def hang():
+        started.set()
+        await asyncio.sleep(60)
+
+    async def compute():
+        return "value"
+
+    first = asyncio.ensure_future(response_cache.get_or_set("key", hang, ttl=60))
+    await started.wait()
+    second = asyncio.ensure_future(response_cache.get_or_set("key", compute, ttl=60))
+    await asyncio.sleep(0)
+    first.cancel()
+
+    assert await second == "value"
+    assert first.cancelled()
+
+
+@pytest.mark.asyncio
+async def test_fill_does_not_release_a_lock_it_no_longer_owns(client):
+    redis = cache.get_redis()
+    lock_key = cache.LOCK_PREFIX + "slow"
+
+    async def compute():
+        # Our lock expired mid-computation and another worker took it over
+        await redis.set(lock_key, "other-worker")
+        return "value"
+
+    assert await response_cache.get_or_set("slow", compute, ttl=60) == "value"
+    assert await redis.get(lock_key) == "other-worker"
+
+
+class BrokenRedis:
+    async def _fail(self, *args, **kwargs):
+        raise RedisConnectionError("connection refused")
+
+    get = set = delete = sadd = smembers = expire = _fail
+
+    def register_script(self, script):
+        return self._fail
+
+
+@pytest.mark.asyncio
+async def test_redis_errors_fall_back_to_compute(client, monkeypatch):
+    c, calls = client
+    monkeypatch.setattr(cache, "redis_client", BrokenRedis())
+
+    responses = await asyncio.gather(c.get("/items/1"), c.get("/items/2"))
+    await invalidate_tags("items")
+
+    assert [r.json()["id"] for r in responses] == [1, 2]
+    assert sorted(calls) == [1, 2]
@@ -0,0 +1,74 @@
+"""Keyset pagination tests (in-memory SQLite)."""
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import Integer, String, select
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column
+
+from src.schemas.pagination import InvalidCursor, PageParams, decode_cursor
+from src.services.pagination import paginate
+
+
+class ModelBase(DeclarativeBase):
+    pass
+
+
+class Row(ModelBase):
+    __tablename__ = "rows"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    rank: Mapped[int] = mapped_column(Integer, nullable=False)
+    label: Mapped[str] = mapped_column(String, nullable=True)
+
+
+@pytest_asyncio.fixture
+async def session():
+    engine = create_async_engine("sqlite+aiosqlite://")
+    async with engine.begin() as conn:
+        await conn.run_sync(ModelBase.metadata.create_all)
+    async with AsyncSession(engine) as session:
+        # Ranks repeat, so page boundaries fall inside runs of equal keys
+        session.add_all(Row(id=i, rank=i // 3, label=None) for i in range(1, 11))
+        await session.commit()
+        yield session
+    await engine.dispose()
+
+
+async def all_pages(session, order_by, limit, descending=False):
+    pages, after = [], None
+    while True:
+        page = await paginate(session, select(Row), order_by, PageParams(limit, after), descending)
+        pages.append([row.id for row in page.items])
+        if page.next_cursor is None:
+            return pages
+        after = decode_cursor(page.next_cursor)
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("descending", [False, True])
+async def test_duplicate_sort_keys_are_neither_skipped_nor_repeated(session, descending):
+    pages = await all_pages(session, [Row.rank, Row.id], limit=4, descending=descending)
+
+    ids = [i for page in pages for i in page]
+    assert [len(page) for page in pages] == [4, 4, 2]
+    assert ids == sorted(range(1, 11), key=lambda i: (i // 3, i), reverse=descending)
+
+
+@pytest.mark.asyncio
+async def test_exact_multiple_of_the_limit_ends_without_an_empty_page(session):
+    pages = await all_pages(session, [Row.rank, Row.id], limit=5)
+
+    assert [len(page) for page in pages] == [5, 5]
+
+
+@pytest.mark.asyncio
+async def test_nullable_sort_columns_are_rejected(session):
+    with pytest.raises(ValueError, match="NOT NULL"):
+        await paginate(session, select(Row), [Row.label, Row.id], PageParams(5))
+
+
+@pytest.mark.asyncio
+async def test_cursor_for_another_sort_key_is_invalid(session):
+    with pytest.raises(InvalidCursor):
+        await paginate(session, select(Row), [Row.rank, Row.id], PageParams(5, after=[1]))
@@ -0,0 +1,22 @@
+"""Rate limiter tests."""
+
+import pytest
+
+from src.core.ratelimit import MemoryBackend, RateLimit
+
+
+@pytest.mark.parametrize("spec", ["0/minute", "-5/second", "1.5/hour", "ten/day", "/second"])
+def test_non_positive_or_non_integer_counts_are_rejected(spec):
+    with pytest.raises(ValueError, match="positive integer"):
+        RateLimit(spec)
+
+
+@pytest.mark.asyncio
+async def test_bucket_allows_a_burst_then_rejects():
+    limit = RateLimit("2/minute")
+    backend = MemoryBackend()
+
+    decisions = [await backend.hit("client", limit) for _ in range(3)]
+
+    assert [allowed for allowed, _, _ in decisions] == [True, True, False]
+    assert decisions[-1][2] > 0
@@ -0,0 +1,84 @@
+"""Token cache tests for scripts/count-tokens.py."""
+
+import os
+import types
+
+import pytest
+
+
+class WordEncoder:
+    """Stands in for tiktoken's cl100k_base (one token per word)."""
+
+    name = "cl100k_base"
+
+    def encode(self, text):
+        return text.split()
+
+    def encode_batch(self, texts, num_threads=1):
+        return [self.encode(text) for text in texts]
+
+
+@pytest.fixture
+def module(count_tokens, monkeypatch):
+    count_tokens.encoder_loads = []
+
+    def get_encoding(name):
+        count_tokens.encoder_loads.append(name)
+        return WordEncoder()
+
+    monkeypatch.setattr(count_tokens, "tiktoken", types.SimpleNamespace(get_encoding=get_encoding), raising=False)
+    monkeypatch.setattr(count_tokens, "TIKTOKEN_AVAILABLE", True)
+    return count_tokens
+
+
+def run(module, tmp_path, filepath, **kwargs):
+    counter = module.TokenCounter(cache_path=tmp_path / module.CACHE_FILE, **kwargs)
+    result = counter.count_file_tokens(filepath)
+    counter.save_cache()
+    return result
+
+
+def test_unchanged_files_never_load_the_encoder(module, tmp_path):
+    doc = tmp_path / "doc.md"
+    doc.write_text("one two three\nfour\n")
+
+    assert run(module, tmp_path, doc) == (4, 2)
+    assert run(module, tmp_path, doc) == (4, 2)
+    assert module.encoder_loads == ["cl100k_base"]
+
+
+def test_size_change_is_recounted(module, tmp_path):
+    doc = tmp_path / "doc.md"
+    doc.write_text("one two three\n")
+    run(module, tmp_path, doc)
+    doc.write_text("one two three four five\n")
+
+    assert run(module, tmp_path, doc) == (5, 1)
+
+
+def test_mtime_change_falls_back_to_the_content_hash(module, tmp_path):
+    doc = tmp_path / "doc.md"
+    doc.write_text("one two three\n")
+    run(module, tmp_path, doc)
+    stat = doc.stat()
+
+    # Touched: same content, served from the cache
+    os.utime(doc, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    assert run(module, tmp_path, doc) == (3, 1)
+    assert len(module.encoder_loads) == 1
+
+    # Same size, new content: the hash no longer matches
+    doc.write_text("one two seven\n")
+    os.utime(doc, ns=(stat.st_atime_ns, stat.st_mtime_ns + 2 * 10**9))
+    assert run(module, tmp_path, doc) == (3, 1)
+    assert len(module.encoder_loads) == 2
+
+
+def test_encoder_change_drops_the_cache(module, tmp_path):
+    doc = tmp_path / "doc.md"
+    doc.write_text("one two three four\n")
+
+    assert run(module, tmp_path, doc) == (4, 1)
+    assert run(module, tmp_path, doc, use_tiktoken=False) == (3, 1)  # 0.75 per word
+    assert run(module, tmp_path, doc) == (4, 1)
+    assert module.encoder_loads == ["cl100k_base", "cl100k_base"]
@@ -0,0 +1,81 @@
+"""Tests for scripts/generate-index.py."""
+
+import subprocess
+import sys
+import textwrap
+
+from conftest import SCRIPTS_DIR
+
+SOURCE = textwrap.dedent(
+    """
+    class Service:
+        def start(self):
+            pass
+
+        async def fetch(self):
+            pass
+
+        def _helper(self):
+            pass
+
+
+    async def main():
+        pass
+
+
+    def _private():
+        pass
+
+
+    class _Hidden:
+        def run(self):
+            pass
+    """
+)
+
+
+def run_index(path, *args):
+    return subprocess.run(
+        [sys.executable, str(SCRIPTS_DIR / "generate-index.py"), "--path", str(path), "--jobs", "1", *args],
+        capture_output=True,
+        text=True,
+    )
+
+
+def test_extracts_public_methods_and_async_defs(generate_index, tmp_path):
+    source = tmp_path / "app.py"
+    source.write_text(SOURCE)
+
+    functions, classes = generate_index.extract_python(str(source))
+
+    assert functions == [("Service.start", 3), ("Service.fetch", 6), ("main", 13)]
+    assert classes == [("Service", 2)]
+
+
+def test_index_rows_name_the_file_and_line(generate_index, tmp_path):
+    (tmp_path / "app.py").write_text(SOURCE)
+
+    content = generate_index.render_index(tmp_path)
+
+    assert "| `Service.fetch` | ./app.py | 6 | - |" in content
+    assert "_helper" not in content
+
+
+def test_check_exit_codes(tmp_path):
+    (tmp_path / "app.py").write_text(SOURCE)
+
+    assert run_index(tmp_path, "--check").returncode == 1  # Missing
+    assert run_index(tmp_path).returncode == 0
+    assert run_index(tmp_path, "--check").returncode == 0
+
+    (tmp_path / "app.py").write_text(SOURCE + "\ndef added():\n    pass\n")
+    assert run_index(tmp_path, "--check").returncode == 1  # Outdated
+
+
+def test_warns_when_over_the_line_budget(tmp_path):
+    (tmp_path / "app.py").write_text("".join(f"def f{i}():\n    pass\n" for i in range(300)))
+
+    result = run_index(tmp_path)
+
+    assert result.returncode == 0
+    assert "over its 300-line budget" in result.stdout